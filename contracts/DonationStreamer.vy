@@ -40,6 +40,12 @@ event StreamExecuted:
     reward_paid: uint256
 
 
+event StreamFailed:
+    stream_id: uint256
+    caller: indexed(address)
+    pool: indexed(address)
+
+
 event StreamCancelled:
     stream_id: uint256
     donor: indexed(address)
@@ -64,12 +70,67 @@ struct DonationStream:
     periods_remaining: uint256
 
 
+struct StreamSpec:
+    pool: address
+    coins: address[N_COINS]
+    amounts: uint256[N_COINS]
+    period_length: uint256
+    n_periods: uint256
+    reward_per_period: uint256
+
+
+# Storage layout of a stream: five words instead of one slot per field, with
+# coins kept once per pool.
+#   head:       donor (160) | next_ts (64) | periods_remaining (32)
+#   config:     pool (160) | period_length (64)
+#   rewards:    reward_per_period (128) | reward_remaining (128)
+#   amounts[j]: amount_per_period (128) | amount_remaining (128)
+struct PackedStream:
+    head: uint256
+    config: uint256
+    rewards: uint256
+    amounts: uint256[N_COINS]
+
+
 N_COINS: constant(uint256) = 2
 N_MAX_EXECUTE: constant(uint256) = 32
 N_MAX_VIEW: constant(uint256) = 1024
+N_MAX_READ: constant(uint256) = 256
+N_MAX_BITMAP_WORDS: constant(uint256) = 16
+N_MAX_CREATE: constant(uint256) = 32
+N_MAX_CANCEL: constant(uint256) = 32
+# execute_due runs batches of N_MAX_EXECUTE, up to this many streams per call.
+N_MAX_EXECUTE_DUE: constant(uint256) = 256
+# Due index: streams are bucketed by next_ts; one bitmap word covers 256 buckets.
+BUCKET_LENGTH: constant(uint256) = 600
+N_MAX_WORD_SCAN: constant(uint256) = 32
+MASK_64: constant(uint256) = 2**64 - 1
+MASK_128: constant(uint256) = 2**128 - 1
+MASK_160: constant(uint256) = 2**160 - 1
 
 stream_count: public(uint256)
-streams: public(HashMap[uint256, DonationStream])
+packed_streams: HashMap[uint256, PackedStream]
+pool_coins: public(HashMap[address, address[N_COINS]])
+
+# Enumerable set of live stream ids; finished and cancelled streams are swapped out.
+n_active: public(uint256)
+active_ids: public(HashMap[uint256, uint256])  # position -> stream id
+# stream id -> live set position + 1 (64) | donor list position + 1 (64) |
+#              pool list position + 1 (64), 0 if not live
+active_position: HashMap[uint256, uint256]
+
+# Timing wheel over next_ts: every live stream sits in the bucket of its next_ts.
+bucket_len: public(HashMap[uint256, uint256])
+bucket_ids: public(HashMap[uint256, HashMap[uint256, uint256]])  # bucket -> position -> id
+bucket_position: HashMap[uint256, uint256]  # stream id -> position in its bucket + 1
+bucket_bitmap: HashMap[uint256, uint256]  # word -> non-empty bucket bits
+first_bucket: public(uint256)  # earliest non-empty bucket, or a lower bound of it
+
+# Live stream ids per donor and per pool, kept like the live set.
+donor_stream_count: public(HashMap[address, uint256])
+donor_stream_ids: HashMap[address, HashMap[uint256, uint256]]  # donor -> position -> id
+pool_stream_count: public(HashMap[address, uint256])
+pool_stream_ids: HashMap[address, HashMap[uint256, uint256]]  # pool -> position -> id
 
 
 ################ INIT ####################
@@ -82,6 +143,57 @@ def __init__():
 
 
 ############ INTERNAL HELPERS ############
+@internal
+@pure
+def _to_address(word: uint256) -> address:
+    return convert(convert(word & MASK_160, uint160), address)
+
+
+@internal
+@view
+def _load_stream(stream_id: uint256) -> DonationStream:
+    """
+    @dev Unpack a stream from storage. Coins are left empty; read them from
+         pool_coins where needed.
+    """
+    packed: PackedStream = self.packed_streams[stream_id]
+    pool: address = self._to_address(packed.config)
+    stream: DonationStream = DonationStream(
+        donor=self._to_address(packed.head),
+        pool=pool,
+        coins=empty(address[N_COINS]),
+        amounts_per_period=empty(uint256[N_COINS]),
+        period_length=(packed.config >> 160) & MASK_64,
+        reward_per_period=packed.rewards & MASK_128,
+        next_ts=(packed.head >> 160) & MASK_64,
+        reward_remaining=packed.rewards >> 128,
+        amounts_remaining=empty(uint256[N_COINS]),
+        periods_remaining=packed.head >> 224,
+    )
+    for j: uint256 in range(N_COINS):
+        stream.amounts_per_period[j] = packed.amounts[j] & MASK_128
+        stream.amounts_remaining[j] = packed.amounts[j] >> 128
+    return stream
+
+
+@internal
+def _store_stream(stream_id: uint256, stream: DonationStream):
+    """
+    @dev Pack a stream into storage. Field ranges are checked in create_stream.
+    """
+    packed: PackedStream = PackedStream(
+        head=convert(stream.donor, uint256)
+        | (stream.next_ts << 160)
+        | (stream.periods_remaining << 224),
+        config=convert(stream.pool, uint256) | (stream.period_length << 160),
+        rewards=stream.reward_per_period | (stream.reward_remaining << 128),
+        amounts=empty(uint256[N_COINS]),
+    )
+    for j: uint256 in range(N_COINS):
+        packed.amounts[j] = stream.amounts_per_period[j] | (stream.amounts_remaining[j] << 128)
+    self.packed_streams[stream_id] = packed
+
+
 @internal
 def _safe_approve(token: address, spender: address, amount: uint256):
     """
@@ -101,37 +213,345 @@ def _safe_approve(token: address, spender: address, amount: uint256):
 
 @internal
 @view
-def _due_periods(stream: DonationStream) -> uint256:
+def _check_spec(spec: StreamSpec) -> uint256:
     """
-    @dev Return the number of due periods for a stream.
+    @dev Validate a stream spec, except for its coins. Returns the reward to pre-fund.
     """
-    if (
-        stream.donor == empty(address)
-        or stream.periods_remaining == 0
-        or stream.period_length == 0
-        or block.timestamp < stream.next_ts
-    ):
-        return 0
+    assert spec.pool != empty(address), "pool required"
+    assert spec.n_periods > 0 and spec.n_periods < 2**32, "bad n_periods"
+    assert spec.period_length > 0, "bad period_length"
+    # Keep every packed field in range, including the last next_ts.
+    assert block.timestamp + spec.period_length * spec.n_periods <= MASK_64, "bad period_length"
+    assert spec.amounts[0] > 0 or spec.amounts[1] > 0, "zero amounts"
+    assert spec.amounts[0] <= MASK_128 and spec.amounts[1] <= MASK_128, "amount too large"
+
+    reward_total: uint256 = spec.reward_per_period * spec.n_periods
+    assert reward_total <= MASK_128, "reward too large"
+    return reward_total
+
+
+@internal
+def _check_coins(pool: address, coins: address[N_COINS]):
+    """
+    @dev Ensure caller-provided coins match the pool's coins. The first stream
+         of a pool records them; later streams must match the recorded pair, as
+         refunds and donations of every stream in the pool use it.
+    """
+    stored: address[N_COINS] = self.pool_coins[pool]
+    if stored[0] != empty(address) or stored[1] != empty(address):
+        assert coins[0] == stored[0] and coins[1] == stored[1], "coin mismatch"
+        return
+
+    assert (
+        coins[0] == staticcall DonationPoolTarget(pool).coins(0)
+        and coins[1] == staticcall DonationPoolTarget(pool).coins(1)
+    ), "coin mismatch"
+    self.pool_coins[pool] = coins
 
-    return min(
-        (block.timestamp - stream.next_ts) // stream.period_length + 1,
-        stream.periods_remaining,
+
+@internal
+def _pull_token(token: address, amount: uint256):
+    """
+    @dev Transfer tokens from the caller and verify the exact amount arrived.
+    """
+    balance_before: uint256 = staticcall IERC20(token).balanceOf(self)
+    assert extcall IERC20(token).transferFrom(
+        msg.sender, self, amount, default_return_value=True
+    ), "transfer failed"
+    balance_after: uint256 = staticcall IERC20(token).balanceOf(self)
+    assert balance_after - balance_before == amount, "bad token transfer"
+
+
+@internal
+def _record_stream(spec: StreamSpec, reward_total: uint256) -> uint256:
+    """
+    @dev Store and index a new stream from a validated, funded spec. Its coins
+         are the pool's, recorded by _check_coins.
+    """
+    # Per-period amounts are truncated; remainders donate on the final period.
+    amounts_per_period: uint256[N_COINS] = empty(uint256[N_COINS])
+    for j: uint256 in range(N_COINS):
+        amounts_per_period[j] = spec.amounts[j] // spec.n_periods
+
+    stream_id: uint256 = self.stream_count
+    self.stream_count = stream_id + 1
+
+    stream: DonationStream = DonationStream(
+        donor=msg.sender,
+        pool=spec.pool,
+        coins=spec.coins,
+        amounts_per_period=amounts_per_period,
+        period_length=spec.period_length,
+        reward_per_period=spec.reward_per_period,
+        next_ts=block.timestamp,
+        reward_remaining=reward_total,
+        amounts_remaining=spec.amounts,
+        periods_remaining=spec.n_periods,
+    )
+    self._store_stream(stream_id, stream)
+    self._index_insert(stream_id, block.timestamp)
+    self._add_active(stream_id)
+    self._add_owned(stream_id, msg.sender, spec.pool)
+
+    log StreamCreated(
+        stream_id=stream_id,
+        donor=msg.sender,
+        pool=spec.pool,
+        amounts=spec.amounts,
+        period_length=spec.period_length,
+        n_periods=spec.n_periods,
+        reward_per_period=spec.reward_per_period,
     )
+    return stream_id
 
 
 @internal
-def _execute_stream(stream_id: uint256) -> bool:
+def _refund_token(token: address, amount: uint256):
     """
-    @dev Execute a single stream if due and pay its reward.
+    @dev Transfer tokens back to the caller.
+    """
+    assert extcall IERC20(token).transfer(
+        msg.sender, amount, default_return_value=True
+    ), "refund failed"
+
+
+@internal
+def _cancel(stream_id: uint256) -> (address[N_COINS], uint256[N_COINS], uint256):
+    """
+    @dev Clear one of the caller's streams and log its cancellation. Returns
+         (coins, amounts_refund, reward_refund); refunds are left to the caller.
+    """
+    stream: DonationStream = self._load_stream(stream_id)
+    assert stream.donor == msg.sender, "donor only"
+
+    self.packed_streams[stream_id] = empty(PackedStream)
+    self._index_remove(stream_id, stream.next_ts)
+    self._remove_owned(stream_id, msg.sender, stream.pool)
+    self._remove_active(stream_id)
+
+    log StreamCancelled(
+        stream_id=stream_id,
+        donor=msg.sender,
+        pool=stream.pool,
+        amounts=stream.amounts_remaining,
+        reward_refund=stream.reward_remaining,
+    )
+    return self.pool_coins[stream.pool], stream.amounts_remaining, stream.reward_remaining
+
+
+@internal
+def _add_active(stream_id: uint256):
+    """
+    @dev Append a stream id to the live set.
+    """
+    n: uint256 = self.n_active
+    self.active_ids[n] = stream_id
+    self.active_position[stream_id] = n + 1
+    self.n_active = n + 1
+
+
+@internal
+def _remove_active(stream_id: uint256):
+    """
+    @dev Remove a stream id from the live set by moving the last id into its slot.
     """
-    stream: DonationStream = self.streams[stream_id]
-    periods_due: uint256 = self._due_periods(stream)
+    position: uint256 = self.active_position[stream_id]
+    if position == 0:
+        return
+    last: uint256 = self.n_active - 1
+    position &= MASK_64
+    if position - 1 != last:
+        last_id: uint256 = self.active_ids[last]
+        self.active_ids[position - 1] = last_id
+        self.active_position[last_id] = self.active_position[last_id] & ~MASK_64 | position
+    self.active_ids[last] = 0
+    self.active_position[stream_id] = 0
+    self.n_active = last
+
+
+@internal
+def _add_owned(stream_id: uint256, donor: address, pool: address):
+    """
+    @dev Append a stream id to its donor's and its pool's lists. Call after _add_active.
+    """
+    n_donor: uint256 = self.donor_stream_count[donor]
+    self.donor_stream_ids[donor][n_donor] = stream_id
+    self.donor_stream_count[donor] = n_donor + 1
+
+    n_pool: uint256 = self.pool_stream_count[pool]
+    self.pool_stream_ids[pool][n_pool] = stream_id
+    self.pool_stream_count[pool] = n_pool + 1
+
+    self.active_position[stream_id] |= (n_pool + 1) << 128 | (n_donor + 1) << 64
+
+
+@internal
+def _remove_owned(stream_id: uint256, donor: address, pool: address):
+    """
+    @dev Remove a stream id from its donor's and its pool's lists by moving the
+         last id of each into its slot. Call before _remove_active.
+    """
+    positions: uint256 = self.active_position[stream_id]
+    if positions >> 64 == 0:
+        return
+
+    position: uint256 = (positions >> 64) & MASK_64
+    last: uint256 = self.donor_stream_count[donor] - 1
+    if position - 1 != last:
+        last_id: uint256 = self.donor_stream_ids[donor][last]
+        self.donor_stream_ids[donor][position - 1] = last_id
+        self.active_position[last_id] = self.active_position[last_id] & ~(MASK_64 << 64) | (
+            position << 64
+        )
+    self.donor_stream_ids[donor][last] = 0
+    self.donor_stream_count[donor] = last
+
+    position = (positions >> 128) & MASK_64
+    last = self.pool_stream_count[pool] - 1
+    if position - 1 != last:
+        last_id: uint256 = self.pool_stream_ids[pool][last]
+        self.pool_stream_ids[pool][position - 1] = last_id
+        self.active_position[last_id] = self.active_position[last_id] & ~(MASK_64 << 128) | (
+            position << 128
+        )
+    self.pool_stream_ids[pool][last] = 0
+    self.pool_stream_count[pool] = last
+
+
+@internal
+@pure
+def _lowest_bit(x: uint256) -> uint256:
+    """
+    @dev Return the index of the lowest set bit of a non-zero word.
+    """
+    n: uint256 = 0
+    v: uint256 = x
+    for width: uint256 in [128, 64, 32, 16, 8, 4, 2, 1]:
+        if v & ((1 << width) - 1) == 0:
+            v = v >> width
+            n += width
+    return n
+
+
+@internal
+@view
+def _next_bucket(start: uint256, limit: uint256) -> (bool, uint256):
+    """
+    @dev Find the first non-empty bucket at or after `start`, scanning at most
+         N_MAX_WORD_SCAN bitmap words and stopping past `limit`. Returns
+         (found, bucket); when nothing is found, bucket is where to resume.
+    """
+    word: uint256 = start // 256
+    bits: uint256 = self.bucket_bitmap[word] >> (start % 256) << (start % 256)
+    for i: uint256 in range(N_MAX_WORD_SCAN):
+        if bits != 0:
+            return True, word * 256 + self._lowest_bit(bits)
+        word += 1
+        if word * 256 > limit:
+            break
+        bits = self.bucket_bitmap[word]
+    return False, word * 256
+
+
+@internal
+def _index_insert(stream_id: uint256, next_ts: uint256):
+    """
+    @dev Add a stream to the bucket of its next_ts. Call before _add_active.
+    """
+    bucket: uint256 = next_ts // BUCKET_LENGTH
+    n: uint256 = self.bucket_len[bucket]
+    self.bucket_ids[bucket][n] = stream_id
+    self.bucket_position[stream_id] = n + 1
+    self.bucket_len[bucket] = n + 1
+    if n == 0:
+        self.bucket_bitmap[bucket // 256] |= 1 << (bucket % 256)
+    first: uint256 = self.first_bucket
+    if self.n_active == 0 or bucket < first:
+        self.first_bucket = bucket
+    elif bucket != first and self.bucket_len[first] == 0:
+        # _index_remove leaves the pointer on the bucket the only live stream just
+        # left; that stream is now the only one indexed.
+        self.first_bucket = bucket
+
+
+@internal
+def _index_remove(stream_id: uint256, next_ts: uint256):
+    """
+    @dev Remove a stream from the bucket of its next_ts by moving the bucket's
+         last id into its slot. Call before _remove_active.
+    """
+    bucket: uint256 = next_ts // BUCKET_LENGTH
+    position: uint256 = self.bucket_position[stream_id]
+    if position == 0:
+        return
+    last: uint256 = self.bucket_len[bucket] - 1
+    if position - 1 != last:
+        last_id: uint256 = self.bucket_ids[bucket][last]
+        self.bucket_ids[bucket][position - 1] = last_id
+        self.bucket_position[last_id] = position
+    self.bucket_ids[bucket][last] = 0
+    self.bucket_position[stream_id] = 0
+    self.bucket_len[bucket] = last
+    if last != 0:
+        return
+
+    self.bucket_bitmap[bucket // 256] &= ~(1 << (bucket % 256))
+    # Move the earliest-bucket pointer forward while it sits on an empty bucket,
+    # unless this was the last live stream.
+    first: uint256 = self.first_bucket
+    if self.n_active > 1 and self.bucket_len[first] == 0:
+        self.first_bucket = self._next_bucket(first, max_value(uint256))[1]
+
+
+@internal
+@view
+def _due_periods(stream_id: uint256) -> uint256:
+    """
+    @dev Return the number of due periods for a stream id, reading only the head
+         word and, once next_ts has passed, the config word.
+    """
+    head: uint256 = self.packed_streams[stream_id].head
+    next_ts: uint256 = (head >> 160) & MASK_64
+    periods_remaining: uint256 = head >> 224
+    if head & MASK_160 == 0 or periods_remaining == 0 or block.timestamp < next_ts:
+        return 0
+
+    period_length: uint256 = (self.packed_streams[stream_id].config >> 160) & MASK_64
+    if period_length == 0:
+        return 0
+    return min((block.timestamp - next_ts) // period_length + 1, periods_remaining)
+
+
+@internal
+@view
+def _reward_due(stream_id: uint256, periods_due: uint256) -> uint256:
+    """
+    @dev Return the reward for executing periods_due periods of a stream.
+    """
+    rewards: uint256 = self.packed_streams[stream_id].rewards
+    if periods_due == self.packed_streams[stream_id].head >> 224:
+        return rewards >> 128
+    return (rewards & MASK_128) * periods_due
+
+
+@internal
+def _advance_stream(
+    stream_id: uint256, caller: address
+) -> (uint256, address, uint256[N_COINS], uint256):
+    """
+    @dev Advance a due stream's state by its due periods and log the execution.
+         Returns (periods_due, pool, amounts_to_donate, reward_paid); periods_due
+         is zero when the stream is not due. Donation and reward payment are left
+         to the caller.
+    """
+    periods_due: uint256 = self._due_periods(stream_id)
     if periods_due == 0:
-        return False
+        return 0, empty(address), empty(uint256[N_COINS]), 0
+
+    stream: DonationStream = self._load_stream(stream_id)
 
     is_final: bool = periods_due == stream.periods_remaining
-    pool: address = stream.pool
-    coins: address[N_COINS] = stream.coins
+    prev_next_ts: uint256 = stream.next_ts
 
     # Compute the slice for this execution, using the remainder on the final call.
     amounts_to_donate: uint256[N_COINS] = empty(uint256[N_COINS])
@@ -154,90 +574,498 @@ def _execute_stream(stream_id: uint256) -> bool:
         reward_paid = stream.reward_remaining
     stream.reward_remaining -= reward_paid
 
-    # Clear storage once the stream is finished.
+    # Clear storage once the stream is finished; otherwise move it to its next bucket.
+    self._index_remove(stream_id, prev_next_ts)
     if is_final:
-        self.streams[stream_id] = empty(DonationStream)
+        self.packed_streams[stream_id] = empty(PackedStream)
+        self._remove_owned(stream_id, stream.donor, stream.pool)
+        self._remove_active(stream_id)
     else:
-        self.streams[stream_id] = stream
+        self._store_stream(stream_id, stream)
+        self._index_insert(stream_id, stream.next_ts)
 
-    # Only approve and add liquidity when there is a non-zero donation.
-    if amounts_to_donate[0] > 0 or amounts_to_donate[1] > 0:
-        balances_before: uint256[N_COINS] = empty(uint256[N_COINS])
-        for j: uint256 in range(N_COINS):
-            if amounts_to_donate[j] > 0:
-                balances_before[j] = staticcall IERC20(coins[j]).balanceOf(self)
-        for j: uint256 in range(N_COINS):
-            if amounts_to_donate[j] > 0:
-                self._safe_approve(coins[j], pool, amounts_to_donate[j])
-        extcall DonationPoolTarget(pool).add_liquidity(
-            amounts_to_donate,
-            0,
-            empty(address),
-            True,
-        )
-        for j: uint256 in range(N_COINS):
-            if amounts_to_donate[j] > 0:
-                balance_after: uint256 = staticcall IERC20(coins[j]).balanceOf(self)
-                assert balances_before[j] >= balance_after, "bad pool pull"
-                assert balances_before[j] - balance_after == amounts_to_donate[j], "bad pool pull"
-                self._safe_approve(coins[j], pool, 0)
-
-    if reward_paid > 0:
-        send(msg.sender, reward_paid)
     log StreamExecuted(
         stream_id=stream_id,
-        caller=msg.sender,
-        pool=pool,
+        caller=caller,
+        pool=stream.pool,
         periods=periods_due,
         amounts=amounts_to_donate,
         reward_paid=reward_paid,
     )
 
+    return periods_due, stream.pool, amounts_to_donate, reward_paid
+
+
+@internal
+def _donate(pool: address, amounts: uint256[N_COINS]):
+    """
+    @dev Add liquidity to a pool as a donation and verify the exact pull.
+    """
+    # Only approve and add liquidity when there is a non-zero donation.
+    if amounts[0] == 0 and amounts[1] == 0:
+        return
+
+    coins: address[N_COINS] = self.pool_coins[pool]
+    balances_before: uint256[N_COINS] = empty(uint256[N_COINS])
+    for j: uint256 in range(N_COINS):
+        if amounts[j] > 0:
+            balances_before[j] = staticcall IERC20(coins[j]).balanceOf(self)
+    for j: uint256 in range(N_COINS):
+        if amounts[j] > 0:
+            self._safe_approve(coins[j], pool, amounts[j])
+    extcall DonationPoolTarget(pool).add_liquidity(
+        amounts,
+        0,
+        empty(address),
+        True,
+    )
+    for j: uint256 in range(N_COINS):
+        if amounts[j] > 0:
+            balance_after: uint256 = staticcall IERC20(coins[j]).balanceOf(self)
+            assert balances_before[j] >= balance_after, "bad pool pull"
+            assert balances_before[j] - balance_after == amounts[j], "bad pool pull"
+            self._safe_approve(coins[j], pool, 0)
+
+
+@internal
+def _execute_stream(stream_id: uint256) -> bool:
+    """
+    @dev Execute a single stream if due and pay its reward.
+    """
+    periods_due: uint256 = 0
+    pool: address = empty(address)
+    amounts: uint256[N_COINS] = empty(uint256[N_COINS])
+    reward_paid: uint256 = 0
+    periods_due, pool, amounts, reward_paid = self._advance_stream(stream_id, msg.sender)
+    if periods_due == 0:
+        return False
+
+    self._donate(pool, amounts)
+    if reward_paid > 0:
+        send(msg.sender, reward_paid)
     return True
 
 
+@internal
+def _execute_batch(
+    stream_ids: DynArray[uint256, N_MAX_EXECUTE], caller: address
+) -> (DynArray[bool, N_MAX_EXECUTE], uint256):
+    """
+    @dev Advance a batch of streams and donate their amounts summed per pool.
+         Returns per-stream results and the reward total, left to the caller to pay.
+    """
+    results: DynArray[bool, N_MAX_EXECUTE] = empty(DynArray[bool, N_MAX_EXECUTE])
+    reward_total: uint256 = 0
+    pools: DynArray[address, N_MAX_EXECUTE] = empty(DynArray[address, N_MAX_EXECUTE])
+    pool_amounts: DynArray[uint256[N_COINS], N_MAX_EXECUTE] = empty(
+        DynArray[uint256[N_COINS], N_MAX_EXECUTE]
+    )
+
+    for i: uint256 in range(len(stream_ids), bound=N_MAX_EXECUTE):
+        periods_due: uint256 = 0
+        pool: address = empty(address)
+        amounts: uint256[N_COINS] = empty(uint256[N_COINS])
+        reward_paid: uint256 = 0
+        periods_due, pool, amounts, reward_paid = self._advance_stream(stream_ids[i], caller)
+        results.append(periods_due > 0)
+        if periods_due == 0:
+            continue
+
+        if amounts[0] > 0 or amounts[1] > 0:
+            found: bool = False
+            for k: uint256 in range(len(pools), bound=N_MAX_EXECUTE):
+                if pools[k] == pool:
+                    for j: uint256 in range(N_COINS):
+                        pool_amounts[k][j] += amounts[j]
+                    found = True
+                    break
+            if not found:
+                pools.append(pool)
+                pool_amounts.append(amounts)
+
+        reward_total += reward_paid
+
+    for k: uint256 in range(len(pools), bound=N_MAX_EXECUTE):
+        self._donate(pools[k], pool_amounts[k])
+
+    return results, reward_total
+
+
+@internal
+def _execute_isolated_batch(
+    stream_ids: DynArray[uint256, N_MAX_EXECUTE], caller: address
+) -> (DynArray[bool, N_MAX_EXECUTE], uint256, DynArray[address, N_MAX_EXECUTE]):
+    """
+    @dev Execute each pool's streams in a separate call to execute_isolated. A pool
+         whose call reverts leaves its streams unchanged, reported as False and
+         logged with StreamFailed. Returns per-stream results, the reward total,
+         left to the caller to pay, and the pools that failed.
+    """
+    results: DynArray[bool, N_MAX_EXECUTE] = empty(DynArray[bool, N_MAX_EXECUTE])
+    reward_total: uint256 = 0
+    failed_pools: DynArray[address, N_MAX_EXECUTE] = empty(DynArray[address, N_MAX_EXECUTE])
+
+    # Group ids by pool, remembering their input positions.
+    pools: DynArray[address, N_MAX_EXECUTE] = empty(DynArray[address, N_MAX_EXECUTE])
+    pool_ids: DynArray[DynArray[uint256, N_MAX_EXECUTE], N_MAX_EXECUTE] = empty(
+        DynArray[DynArray[uint256, N_MAX_EXECUTE], N_MAX_EXECUTE]
+    )
+    pool_positions: DynArray[DynArray[uint256, N_MAX_EXECUTE], N_MAX_EXECUTE] = empty(
+        DynArray[DynArray[uint256, N_MAX_EXECUTE], N_MAX_EXECUTE]
+    )
+    for i: uint256 in range(len(stream_ids), bound=N_MAX_EXECUTE):
+        results.append(False)
+        pool: address = self._to_address(self.packed_streams[stream_ids[i]].config)
+        if pool == empty(address):
+            continue
+        found: bool = False
+        for k: uint256 in range(len(pools), bound=N_MAX_EXECUTE):
+            if pools[k] == pool:
+                pool_ids[k].append(stream_ids[i])
+                pool_positions[k].append(i)
+                found = True
+                break
+        if not found:
+            pools.append(pool)
+            pool_ids.append([stream_ids[i]])
+            pool_positions.append([i])
+
+    for k: uint256 in range(len(pools), bound=N_MAX_EXECUTE):
+        success: bool = False
+        response: Bytes[32 * (N_MAX_EXECUTE + 3)] = b""
+        success, response = raw_call(
+            self,
+            abi_encode(
+                pool_ids[k],
+                caller,
+                method_id=method_id("execute_isolated(uint256[],address)"),
+            ),
+            max_outsize=32 * (N_MAX_EXECUTE + 3),
+            revert_on_failure=False,
+        )
+        if not success:
+            failed_pools.append(pools[k])
+            for stream_id: uint256 in pool_ids[k]:
+                if self._due_periods(stream_id) > 0:
+                    log StreamFailed(stream_id=stream_id, caller=caller, pool=pools[k])
+            continue
+
+        pool_results: DynArray[bool, N_MAX_EXECUTE] = empty(DynArray[bool, N_MAX_EXECUTE])
+        pool_reward: uint256 = 0
+        pool_results, pool_reward = abi_decode(
+            response, (DynArray[bool, N_MAX_EXECUTE], uint256)
+        )
+        for j: uint256 in range(len(pool_results), bound=N_MAX_EXECUTE):
+            results[pool_positions[k][j]] = pool_results[j]
+        reward_total += pool_reward
+
+    return results, reward_total, failed_pools
+
+
+@internal
+@view
+def _collect_due(
+    limit: uint256, skip_pools: DynArray[address, N_MAX_EXECUTE]
+) -> DynArray[uint256, N_MAX_EXECUTE]:
+    """
+    @dev Return up to `limit` due stream ids from the due index, earliest bucket
+         first, leaving out streams into `skip_pools`.
+    """
+    due_ids: DynArray[uint256, N_MAX_EXECUTE] = empty(DynArray[uint256, N_MAX_EXECUTE])
+    if self.n_active == 0 or limit == 0:
+        return due_ids
+
+    bucket: uint256 = self.first_bucket
+    last: uint256 = block.timestamp // BUCKET_LENGTH
+    for step: uint256 in range(N_MAX_EXECUTE):
+        found: bool = False
+        found, bucket = self._next_bucket(bucket, last)
+        if bucket > last:
+            break
+        if not found:
+            continue
+
+        n: uint256 = min(self.bucket_len[bucket], N_MAX_VIEW)
+        for i: uint256 in range(n, bound=N_MAX_VIEW):
+            stream_id: uint256 = self.bucket_ids[bucket][i]
+            # Streams in the current bucket may not be due yet.
+            if self._due_periods(stream_id) == 0:
+                continue
+            if len(skip_pools) > 0 and self._to_address(
+                self.packed_streams[stream_id].config
+            ) in skip_pools:
+                continue
+            due_ids.append(stream_id)
+            if len(due_ids) == limit:
+                return due_ids
+        bucket += 1
+
+    return due_ids
+
+
 ############### EXTERNAL VIEWS ############
+@view
+@external
+def streams(stream_id: uint256) -> DonationStream:
+    """
+    @notice Return a stream; finished and cancelled streams are empty.
+    """
+    stream: DonationStream = self._load_stream(stream_id)
+    stream.coins = self.pool_coins[stream.pool]
+    return stream
+
+
+@view
+@external
+def get_streams(
+    stream_ids: DynArray[uint256, N_MAX_READ], skip_empty: bool = False
+) -> (DynArray[uint256, N_MAX_READ], DynArray[DonationStream, N_MAX_READ]):
+    """
+    @notice Return several streams by id, in input order.
+    @param skip_empty Leave out finished, cancelled and never created ids.
+    @return The ids returned and their streams.
+    """
+    ids: DynArray[uint256, N_MAX_READ] = empty(DynArray[uint256, N_MAX_READ])
+    result: DynArray[DonationStream, N_MAX_READ] = empty(DynArray[DonationStream, N_MAX_READ])
+    for stream_id: uint256 in stream_ids:
+        stream: DonationStream = self._load_stream(stream_id)
+        if skip_empty and stream.donor == empty(address):
+            continue
+        stream.coins = self.pool_coins[stream.pool]
+        ids.append(stream_id)
+        result.append(stream)
+    return ids, result
+
+
+@view
+@external
+def streams_range(
+    start: uint256, n: uint256, skip_empty: bool = False
+) -> (DynArray[uint256, N_MAX_READ], DynArray[DonationStream, N_MAX_READ]):
+    """
+    @notice Return the streams with ids in [start, start + n), capped at N_MAX_READ
+            and at stream_count.
+    @param skip_empty Leave out finished and cancelled streams.
+    @return The ids returned and their streams.
+    """
+    ids: DynArray[uint256, N_MAX_READ] = empty(DynArray[uint256, N_MAX_READ])
+    result: DynArray[DonationStream, N_MAX_READ] = empty(DynArray[DonationStream, N_MAX_READ])
+    count: uint256 = self.stream_count
+    if start >= count:
+        return ids, result
+
+    limit: uint256 = min(min(n, count - start), N_MAX_READ)
+    for i: uint256 in range(limit, bound=N_MAX_READ):
+        stream: DonationStream = self._load_stream(start + i)
+        if skip_empty and stream.donor == empty(address):
+            continue
+        stream.coins = self.pool_coins[stream.pool]
+        ids.append(start + i)
+        result.append(stream)
+    return ids, result
+
+
+@view
+@external
+def streams_of_donor(
+    donor: address, start: uint256, n: uint256
+) -> DynArray[uint256, N_MAX_READ]:
+    """
+    @notice Return the ids of a donor's live streams at positions [start, start + n),
+            capped at N_MAX_READ and at donor_stream_count.
+    @dev Removals move the last id into the freed position, so the order is not
+         stable across transactions.
+    """
+    ids: DynArray[uint256, N_MAX_READ] = empty(DynArray[uint256, N_MAX_READ])
+    count: uint256 = self.donor_stream_count[donor]
+    if start >= count:
+        return ids
+    for i: uint256 in range(min(min(n, count - start), N_MAX_READ), bound=N_MAX_READ):
+        ids.append(self.donor_stream_ids[donor][start + i])
+    return ids
+
+
+@view
+@external
+def streams_of_pool(
+    pool: address, start: uint256, n: uint256
+) -> DynArray[uint256, N_MAX_READ]:
+    """
+    @notice Return the ids of a pool's live streams at positions [start, start + n),
+            capped at N_MAX_READ and at pool_stream_count.
+    @dev Removals move the last id into the freed position, so the order is not
+         stable across transactions.
+    """
+    ids: DynArray[uint256, N_MAX_READ] = empty(DynArray[uint256, N_MAX_READ])
+    count: uint256 = self.pool_stream_count[pool]
+    if start >= count:
+        return ids
+    for i: uint256 in range(min(min(n, count - start), N_MAX_READ), bound=N_MAX_READ):
+        ids.append(self.pool_stream_ids[pool][start + i])
+    return ids
+
+
 @view
 @external
 def is_due(stream_id: uint256) -> bool:
     """
     @notice Return true if the stream can be executed now.
     """
-    return self._due_periods(self.streams[stream_id]) > 0
+    return self._due_periods(stream_id) > 0
 
 
 @view
 @external
 def streams_and_rewards_due(
+    start: uint256 = max_value(uint256), count: uint256 = N_MAX_VIEW
 ) -> (DynArray[uint256, N_MAX_VIEW], DynArray[uint256, N_MAX_VIEW]):
     """
-    @notice Return due stream ids and rewards, newest first.
-    @dev Not meant to be called onchain; iterates over up to N_MAX_VIEW streams starting from the newest.
+    @notice Return due stream ids and rewards from the live set, last added first.
+    @dev Not meant to be called onchain; iterates over up to N_MAX_VIEW live streams.
+         Page through the set by passing the previous `start` minus `count`. Removing
+         a stream moves the top id down into its position, so if streams are removed
+         between calls a downward walk can return an id from an earlier page again;
+         dedupe across pages. Ids live throughout the walk are never skipped.
+    @param start Walk the set positions below `start`, clamped to n_active (default: last).
+    @param count Number of positions to walk, capped at N_MAX_VIEW.
     """
     due_ids: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
     rewards: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
-    count: uint256 = self.stream_count
-    if count == 0:
+    end: uint256 = min(start, self.n_active)
+    if end == 0:
         return due_ids, rewards
 
-    # Walk backward from newest to oldest, capped for view usage.
-    limit: uint256 = min(count, N_MAX_VIEW)
+    # Walk the live set backward, capped for view usage.
+    limit: uint256 = min(min(end, count), N_MAX_VIEW)
     for i: uint256 in range(limit, bound=N_MAX_VIEW):
-        stream_id: uint256 = count - 1 - i
-        stream: DonationStream = self.streams[stream_id]
-        periods_due: uint256 = self._due_periods(stream)
+        stream_id: uint256 = self.active_ids[end - 1 - i]
+        periods_due: uint256 = self._due_periods(stream_id)
         if periods_due == 0:
             continue
 
         due_ids.append(stream_id)
-        if periods_due == stream.periods_remaining:
-            rewards.append(stream.reward_remaining)
-        else:
-            rewards.append(stream.reward_per_period * periods_due)
+        rewards.append(self._reward_due(stream_id, periods_due))
+
+    return due_ids, rewards
+
+
+@view
+@external
+def next_due_timestamp() -> uint256:
+    """
+    @notice Return when the earliest live stream becomes due, rounded down to
+            BUCKET_LENGTH, or max_value(uint256) when no stream is live.
+    @dev Reads the earliest-bucket pointer; the bounded bitmap scan only moves
+         past buckets emptied since the pointer was last updated.
+    """
+    if self.n_active == 0:
+        return max_value(uint256)
+    return self._next_bucket(self.first_bucket, max_value(uint256))[1] * BUCKET_LENGTH
+
+
+@view
+@external
+def due_from_index() -> (DynArray[uint256, N_MAX_VIEW], DynArray[uint256, N_MAX_VIEW]):
+    """
+    @notice Return up to N_MAX_VIEW due stream ids and rewards, earliest bucket first.
+    @dev Not meant to be called onchain; walks only the due index buckets up to
+         block.timestamp, so the cost follows the number of due streams.
+    """
+    due_ids: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
+    rewards: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
+    if self.n_active == 0:
+        return due_ids, rewards
+
+    bucket: uint256 = self.first_bucket
+    last: uint256 = block.timestamp // BUCKET_LENGTH
+    for step: uint256 in range(N_MAX_VIEW):
+        found: bool = False
+        found, bucket = self._next_bucket(bucket, last)
+        if bucket > last:
+            break
+        if not found:
+            continue
+
+        n: uint256 = min(self.bucket_len[bucket], N_MAX_VIEW - len(due_ids))
+        for i: uint256 in range(n, bound=N_MAX_VIEW):
+            stream_id: uint256 = self.bucket_ids[bucket][i]
+            # Streams in the current bucket may not be due yet.
+            periods_due: uint256 = self._due_periods(stream_id)
+            if periods_due == 0:
+                continue
+
+            due_ids.append(stream_id)
+            rewards.append(self._reward_due(stream_id, periods_due))
+
+        if len(due_ids) == N_MAX_VIEW:
+            break
+        bucket += 1
 
     return due_ids, rewards
 
 
+@view
+@external
+def due_bitmap(start_id: uint256, n_words: uint256) -> DynArray[uint256, N_MAX_BITMAP_WORDS]:
+    """
+    @notice Return one due flag per stream id, packed 256 ids per word: bit b of
+            word w is set when stream start_id + 256 * w + b is due.
+    @dev Not meant to be called onchain. Words past stream_count are left out.
+    @param n_words Number of words to return, capped at N_MAX_BITMAP_WORDS.
+    """
+    words: DynArray[uint256, N_MAX_BITMAP_WORDS] = empty(DynArray[uint256, N_MAX_BITMAP_WORDS])
+    count: uint256 = self.stream_count
+    if start_id >= count:
+        return words
+
+    n: uint256 = min(min(n_words, N_MAX_BITMAP_WORDS), (count - start_id + 255) // 256)
+    for w: uint256 in range(n, bound=N_MAX_BITMAP_WORDS):
+        base: uint256 = start_id + 256 * w
+        word: uint256 = 0
+        for b: uint256 in range(min(count - base, 256), bound=256):
+            if self._due_periods(base + b) > 0:
+                word |= 1 << b
+        words.append(word)
+    return words
+
+
+@view
+@external
+def due_summary() -> (uint256, uint256):
+    """
+    @notice Return the number of due streams and their total reward.
+    @dev Not meant to be called onchain. Walks only the due index buckets up to
+         block.timestamp, like due_from_index, reading N_MAX_VIEW ids per bucket
+         at most.
+    """
+    n_due: uint256 = 0
+    reward_total: uint256 = 0
+    if self.n_active == 0:
+        return n_due, reward_total
+
+    bucket: uint256 = self.first_bucket
+    last: uint256 = block.timestamp // BUCKET_LENGTH
+    for step: uint256 in range(N_MAX_VIEW):
+        found: bool = False
+        found, bucket = self._next_bucket(bucket, last)
+        if bucket > last:
+            break
+        if not found:
+            continue
+
+        n: uint256 = min(self.bucket_len[bucket], N_MAX_VIEW)
+        for i: uint256 in range(n, bound=N_MAX_VIEW):
+            stream_id: uint256 = self.bucket_ids[bucket][i]
+            periods_due: uint256 = self._due_periods(stream_id)
+            if periods_due == 0:
+                continue
+            n_due += 1
+            reward_total += self._reward_due(stream_id, periods_due)
+        bucket += 1
+
+    return n_due, reward_total
+
+
 ############### EXTERNAL ACTIONS #########
 @external
 @payable
@@ -253,65 +1081,86 @@ def create_stream(
     """
     @notice Create a donation stream for a pool.
     """
-    assert pool != empty(address), "pool required"
-    assert n_periods > 0, "bad n_periods"
-    assert period_length > 0, "bad period_length"
-    assert amounts[0] > 0 or amounts[1] > 0, "zero amounts"
-
-    # Ensure caller-provided coins match the pool configuration.
-    assert (
-        coins[0] == staticcall DonationPoolTarget(pool).coins(0)
-        and coins[1] == staticcall DonationPoolTarget(pool).coins(1)
-    ), "coin mismatch"
-
-    # Rewards are pre-funded for all periods; excess is refunded.
-    reward_total: uint256 = reward_per_period * n_periods
-    assert msg.value >= reward_total, "reward mismatch"
-
-    # Per-period amounts are truncated; remainders donate on the final period.
-    amounts_per_period: uint256[N_COINS] = empty(uint256[N_COINS])
-    for i: uint256 in range(N_COINS):
-        amount: uint256 = amounts[i]
-        if amount > 0:
-            balance_before: uint256 = staticcall IERC20(coins[i]).balanceOf(self)
-            assert extcall IERC20(coins[i]).transferFrom(
-                msg.sender, self, amount, default_return_value=True
-            ), "transfer failed"
-            balance_after: uint256 = staticcall IERC20(coins[i]).balanceOf(self)
-            assert balance_after - balance_before == amount, "bad token transfer"
-        amounts_per_period[i] = amount // n_periods
-
-    stream_id: uint256 = self.stream_count
-    self.stream_count = stream_id + 1
-
-    self.streams[stream_id] = DonationStream(
-        donor=msg.sender,
+    spec: StreamSpec = StreamSpec(
         pool=pool,
         coins=coins,
-        amounts_per_period=amounts_per_period,
+        amounts=amounts,
         period_length=period_length,
+        n_periods=n_periods,
         reward_per_period=reward_per_period,
-        next_ts=block.timestamp,
-        reward_remaining=reward_total,
-        amounts_remaining=amounts,
-        periods_remaining=n_periods,
     )
+    reward_total: uint256 = self._check_spec(spec)
+    self._check_coins(pool, coins)
+
+    # Rewards are pre-funded for all periods; excess is refunded.
+    assert msg.value >= reward_total, "reward mismatch"
+
+    for j: uint256 in range(N_COINS):
+        if amounts[j] > 0:
+            self._pull_token(coins[j], amounts[j])
+
+    stream_id: uint256 = self._record_stream(spec, reward_total)
 
     # Refund excess message value.
     if msg.value > reward_total:
         send(msg.sender, msg.value - reward_total)
 
-    log StreamCreated(
-        stream_id=stream_id,
-        donor=msg.sender,
-        pool=pool,
-        amounts=amounts,
-        period_length=period_length,
-        n_periods=n_periods,
-        reward_per_period=reward_per_period,
+    return stream_id
+
+
+@external
+@payable
+@nonreentrant
+def create_streams(specs: DynArray[StreamSpec, N_MAX_CREATE]) -> DynArray[uint256, N_MAX_CREATE]:
+    """
+    @notice Create several donation streams in one call.
+    @dev Pool coins are read from the pool once per new pool and each distinct
+         token is pulled once for the summed amount. msg.value pre-funds the rewards of all
+         streams; excess is refunded.
+    @return The new stream ids in input order.
+    """
+    tokens: DynArray[address, N_COINS * N_MAX_CREATE] = empty(
+        DynArray[address, N_COINS * N_MAX_CREATE]
+    )
+    token_amounts: DynArray[uint256, N_COINS * N_MAX_CREATE] = empty(
+        DynArray[uint256, N_COINS * N_MAX_CREATE]
     )
+    rewards: DynArray[uint256, N_MAX_CREATE] = empty(DynArray[uint256, N_MAX_CREATE])
+    reward_sum: uint256 = 0
 
-    return stream_id
+    for spec: StreamSpec in specs:
+        reward_total: uint256 = self._check_spec(spec)
+        rewards.append(reward_total)
+        reward_sum += reward_total
+
+        self._check_coins(spec.pool, spec.coins)
+
+        for j: uint256 in range(N_COINS):
+            if spec.amounts[j] == 0:
+                continue
+            found: bool = False
+            for t: uint256 in range(len(tokens), bound=N_COINS * N_MAX_CREATE):
+                if tokens[t] == spec.coins[j]:
+                    token_amounts[t] += spec.amounts[j]
+                    found = True
+                    break
+            if not found:
+                tokens.append(spec.coins[j])
+                token_amounts.append(spec.amounts[j])
+
+    assert msg.value >= reward_sum, "reward mismatch"
+
+    for t: uint256 in range(len(tokens), bound=N_COINS * N_MAX_CREATE):
+        self._pull_token(tokens[t], token_amounts[t])
+
+    stream_ids: DynArray[uint256, N_MAX_CREATE] = empty(DynArray[uint256, N_MAX_CREATE])
+    for i: uint256 in range(len(specs), bound=N_MAX_CREATE):
+        stream_ids.append(self._record_stream(specs[i], rewards[i]))
+
+    if msg.value > reward_sum:
+        send(msg.sender, msg.value - reward_sum)
+
+    return stream_ids
 
 
 @external
@@ -320,30 +1169,58 @@ def cancel_stream(stream_id: uint256):
     """
     @notice Cancel a stream and refund remaining balances.
     """
-    stream: DonationStream = self.streams[stream_id]
-    assert stream.donor == msg.sender, "donor only"
-
-    pool: address = stream.pool
-    coins: address[N_COINS] = stream.coins
-    amounts_refund: uint256[N_COINS] = stream.amounts_remaining
-    reward_refund: uint256 = stream.reward_remaining
-    self.streams[stream_id] = empty(DonationStream)
+    coins: address[N_COINS] = empty(address[N_COINS])
+    amounts_refund: uint256[N_COINS] = empty(uint256[N_COINS])
+    reward_refund: uint256 = 0
+    coins, amounts_refund, reward_refund = self._cancel(stream_id)
 
     for i: uint256 in range(N_COINS):
         if amounts_refund[i] > 0:
-            assert extcall IERC20(coins[i]).transfer(
-                msg.sender, amounts_refund[i], default_return_value=True
-            ), "refund failed"
+            self._refund_token(coins[i], amounts_refund[i])
     if reward_refund > 0:
         send(msg.sender, reward_refund)
 
-    log StreamCancelled(
-        stream_id=stream_id,
-        donor=msg.sender,
-        pool=pool,
-        amounts=amounts_refund,
-        reward_refund=reward_refund,
+
+@external
+@nonreentrant
+def cancel_many(stream_ids: DynArray[uint256, N_MAX_CANCEL]):
+    """
+    @notice Cancel several of the caller's streams.
+    @dev Refunds are summed per token and paid once, together with a single
+         reward refund. Reverts if any id is not a live stream of the caller.
+    """
+    tokens: DynArray[address, N_COINS * N_MAX_CANCEL] = empty(
+        DynArray[address, N_COINS * N_MAX_CANCEL]
     )
+    token_amounts: DynArray[uint256, N_COINS * N_MAX_CANCEL] = empty(
+        DynArray[uint256, N_COINS * N_MAX_CANCEL]
+    )
+    reward_total: uint256 = 0
+
+    for stream_id: uint256 in stream_ids:
+        coins: address[N_COINS] = empty(address[N_COINS])
+        amounts_refund: uint256[N_COINS] = empty(uint256[N_COINS])
+        reward_refund: uint256 = 0
+        coins, amounts_refund, reward_refund = self._cancel(stream_id)
+        reward_total += reward_refund
+
+        for j: uint256 in range(N_COINS):
+            if amounts_refund[j] == 0:
+                continue
+            found: bool = False
+            for t: uint256 in range(len(tokens), bound=N_COINS * N_MAX_CANCEL):
+                if tokens[t] == coins[j]:
+                    token_amounts[t] += amounts_refund[j]
+                    found = True
+                    break
+            if not found:
+                tokens.append(coins[j])
+                token_amounts.append(amounts_refund[j])
+
+    for t: uint256 in range(len(tokens), bound=N_COINS * N_MAX_CANCEL):
+        self._refund_token(tokens[t], token_amounts[t])
+    if reward_total > 0:
+        send(msg.sender, reward_total)
 
 
 @external
@@ -357,12 +1234,84 @@ def execute(stream_id: uint256) -> bool:
 
 @external
 @nonreentrant
-def execute_many(stream_ids: DynArray[uint256, N_MAX_EXECUTE]) -> DynArray[bool, N_MAX_EXECUTE]:
+def execute_many(
+    stream_ids: DynArray[uint256, N_MAX_EXECUTE], isolate: bool = False
+) -> DynArray[bool, N_MAX_EXECUTE]:
     """
     @notice Execute a batch of stream ids.
+    @dev Donations are summed per pool, so each pool gets one add_liquidity call,
+         and rewards are paid to the caller in a single transfer.
+    @param isolate Execute each pool's streams in a separate call that may fail.
+           When a pool's donation reverts, its streams are left unchanged, reported
+           as False and logged with StreamFailed, and the other pools still run.
     @return Per-stream execution results in input order.
     """
     results: DynArray[bool, N_MAX_EXECUTE] = empty(DynArray[bool, N_MAX_EXECUTE])
-    for i: uint256 in range(len(stream_ids), bound=N_MAX_EXECUTE):
-        results.append(self._execute_stream(stream_ids[i]))
+    reward_total: uint256 = 0
+    if not isolate:
+        results, reward_total = self._execute_batch(stream_ids, msg.sender)
+        if reward_total > 0:
+            send(msg.sender, reward_total)
+        return results
+
+    failed_pools: DynArray[address, N_MAX_EXECUTE] = empty(DynArray[address, N_MAX_EXECUTE])
+    results, reward_total, failed_pools = self._execute_isolated_batch(stream_ids, msg.sender)
+    if reward_total > 0:
+        send(msg.sender, reward_total)
+
     return results
+
+
+@external
+@nonreentrant
+def execute_due(max_n: uint256 = N_MAX_EXECUTE) -> uint256:
+    """
+    @notice Find and execute up to max_n due streams, earliest first.
+    @dev Due streams come from the due index, so no ids need to be passed in.
+         Runs batches of N_MAX_EXECUTE like execute_many in isolation mode: a pool
+         whose donation reverts gets StreamFailed logs and is skipped for the rest
+         of the call, so it cannot block the other pools' streams.
+    @param max_n Streams to execute at most, capped at N_MAX_EXECUTE_DUE.
+    @return Number of streams executed.
+    """
+    n_executed: uint256 = 0
+    reward_total: uint256 = 0
+    limit: uint256 = min(max_n, N_MAX_EXECUTE_DUE)
+    skip_pools: DynArray[address, N_MAX_EXECUTE] = empty(DynArray[address, N_MAX_EXECUTE])
+    for batch: uint256 in range(N_MAX_EXECUTE_DUE // N_MAX_EXECUTE):
+        stream_ids: DynArray[uint256, N_MAX_EXECUTE] = self._collect_due(
+            min(limit - n_executed, N_MAX_EXECUTE), skip_pools
+        )
+        if len(stream_ids) == 0:
+            break
+
+        results: DynArray[bool, N_MAX_EXECUTE] = empty(DynArray[bool, N_MAX_EXECUTE])
+        reward: uint256 = 0
+        failed_pools: DynArray[address, N_MAX_EXECUTE] = empty(DynArray[address, N_MAX_EXECUTE])
+        results, reward, failed_pools = self._execute_isolated_batch(stream_ids, msg.sender)
+        for executed: bool in results:
+            if executed:
+                n_executed += 1
+        for pool: address in failed_pools:
+            if len(skip_pools) < N_MAX_EXECUTE:
+                skip_pools.append(pool)
+        reward_total += reward
+
+    if reward_total > 0:
+        send(msg.sender, reward_total)
+
+    return n_executed
+
+
+@external
+def execute_isolated(
+    stream_ids: DynArray[uint256, N_MAX_EXECUTE], caller: address
+) -> (DynArray[bool, N_MAX_EXECUTE], uint256):
+    """
+    @notice Execute one pool's streams for execute_many in isolation mode and
+            for execute_due.
+    @dev Only callable by this contract. The reward is returned for the calling
+         function to pay.
+    """
+    assert msg.sender == self, "internal only"
+    return self._execute_batch(stream_ids, caller)
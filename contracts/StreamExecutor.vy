@@ -8,17 +8,49 @@
 
 N_MAX_EXECUTE: constant(uint256) = 32
 N_MAX_VIEW: constant(uint256) = 1024
-STREAMER: constant(address) = 0x2b786BB995978CC2242C567Ae62fd617b0eBC828
+# Upper bound on view pages read per execute() call. Pages span N_MAX_VIEW
+# positions, or fewer (down to N_MAX_EXECUTE) when max_streams is smaller.
+N_MAX_PAGES: constant(uint256) = 2048
+# Executed ids returned by execute(); the returned count covers all of them.
+N_MAX_RESULT: constant(uint256) = 256
+# preview() gas model, fitted to execute() runs against the test mocks with all
+# streams in one pool. The first donation pays for cold pool and token accounts.
+# Real pools' add_liquidity costs more than the mock's, and every further pool
+# in a chunk adds one, so the estimate is a lower bound outside the mocks.
+GAS_BASE: constant(uint256) = 25_000
+GAS_PER_POSITION: constant(uint256) = 14_500
+GAS_FIRST_DONATION: constant(uint256) = 350_000
+GAS_PER_CHUNK: constant(uint256) = 95_000
+GAS_PER_STREAM: constant(uint256) = 56_000
+
+STREAMER: public(immutable(address))
 
 
 interface DonationStreamer:
+    def n_active() -> uint256: view
     def streams_and_rewards_due(
+        start: uint256, count: uint256
     ) -> (DynArray[uint256, N_MAX_VIEW], DynArray[uint256, N_MAX_VIEW]): view
     def execute_many(
         stream_ids: DynArray[uint256, N_MAX_EXECUTE]
     ) -> DynArray[bool, N_MAX_EXECUTE]: nonpayable
 
 
+@deploy
+def __init__(streamer: address):
+    """
+    @notice Initialize the executor for a DonationStreamer deployment.
+    @param streamer DonationStreamer whose due streams this contract executes.
+    @dev Reverts unless the streamer has n_active and the paged due view; the
+         v0.1.0 streamer has neither.
+    """
+    n_active: uint256 = staticcall DonationStreamer(streamer).n_active()
+    due_ids: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
+    rewards: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
+    due_ids, rewards = staticcall DonationStreamer(streamer).streams_and_rewards_due(0, 0)
+    STREAMER = streamer
+
+
 @external
 @payable
 def __default__():
@@ -26,25 +58,112 @@ def __default__():
 
 
 @internal
-def _execute_due():
+def _execute_chunk(chunk: DynArray[uint256, N_MAX_EXECUTE]) -> DynArray[uint256, N_MAX_EXECUTE]:
+    """
+    @dev Execute a chunk of stream ids and return those that were executed.
+    """
+    results: DynArray[bool, N_MAX_EXECUTE] = extcall DonationStreamer(STREAMER).execute_many(chunk)
+    executed: DynArray[uint256, N_MAX_EXECUTE] = empty(DynArray[uint256, N_MAX_EXECUTE])
+    for i: uint256 in range(len(chunk), bound=N_MAX_EXECUTE):
+        if results[i]:
+            executed.append(chunk[i])
+    return executed
+
+
+@view
+@external
+def preview() -> (uint256, uint256, uint256):
+    """
+    @notice Estimate what execute() with default arguments would do now.
+    @dev Not meant to be called onchain. The gas figure is a lower bound: it is
+         fitted to the test mocks with all streams in one pool and leaves out the
+         add_liquidity of each additional pool per chunk. Use eth_estimateGas on
+         execute() for the gas a run needs.
+    @return (due streams, execute_many chunks, lower bound on gas)
+    """
+    n_active: uint256 = staticcall DonationStreamer(STREAMER).n_active()
+    n_due: uint256 = 0
+    start: uint256 = n_active
+    for page: uint256 in range(N_MAX_PAGES):
+        if start == 0:
+            break
+        due_ids: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
+        rewards: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
+        due_ids, rewards = staticcall DonationStreamer(STREAMER).streams_and_rewards_due(
+            start, N_MAX_VIEW
+        )
+        start -= min(start, N_MAX_VIEW)
+        n_due += len(due_ids)
+
+    n_chunks: uint256 = (n_due + N_MAX_EXECUTE - 1) // N_MAX_EXECUTE
+    gas: uint256 = GAS_BASE + n_active * GAS_PER_POSITION
+    if n_chunks > 0:
+        gas += GAS_FIRST_DONATION + n_chunks * GAS_PER_CHUNK + n_due * GAS_PER_STREAM
+    return n_due, n_chunks, gas
+
+
+@external
+def execute(
+    max_streams: uint256 = max_value(uint256), min_gas_left: uint256 = 0
+) -> (uint256, DynArray[uint256, N_MAX_RESULT]):
+    """
+    @notice Execute due streams and forward the rewards to the caller.
+    @dev With default arguments, runs every due stream found in the live set.
+         Bounded calls let a large backlog drain over several transactions.
+    @param max_streams Stop after this many due ids.
+    @param min_gas_left Do not start another page read or execute_many chunk
+           with less gas left than this.
+    @return Number of streams executed and the first N_MAX_RESULT of their ids.
+    """
     due_ids: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
     rewards: DynArray[uint256, N_MAX_VIEW] = empty(DynArray[uint256, N_MAX_VIEW])
-    due_ids, rewards = staticcall DonationStreamer(STREAMER).streams_and_rewards_due()
-
     chunk: DynArray[uint256, N_MAX_EXECUTE] = empty(DynArray[uint256, N_MAX_EXECUTE])
-    for i: uint256 in range(len(due_ids), bound=N_MAX_VIEW):
-        chunk.append(due_ids[i])
-        if len(chunk) == N_MAX_EXECUTE:
-            extcall DonationStreamer(STREAMER).execute_many(chunk)
+    executed: DynArray[uint256, N_MAX_EXECUTE] = empty(DynArray[uint256, N_MAX_EXECUTE])
+    executed_ids: DynArray[uint256, N_MAX_RESULT] = empty(DynArray[uint256, N_MAX_RESULT])
+    n_executed: uint256 = 0
+    n_taken: uint256 = 0
+    done: bool = False
+
+    # Walk the live set from the top, one view page at a time. Executing a final
+    # period moves the top id down into the freed position; both were on pages
+    # already read, so the pages below keep their ids within this call.
+    # Bounded runs read smaller pages, as the view costs gas for every position.
+    page_size: uint256 = max(min(max_streams, N_MAX_VIEW), N_MAX_EXECUTE)
+    start: uint256 = staticcall DonationStreamer(STREAMER).n_active()
+    for page: uint256 in range(N_MAX_PAGES):
+        if start == 0 or done or msg.gas < min_gas_left:
+            break
+        due_ids, rewards = staticcall DonationStreamer(STREAMER).streams_and_rewards_due(
+            start, page_size
+        )
+        start -= min(start, page_size)
+
+        for i: uint256 in range(len(due_ids), bound=N_MAX_VIEW):
+            if n_taken == max_streams:
+                done = True
+                break
+            chunk.append(due_ids[i])
+            n_taken += 1
+            if len(chunk) < N_MAX_EXECUTE:
+                continue
+            if msg.gas < min_gas_left:
+                done = True
+                break
+            executed = self._execute_chunk(chunk)
             chunk = empty(DynArray[uint256, N_MAX_EXECUTE])
+            n_executed += len(executed)
+            for stream_id: uint256 in executed:
+                if len(executed_ids) < N_MAX_RESULT:
+                    executed_ids.append(stream_id)
 
-    if len(chunk) > 0:
-        extcall DonationStreamer(STREAMER).execute_many(chunk)
+    if len(chunk) > 0 and msg.gas >= min_gas_left:
+        executed = self._execute_chunk(chunk)
+        n_executed += len(executed)
+        for stream_id: uint256 in executed:
+            if len(executed_ids) < N_MAX_RESULT:
+                executed_ids.append(stream_id)
 
     if self.balance > 0:
         send(msg.sender, self.balance)
 
-
-@external
-def execute():
-    self._execute_due()
+    return n_executed, executed_ids
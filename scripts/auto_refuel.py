@@ -2,6 +2,7 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "titanoboa==0.2.8",
+#     "vyper==0.4.3",
 # ]
 # ///
 """
@@ -10,14 +11,29 @@ Executes due streams across multiple chains.
 """
 
 import argparse
+import contextlib
+import io
+import multiprocessing
 import os
 import sys
 import time
-import boa
-from eth_account import Account
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.connection import wait
 
+from build_artifacts import load_artifact
+from confirmations import Confirmation, confirm
+
+# boa (and the vyper compiler it pulls in) is imported inside the functions that
+# need it, so argument parsing and parallel-mode startup stay fast.
 
 DONATION_STREAMER = "0x2b786BB995978CC2242C567Ae62fd617b0eBC828"
+DONATION_STREAMER_PATH = "contracts/DonationStreamer.vy"
+
+# Mirrors DonationStreamer.N_MAX_EXECUTE, the execute_many batch bound.
+N_MAX_EXECUTE = 32
+
+# Headroom on eth_estimateGas; later chunks are estimated before earlier ones land.
+GAS_BUFFER_PCT = 20
 
 ALCHEMY_RPC_BASE = "https://{network}-mainnet.g.alchemy.com/v2/{api_key}"
 
@@ -27,52 +43,230 @@ CHAINS = {
         "alchemy_network": "gnosis",
         "explorer": "https://gnosisscan.io",
         "min_balance": 0.01,  # xDAI
+        "profit_check": False,  # defer streams whose reward does not cover gas
+        "priority_percentile": 50,  # eth_feeHistory reward percentile used as tip
+        "max_base_fee_gwei": 10,  # defer execution above this base fee (None: no ceiling)
+        "block_time": 5,  # seconds, used to pace receipt polling
+        "confirmations": 1,
+        "deploy_block": 37_000_000,  # --index-db starts here; at or below the streamer deployment
     },
     "ethereum": {
         "chain_id": 1,
         "alchemy_network": "eth",
         "explorer": "https://etherscan.io",
         "min_balance": 0.0001,  # ETH
+        "profit_check": True,  # mainnet gas can exceed small streams' rewards
+        "priority_percentile": 40,
+        "max_base_fee_gwei": 30,
+        "block_time": 12,
+        "confirmations": 1,
+        "deploy_block": 21_000_000,
     },
     "base": {
         "chain_id": 8453,
         "alchemy_network": "base",
         "explorer": "https://basescan.org",
         "min_balance": 0.0001,  # ETH one call ~ 0.00002 ETH
+        "profit_check": False,
+        "priority_percentile": 25,
+        "max_base_fee_gwei": 0.5,
+        "block_time": 2,
+        "confirmations": 1,
+        "deploy_block": 24_000_000,
     },
 }
 
 
-def get_streamer_contract():
-    """Load DonationStreamer contract interface."""
-    return boa.load_partial("contracts/DonationStreamer.vy").at(DONATION_STREAMER)
+def get_streamer_abi() -> list[dict]:
+    """Return the DonationStreamer ABI, from the prebuilt artifact when it is fresh."""
+    artifact = load_artifact(DONATION_STREAMER_PATH, abi_only=True)
+    if artifact is None:
+        import boa
+
+        print("WARNING: DonationStreamer artifact missing or stale, compiling from source")
+        return boa.load_partial(DONATION_STREAMER_PATH).compiler_data.abi
+    return artifact["abi"]
+
+
+def get_streamer_reader(rpc_url: str):
+    """Return a StreamerRPC for the DonationStreamer deployment."""
+    from streamer_rpc import StreamerRPC
+
+    return StreamerRPC(rpc_url, DONATION_STREAMER, get_streamer_abi())
+
+
+def submit_chunks(reader, chunks: list[list[int]], account, nonces, chain_id: int, fees):
+    """
+    Sign and broadcast one execute_many transaction per chunk, back to back.
+    Nonces come from the local nonce manager so no chunk waits on the previous
+    confirmation. Returns tx hashes, None where a chunk could not be sent.
+    """
+    from boa.rpc import to_hex
+
+    rpc = reader.rpc
+    can_isolate = reader.has_overload("execute_many", 2)
+    tx_hashes: list[str | None] = []
+    for i, chunk in enumerate(chunks):
+        label = f"Chunk {i + 1}/{len(chunks)}"
+        tx = {
+            "from": account.address,
+            "to": DONATION_STREAMER,
+            "data": to_hex(reader.prepare_calldata("execute_many", chunk)),
+            "value": "0x0",
+            "chainId": hex(chain_id),
+            "maxFeePerGas": hex(fees.max_fee),
+            "maxPriorityFeePerGas": hex(fees.priority_fee),
+        }
+        try:
+            gas = int(rpc.fetch("eth_estimateGas", [tx]), 16)
+        except Exception as e:
+            if not can_isolate:
+                print(f"  {label}: gas estimation failed: {e}")
+                tx_hashes.append(None)
+                continue
+            # A pool in the chunk reverts: run each pool in isolation so the others still land.
+            print(f"  {label}: gas estimation failed ({e}), retrying with isolated pools")
+            tx["data"] = to_hex(reader.prepare_calldata("execute_many", chunk, True))
+            try:
+                gas = int(rpc.fetch("eth_estimateGas", [tx]), 16)
+            except Exception as e:
+                print(f"  {label}: gas estimation failed: {e}")
+                tx_hashes.append(None)
+                continue
+
+        nonce = nonces.reserve()
+        tx["gas"] = hex(gas * (100 + GAS_BUFFER_PCT) // 100)
+        tx["nonce"] = hex(nonce)
+        signed = account.sign_transaction(tx)
+        try:
+            tx_hash = rpc.fetch("eth_sendRawTransaction", [to_hex(bytes(signed.raw_transaction))])
+        except Exception as e:
+            print(f"  {label}: send failed with nonce {nonce}: {e}")
+            nonces.send_failed(nonce)
+            tx_hashes.append(None)
+            continue
+        nonces.sent(nonce, tx_hash)
+        print(f"  {label}: {len(chunk)} streams, nonce {nonce}, tx {tx_hash}")
+        tx_hashes.append(tx_hash)
+
+    return tx_hashes
+
 
+def wait_for_chunks(
+    chain: str, rpc, chunks: list[list[int]], tx_hashes: list[str | None]
+) -> list[Confirmation | None]:
+    """
+    Wait for every broadcast chunk and report per-chunk outcomes from the decoded
+    logs. Returns each chunk's confirmation, or None if it did not land successfully.
+    """
+    config = CHAINS[chain]
+    outcomes = []
+    for i, (chunk, tx_hash) in enumerate(zip(chunks, tx_hashes)):
+        label = f"Chunk {i + 1}/{len(chunks)} ({len(chunk)} streams)"
+        if tx_hash is None:
+            print(f"  {label}: NOT SENT")
+            outcomes.append(None)
+            continue
+        try:
+            confirmation = confirm(
+                rpc,
+                tx_hash,
+                DONATION_STREAMER,
+                block_time=config["block_time"],
+                confirmations=config["confirmations"],
+            )
+        except Exception as e:
+            print(f"  {label}: NOT CONFIRMED ({e})")
+            outcomes.append(None)
+            continue
+        if not confirmation.success:
+            print(f"  {label}: REVERTED in block {confirmation.block_number}")
+            outcomes.append(None)
+            continue
+
+        skipped = [sid for sid in chunk if sid not in confirmation.executed_ids]
+        status = "FAILED" if confirmation.failed_ids else "OK"
+        if confirmation.failed_ids and confirmation.executions:
+            status = "PARTIAL"
+        print(
+            f"  {label}: {status} in block {confirmation.block_number}, "
+            f"executed {len(confirmation.executions)}, "
+            f"reward {confirmation.reward_paid / 1e18:.6f} native, gas {confirmation.gas_used}"
+        )
+        if confirmation.failed_ids:
+            print(f"    Failed (pool donation reverted): {sorted(confirmation.failed_ids)}")
+        skipped = [sid for sid in skipped if sid not in confirmation.failed_ids]
+        if skipped:
+            # Not due anymore by the time the chunk landed (e.g. executed by someone else).
+            print(f"    Not executed: {skipped}")
+        outcomes.append(confirmation)
+    return outcomes
+
+
+def read_due_from_index(chain: str, reader, index_db: str) -> tuple[list[int], list[int]]:
+    """Sync the local SQLite mirror and compute due streams from it."""
+    from stream_indexer import StreamIndexer
 
-def execute_refuel(chain: str, rpc_url: str, private_key: str, dry_run: bool) -> tuple[bool, float | None]:
+    config = CHAINS[chain]
+    indexer = StreamIndexer(
+        index_db, reader, config["chain_id"], start_block=config["deploy_block"]
+    )
+    try:
+        n_events = indexer.sync()
+        last_block, _ = indexer.last_synced()
+        print(f"Index: {n_events} new events, synced to block {last_block}")
+        now = reader.head()["timestamp"]
+        return indexer.streams_and_rewards_due(now)
+    finally:
+        indexer.db.close()
+
+
+def execute_refuel(
+    chain: str, rpc_url: str, private_key: str, dry_run: bool, index_db: str | None = None
+) -> tuple[bool, float | None]:
     """Execute refuel for a single chain. Returns (success, balance)."""
+    from batch_planner import build_due, plan, print_plan
+    from eth_account import Account
+    from fee_strategy import cached_history, fee_history_payload, store_history, suggest_fees
+    from nonce_manager import nonce_manager
+    from rpc_batch import read_chain_state, read_streams
+
     config = CHAINS[chain]
-    print(f"\n{'='*60}")
+    print(f"\n{'=' * 60}")
     print(f"Chain: {chain.upper()} (ID: {config['chain_id']})")
-    print(f"{'='*60}")
-
-    boa.set_network_env(rpc_url)
-    balance = None
+    print(f"{'=' * 60}")
 
-    if private_key:
-        account = Account.from_key(private_key)
-        boa.env.add_account(account)
-        boa.env.eoa = account.address
+    reader = get_streamer_reader(rpc_url)
+    account = Account.from_key(private_key) if private_key else None
+    if account:
         print(f"Executor: {account.address}")
-        balance = boa.env.get_balance(account.address) / 1e18
+
+    # One batched round-trip for balance, nonce, fee history, stream_count and the due view.
+    history = cached_history(config["chain_id"])
+    percentile = config.get("priority_percentile", 50)
+    state = read_chain_state(
+        reader,
+        account.address if account else None,
+        include_due=not index_db,
+        fee_history=None if history else fee_history_payload(percentile),
+    )
+    if history is None:
+        history = store_history(config["chain_id"], state.fee_history)
+    fees = suggest_fees(history, config)
+    balance = None
+    if state.balance is not None:
+        balance = state.balance / 1e18
         print(f"Balance: {balance:.6f} native")
-        time.sleep(1)
-    else:
-        boa.env.eoa = "0x0000000000000000000000000000000000000000"
+    print(f"Block: {state.block_number}, streams: {state.stream_count}")
+    print(
+        f"Fees: base {fees.base_fee / 1e9:.4f} gwei, priority {fees.priority_fee / 1e9:.4f} gwei, "
+        f"max {fees.max_fee / 1e9:.4f} gwei"
+    )
 
-    streamer = get_streamer_contract()
-    time.sleep(1)
-    due_ids, rewards = streamer.streams_and_rewards_due()
-    time.sleep(1)
+    if index_db:
+        due_ids, rewards = read_due_from_index(chain, reader, index_db)
+    else:
+        due_ids, rewards = state.due_ids, state.rewards
 
     if not due_ids:
         print("No streams due for execution.")
@@ -83,36 +277,211 @@ def execute_refuel(chain: str, rpc_url: str, private_key: str, dry_run: bool) ->
     print(f"Stream IDs: {list(due_ids)}")
     print(f"Total reward: {total_reward / 1e18:.6f} native")
 
+    streams = read_streams(reader, list(due_ids))
+    due = build_due(list(due_ids), list(rewards), streams, state.timestamp)
+    result = plan(
+        due,
+        gas_price=fees.expected_gas_price,
+        max_per_chunk=N_MAX_EXECUTE,
+        profit_check=config["profit_check"],
+    )
+    print_plan(result)
+
+    if fees.over_ceiling:
+        print(
+            f"Base fee {fees.base_fee / 1e9:.4f} gwei is above the "
+            f"{fees.ceiling / 1e9:.4f} gwei ceiling; deferring execution."
+        )
+        return True, balance
+
     if dry_run:
-        print("[DRY RUN] Would execute streams, skipping actual transaction.")
+        print("[DRY RUN] Would execute the plan above, skipping actual transaction.")
         return True, balance
 
     if not private_key:
         print("ERROR: Private key required for execution (non-dry-run mode).")
         return False, balance
 
-    print("Executing streams...")
+    if not result.chunks:
+        print("No profitable streams to execute at current fees.")
+        return True, balance
+
+    chunks = [chunk.ids for chunk in result.chunks]
+    print(f"Executing {len(chunks)} chunk(s) of up to {N_MAX_EXECUTE} streams...")
+
+    nonces = nonce_manager(reader.rpc, state.chain_id, account.address)
+    dropped = nonces.sync(state.nonce)
+    if dropped:
+        print(f"Transactions with nonces {dropped} were dropped; their nonces will be reused.")
+
+    tx_hashes = submit_chunks(reader, chunks, account, nonces, state.chain_id, fees)
+    outcomes = wait_for_chunks(chain, reader.rpc, chunks, tx_hashes)
+    dropped = nonces.check()
+    if dropped:
+        print(f"Dropped from the mempool (nonce gap, refilled next run): {dropped}")
+    landed = [c for c in outcomes if c is not None]
+    executed = sum(len(c.executed_ids) for c in landed)
+    failed = sorted(sid for c in landed for sid in c.failed_ids)
+    n_planned = sum(len(c) for c in chunks)
+    print(
+        f"Executed {executed}/{n_planned} planned streams "
+        f"({len(landed)}/{len(chunks)} chunks landed)"
+    )
 
     try:
-        result = streamer.execute_many(list(due_ids))
-        print(result)
-    except Exception as e:
-        # Boa sometimes fails to decode return value even when tx succeeds
-        # If tx was mined (boa prints this), treat as success
-        if "NoneType" in str(e):
-            print("Transaction mined (return value decode issue, ignoring)")
-        else:
-            print(f"ERROR: Transaction failed: {e}")
-            return False, balance
-
-    # Wait for RPC to settle, then update balance
-    time.sleep(15)
-    try:
-        balance = boa.env.get_balance(account.address) / 1e18
+        balance = int(reader.rpc.fetch("eth_getBalance", [account.address, "latest"]), 16) / 1e18
     except Exception:
         pass  # Keep the old balance
 
-    return True, balance
+    if failed:
+        print(f"ERROR: Pool donations reverted for streams {failed}")
+    if len(landed) < len(chunks):
+        print("ERROR: Some chunks failed")
+    return not failed and len(landed) == len(chunks), balance
+
+
+def run_chain(
+    chain: str, rpc_url: str | None, private_key: str, dry_run: bool, index_db: str | None = None
+) -> tuple[bool | None, float | None]:
+    """Run a single chain, converting errors into a failed result. Returns (success, balance)."""
+    if not rpc_url:
+        print(f"\nWARNING: Skipping {chain} - no RPC URL configured")
+        return None, None
+
+    try:
+        return execute_refuel(chain, rpc_url, private_key, dry_run, index_db)
+    except Exception as e:
+        print(f"\nERROR on {chain}: {e}")
+        return False, None
+
+
+def run_chains_sequential(
+    chains: list[str],
+    rpc_urls: dict[str, str],
+    private_key: str,
+    dry_run: bool,
+    index_db: str | None = None,
+) -> tuple[dict[str, bool | None], dict[str, float | None]]:
+    """Run chains one after another in this process."""
+    results = {}
+    balances = {}
+    for i, chain in enumerate(chains):
+        if i > 0:
+            time.sleep(1)
+        rpc_url = rpc_urls.get(chain)
+        results[chain], balances[chain] = run_chain(chain, rpc_url, private_key, dry_run, index_db)
+    return results, balances
+
+
+def _run_chain_isolated(
+    chain: str, rpc_url: str | None, private_key: str, dry_run: bool, index_db: str | None
+) -> tuple[bool | None, float | None, str]:
+    """
+    Worker entry point for parallel mode.
+    Each worker is its own process, so chains share no RPC sessions or module state.
+    Output is captured and returned so chain logs are not interleaved.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success, balance = run_chain(chain, rpc_url, private_key, dry_run, index_db)
+    return success, balance, output.getvalue()
+
+
+def run_chains_parallel(
+    chains: list[str],
+    rpc_urls: dict[str, str],
+    private_key: str,
+    dry_run: bool,
+    index_db: str | None = None,
+) -> tuple[dict[str, bool | None], dict[str, float | None]]:
+    """Run every chain in its own worker process; logs are printed as each chain finishes."""
+    # Pre-populate so the summary keeps the requested chain order.
+    results: dict[str, bool | None] = {chain: None for chain in chains}
+    balances: dict[str, float | None] = {}
+
+    with ProcessPoolExecutor(max_workers=len(chains)) as pool:
+        futures = {
+            pool.submit(
+                _run_chain_isolated, chain, rpc_urls.get(chain), private_key, dry_run, index_db
+            ): chain
+            for chain in chains
+        }
+        for future in as_completed(futures):
+            chain = futures[future]
+            try:
+                success, balance, output = future.result()
+            except Exception as e:
+                # Worker crashed (e.g. killed); nothing was captured.
+                success, balance, output = False, None, f"\nERROR on {chain}: worker failed: {e}\n"
+            print(output, end="")
+            results[chain] = success
+            balances[chain] = balance
+
+    return results, balances
+
+
+def run_daemon(
+    chain: str,
+    rpc_url: str,
+    private_key: str,
+    dry_run: bool,
+    poll_interval: float,
+    index_db: str | None = None,
+) -> None:
+    """Run one chain forever, executing as soon as streams become due."""
+    from due_scheduler import ChainScheduler
+
+    def log(message: str) -> None:
+        print(f"[{chain}] {message}", flush=True)
+
+    def execute() -> None:
+        # Print each pass as one block so chains running side by side stay readable.
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_chain(chain, rpc_url, private_key, dry_run, index_db)
+        print(output.getvalue(), end="", flush=True)
+
+    reader = get_streamer_reader(rpc_url)
+    ChainScheduler(reader, execute, poll_interval=poll_interval, log=log).run_forever()
+
+
+def run_daemons(
+    chains: list[str],
+    rpc_urls: dict[str, str],
+    private_key: str,
+    dry_run: bool,
+    poll_interval: float,
+    index_db: str | None = None,
+) -> None:
+    """Run a scheduler per chain in its own worker process; returns only if one crashes."""
+    if len(chains) == 1:
+        chain = chains[0]
+        run_daemon(chain, rpc_urls[chain], private_key, dry_run, poll_interval, index_db)
+        return
+
+    # Plain processes rather than a pool: the other schedulers never return, so
+    # they have to be terminated for the supervisor to exit.
+    processes = {
+        chain: multiprocessing.Process(
+            target=run_daemon,
+            args=(chain, rpc_urls[chain], private_key, dry_run, poll_interval, index_db),
+            name=f"{chain}-scheduler",
+        )
+        for chain in chains
+    }
+    for process in processes.values():
+        process.start()
+    try:
+        wait([process.sentinel for process in processes.values()])
+    finally:
+        for chain, process in processes.items():
+            if process.exitcode is None:
+                process.terminate()
+            else:
+                print(f"\nERROR: {chain} scheduler stopped with exit code {process.exitcode}")
+        for process in processes.values():
+            process.join()
+    sys.exit(1)
 
 
 def main():
@@ -137,6 +506,26 @@ def main():
         "--private-key",
         help="Private key for signing (or set PRIVATE_KEY env)",
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Run each chain concurrently in its own worker process",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and execute streams as soon as they become due",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=60,
+        help="Daemon mode: max seconds between event re-syncs (default: 60)",
+    )
+    parser.add_argument(
+        "--index-db",
+        help="SQLite stream mirror; due streams are computed from synced logs instead of the view",
+    )
     args = parser.parse_args()
 
     private_key = args.private_key or os.environ.get("PRIVATE_KEY")
@@ -158,27 +547,29 @@ def main():
     print("=" * 60)
     print(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE'}")
     print(f"Chains: {', '.join(chains_to_run)}")
+    print(f"Execution: {'parallel' if args.parallel else 'sequential'}")
     print(f"DonationStreamer: {DONATION_STREAMER}")
 
-    results = {}
-    balances = {}
-    for i, chain in enumerate(chains_to_run):
-        if i > 0:
-            time.sleep(1)
-
-        rpc_url = rpc_urls.get(chain)
-        if not rpc_url:
-            print(f"\nWARNING: Skipping {chain} - no RPC URL configured")
-            results[chain] = None
-            continue
-
-        try:
-            success, balance = execute_refuel(chain, rpc_url, private_key, args.dry_run)
-            results[chain] = success
-            balances[chain] = balance
-        except Exception as e:
-            print(f"\nERROR on {chain}: {e}")
-            results[chain] = False
+    if args.daemon:
+        print(f"Daemon mode, polling every {args.poll_interval:.0f}s at most")
+        run_daemons(
+            chains_to_run,
+            rpc_urls,
+            private_key,
+            args.dry_run,
+            args.poll_interval,
+            args.index_db,
+        )
+        return
+
+    if args.parallel:
+        results, balances = run_chains_parallel(
+            chains_to_run, rpc_urls, private_key, args.dry_run, args.index_db
+        )
+    else:
+        results, balances = run_chains_sequential(
+            chains_to_run, rpc_urls, private_key, args.dry_run, args.index_db
+        )
 
     print("\n" + "=" * 60)
     print("SUMMARY")
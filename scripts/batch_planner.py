@@ -0,0 +1,197 @@
+"""
+Profitability-aware selection of due streams for execute_many.
+
+Marginal gas per stream depends on what else is in the transaction:
+execute_many sums donations per pool into a single `add_liquidity`, so the
+first donating stream into a pool pays for the call and its cold pool and
+token accounts, later ones into the same pool only for their share of the
+sum, and a stream whose period slice rounds to zero only pays for its own
+bookkeeping; rewards are paid in one transfer per transaction.
+The planner groups due streams by pool, keeps the most rewarding prefix
+of each pool group that pays for its gas at current fees, packs the
+groups into chunks of at most N_MAX_EXECUTE and defers the rest until
+more periods (and so more reward) accrue. Streams on their final period
+cannot accrue more and are always executed, so zero-reward streams finish.
+"""
+
+from dataclasses import dataclass, field
+
+
+# Gas model. Rough figures for DonationStreamer against a Curve pool; the
+# bot re-estimates every chunk with eth_estimateGas before sending it.
+GAS_TX_BASE = 21_000 + 20_000  # intrinsic cost, call overhead, calldata and the reward send
+GAS_PER_STREAM = 32_000  # stream storage and index update, StreamExecuted log
+GAS_POOL_FIRST = 180_000  # the pool's add_liquidity: cold pool, tokens, approvals
+GAS_POOL_REPEAT = 5_000  # adding to the pool's summed donation
+
+
+@dataclass
+class PlannedStream:
+    stream_id: int
+    pool: str
+    reward: int
+    donates: bool
+    final: bool = False  # every remaining period is due; deferring adds no reward
+
+
+@dataclass
+class Chunk:
+    streams: list[PlannedStream] = field(default_factory=list)
+
+    @property
+    def ids(self) -> list[int]:
+        return [s.stream_id for s in self.streams]
+
+    @property
+    def reward(self) -> int:
+        return sum(s.reward for s in self.streams)
+
+    @property
+    def gas(self) -> int:
+        return GAS_TX_BASE + sum(_group_gas(group) for group in _by_pool(self.streams).values())
+
+
+@dataclass
+class Plan:
+    gas_price: int
+    chunks: list[Chunk]
+    deferred: list[PlannedStream]
+
+    def net(self, chunk: Chunk) -> int:
+        return chunk.reward - chunk.gas * self.gas_price
+
+
+def due_periods(stream: dict, now: int) -> int:
+    """Mirror of `DonationStreamer._due_periods`."""
+    if (
+        int(stream["donor"], 16) == 0
+        or stream["periods_remaining"] == 0
+        or stream["period_length"] == 0
+        or now < stream["next_ts"]
+    ):
+        return 0
+    periods = (now - stream["next_ts"]) // stream["period_length"] + 1
+    return min(periods, stream["periods_remaining"])
+
+
+def donates(stream: dict, periods: int) -> bool:
+    """Whether executing now moves tokens into the pool (otherwise it only pays the reward)."""
+    is_final = periods == stream["periods_remaining"]
+    for per_period, remaining in zip(stream["amounts_per_period"], stream["amounts_remaining"]):
+        if remaining == 0:
+            continue
+        if is_final or per_period * periods > 0:
+            return True
+    return False
+
+
+def _by_pool(streams: list[PlannedStream]) -> dict[str, list[PlannedStream]]:
+    groups: dict[str, list[PlannedStream]] = {}
+    for s in streams:
+        groups.setdefault(s.pool, []).append(s)
+    return groups
+
+
+def _group_gas(group: list[PlannedStream]) -> int:
+    """Gas for streams into one pool within one transaction."""
+    n_donating = sum(1 for s in group if s.donates)
+    gas = GAS_PER_STREAM * len(group)
+    if n_donating:
+        gas += GAS_POOL_FIRST + GAS_POOL_REPEAT * (n_donating - 1)
+    return gas
+
+
+def _net(group: list[PlannedStream], gas_price: int) -> int:
+    return sum(s.reward for s in group) - _group_gas(group) * gas_price
+
+
+def _best_prefix(group: list[PlannedStream], gas_price: int) -> list[PlannedStream]:
+    """
+    Streams of a pool group on their final period, plus the most profitable
+    reward-sorted prefix of the others (possibly empty).
+    """
+    forced = [s for s in group if s.final]
+    ranked = sorted((s for s in group if not s.final), key=lambda s: s.reward, reverse=True)
+    best = forced
+    best_net = _net(forced, gas_price) if forced else 0
+    for k in range(1, len(ranked) + 1):
+        prefix = forced + ranked[:k]
+        net = _net(prefix, gas_price)
+        if net > best_net:
+            best, best_net = prefix, net
+    return best
+
+
+def plan(
+    due: list[PlannedStream], gas_price: int, max_per_chunk: int, profit_check: bool = True
+) -> Plan:
+    """Select and lay out streams to maximize net reward at gas_price."""
+    if not profit_check:
+        chunks = [Chunk(due[i : i + max_per_chunk]) for i in range(0, len(due), max_per_chunk)]
+        return Plan(gas_price, chunks, [])
+
+    selected: list[list[PlannedStream]] = []
+    deferred: list[PlannedStream] = []
+    for group in _by_pool(due).values():
+        keep = _best_prefix(group, gas_price)
+        kept_ids = {s.stream_id for s in keep}
+        deferred.extend(s for s in group if s.stream_id not in kept_ids)
+        if keep:
+            selected.append(keep)
+
+    # Keep each pool's streams in as few chunks as possible so they share one
+    # add_liquidity; place the most profitable groups first.
+    selected.sort(key=lambda g: _net(g, gas_price), reverse=True)
+    chunks: list[Chunk] = []
+    for group in selected:
+        for i in range(0, len(group), max_per_chunk):
+            part = group[i : i + max_per_chunk]
+            target = next((c for c in chunks if len(c.streams) + len(part) <= max_per_chunk), None)
+            if target is None:
+                target = Chunk()
+                chunks.append(target)
+            target.streams.extend(part)
+
+    # A chunk still has to pay its own transaction overhead, unless it finishes streams.
+    result = Plan(gas_price, [], deferred)
+    for chunk in chunks:
+        if result.net(chunk) > 0 or any(s.final for s in chunk.streams):
+            result.chunks.append(chunk)
+        else:
+            result.deferred.extend(chunk.streams)
+    return result
+
+
+def build_due(
+    due_ids: list[int], rewards: list[int], streams: dict[int, dict], now: int
+) -> list[PlannedStream]:
+    """Combine the due view with stream structs into planner input."""
+    due = []
+    for stream_id, reward in zip(due_ids, rewards):
+        stream = streams[stream_id]
+        periods = due_periods(stream, now)
+        due.append(
+            PlannedStream(
+                stream_id=stream_id,
+                pool=stream["pool"],
+                reward=reward,
+                donates=periods > 0 and donates(stream, periods),
+                final=periods > 0 and periods == stream["periods_remaining"],
+            )
+        )
+    return due
+
+
+def print_plan(result: Plan) -> None:
+    price_gwei = result.gas_price / 1e9
+    print(f"Plan at {price_gwei:.4f} gwei:")
+    for i, chunk in enumerate(result.chunks):
+        cost = chunk.gas * result.gas_price
+        print(
+            f"  Chunk {i + 1}/{len(result.chunks)}: {len(chunk.streams)} streams, "
+            f"{len(_by_pool(chunk.streams))} pools, reward {chunk.reward / 1e18:.6f}, "
+            f"est. gas {chunk.gas} (~{cost / 1e18:.6f}), net {result.net(chunk) / 1e18:.6f}"
+        )
+    if result.deferred:
+        deferred_ids = sorted(s.stream_id for s in result.deferred)
+        print(f"  Deferred (reward below gas cost): {deferred_ids}")
@@ -0,0 +1,115 @@
+"""
+Build compact ABI/bytecode artifacts for the contracts.
+
+Artifacts are keyed by the sha256 of the contract source and the installed
+vyper version, so scripts can load an ABI or deploy code without invoking
+the compiler. A stale artifact is ignored by `load_artifact`; the ABI only
+depends on the source, so ABI-only callers accept any compiler version.
+
+Usage:
+    uv run scripts/build_artifacts.py           # (re)build all artifacts
+    uv run scripts/build_artifacts.py --check   # exit 1 if any artifact is stale
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from importlib.metadata import version
+from pathlib import Path
+
+
+CONTRACTS = [
+    "contracts/DonationStreamer.vy",
+    "contracts/StreamExecutor.vy",
+]
+
+ARTIFACTS_DIR = Path("contracts/artifacts")
+
+
+def source_hash(contract_path: str) -> str:
+    """Return the sha256 hex digest of a contract source file."""
+    return hashlib.sha256(Path(contract_path).read_bytes()).hexdigest()
+
+
+def compiler_version() -> str:
+    """Return the installed vyper version without importing the compiler."""
+    return version("vyper")
+
+
+def artifact_path(contract_path: str) -> Path:
+    """Return the artifact file for a contract source path."""
+    return ARTIFACTS_DIR / f"{Path(contract_path).stem}.json"
+
+
+def build_artifact(contract_path: str) -> dict:
+    """Compile a contract and write its artifact. Returns the artifact."""
+    # Deferred: importing the compiler is the slow part we are trying to avoid.
+    from vyper.compiler import compile_code
+
+    source = Path(contract_path).read_text()
+    output = compile_code(
+        source,
+        contract_path=contract_path,
+        output_formats=["abi", "bytecode", "bytecode_runtime"],
+    )
+    artifact = {
+        "contract_name": Path(contract_path).stem,
+        "source_path": contract_path,
+        "source_sha256": source_hash(contract_path),
+        "compiler_version": compiler_version(),
+        "abi": output["abi"],
+        "bytecode": output["bytecode"],
+        "bytecode_runtime": output["bytecode_runtime"],
+    }
+
+    path = artifact_path(contract_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(artifact, separators=(",", ":")) + "\n")
+    return artifact
+
+
+def load_artifact(contract_path: str, abi_only: bool = False) -> dict | None:
+    """
+    Return the artifact for a contract, or None if it is missing or stale
+    (source changed or, unless abi_only, a different vyper version is installed).
+    """
+    path = artifact_path(contract_path)
+    if not path.exists():
+        return None
+
+    artifact = json.loads(path.read_text())
+    if artifact.get("source_sha256") != source_hash(contract_path):
+        return None
+    if not abi_only and artifact.get("compiler_version") != compiler_version():
+        return None
+    return artifact
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build contract ABI/bytecode artifacts")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that artifacts are up to date (exit 1 if stale)",
+    )
+    args = parser.parse_args()
+
+    stale = []
+    for contract_path in CONTRACTS:
+        if load_artifact(contract_path) is not None:
+            print(f"{contract_path}: up to date")
+            continue
+        if args.check:
+            print(f"{contract_path}: STALE")
+            stale.append(contract_path)
+            continue
+        build_artifact(contract_path)
+        print(f"{contract_path}: built {artifact_path(contract_path)}")
+
+    if stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
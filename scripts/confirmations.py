@@ -0,0 +1,161 @@
+"""
+Transaction confirmation watcher.
+
+Polls for receipts with a backoff tuned to the chain's block time, waits for
+the configured confirmation depth and decodes `StreamExecuted` and
+`StreamFailed` logs so the caller sees what a transaction actually executed.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from eth_abi import decode
+from eth_utils import keccak, to_checksum_address
+
+
+STREAM_EXECUTED_TOPIC = (
+    "0x" + keccak(text="StreamExecuted(uint256,address,address,uint256,uint256[2],uint256)").hex()
+)
+
+STREAM_FAILED_TOPIC = "0x" + keccak(text="StreamFailed(uint256,address,address)").hex()
+
+DEFAULT_TIMEOUT = 240.0
+
+
+@dataclass
+class StreamExecution:
+    stream_id: int
+    caller: str
+    pool: str
+    periods: int
+    amounts: tuple[int, int]
+    reward_paid: int
+
+
+@dataclass
+class Confirmation:
+    tx_hash: str
+    success: bool
+    block_number: int
+    gas_used: int
+    executions: list[StreamExecution] = field(default_factory=list)
+    # Streams whose pool donation reverted in an isolated execute_many.
+    failed_ids: set[int] = field(default_factory=set)
+
+    @property
+    def reward_paid(self) -> int:
+        return sum(e.reward_paid for e in self.executions)
+
+    @property
+    def executed_ids(self) -> set[int]:
+        return {e.stream_id for e in self.executions}
+
+
+def poll_delays(block_time: float):
+    """
+    Yield sleep intervals for receipt polling.
+    Nothing can land before the next block, so the first wait is a full block;
+    after that, poll at a quarter block and back off towards one block.
+    """
+    yield block_time
+    delay = block_time / 4
+    while True:
+        yield delay
+        delay = min(delay * 1.5, block_time)
+
+
+def wait_for_receipt(
+    rpc, tx_hash: str, block_time: float, timeout: float = DEFAULT_TIMEOUT
+) -> dict:
+    """Poll until the transaction has a receipt. Raises TimeoutError."""
+    deadline = time.monotonic() + timeout
+    for delay in poll_delays(block_time):
+        receipt = rpc.fetch_uncached("eth_getTransactionReceipt", [tx_hash])
+        if receipt is not None:
+            return receipt
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(f"No receipt for {tx_hash} after {timeout:.0f}s")
+        time.sleep(delay)
+
+
+def wait_for_depth(
+    rpc, block_number: int, confirmations: int, block_time: float, timeout: float = DEFAULT_TIMEOUT
+) -> None:
+    """Wait until block_number has the given number of confirmations (1 = included)."""
+    target = block_number + confirmations - 1
+    deadline = time.monotonic() + timeout
+    while True:
+        head = int(rpc.fetch_uncached("eth_blockNumber", []), 16)
+        if head >= target:
+            return
+        # Sleep for roughly the blocks still missing, but re-check at least once per block.
+        delay = min((target - head) * block_time, block_time)
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(
+                f"Block {block_number} not at depth {confirmations} after {timeout:.0f}s"
+            )
+        time.sleep(delay)
+
+
+def decode_stream_executed(receipt: dict, streamer: str) -> list[StreamExecution]:
+    """Decode the StreamExecuted logs emitted by streamer in a receipt."""
+    executions = []
+    for log in receipt.get("logs", []):
+        if log["address"].lower() != streamer.lower():
+            continue
+        if not log["topics"] or log["topics"][0].lower() != STREAM_EXECUTED_TOPIC:
+            continue
+        stream_id, periods, amounts, reward_paid = decode(
+            ["uint256", "uint256", "uint256[2]", "uint256"],
+            bytes.fromhex(log["data"].removeprefix("0x")),
+        )
+        executions.append(
+            StreamExecution(
+                stream_id=stream_id,
+                caller=to_checksum_address("0x" + log["topics"][1][-40:]),
+                pool=to_checksum_address("0x" + log["topics"][2][-40:]),
+                periods=periods,
+                amounts=tuple(amounts),
+                reward_paid=reward_paid,
+            )
+        )
+    return executions
+
+
+def decode_stream_failed(receipt: dict, streamer: str) -> set[int]:
+    """Return the stream ids of the StreamFailed logs emitted by streamer in a receipt."""
+    return {
+        int(log["data"][2:66], 16)
+        for log in receipt.get("logs", [])
+        if log["address"].lower() == streamer.lower()
+        and log["topics"]
+        and log["topics"][0].lower() == STREAM_FAILED_TOPIC
+    }
+
+
+def confirm(
+    rpc,
+    tx_hash: str,
+    streamer: str,
+    block_time: float,
+    confirmations: int = 1,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Confirmation:
+    """Wait for a transaction to reach the confirmation depth and decode its stream results."""
+    receipt = wait_for_receipt(rpc, tx_hash, block_time, timeout)
+    block_number = int(receipt["blockNumber"], 16)
+    if confirmations > 1:
+        wait_for_depth(rpc, block_number, confirmations, block_time, timeout)
+        # Re-read in case a reorg moved the transaction to another block meanwhile.
+        receipt = wait_for_receipt(rpc, tx_hash, block_time, timeout)
+        block_number = int(receipt["blockNumber"], 16)
+
+    success = receipt.get("status") == "0x1"
+    return Confirmation(
+        tx_hash=tx_hash,
+        success=success,
+        block_number=block_number,
+        gas_used=int(receipt["gasUsed"], 16),
+        executions=decode_stream_executed(receipt, streamer) if success else [],
+        failed_ids=decode_stream_failed(receipt, streamer) if success else set(),
+    )
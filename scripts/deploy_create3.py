@@ -1,24 +1,26 @@
+import argparse
 import os
 
+from eth_abi import encode
 from eth_account import Account
 from eth_utils import keccak, to_bytes, to_checksum_address
 
-import boa
-from boa.explorer import Etherscan
-
-from secure_key_utils import decrypt_private_key, getpass
+from build_artifacts import load_artifact
 
 
 CREATE_X_ADDRESS = "0xba5Ed099633D3B313e4D5F7bdc1305d3c28ba5Ed"
 RPC_URL = "https://eth.drpc.org"
 
-CONTRACT_NAME = "DonationStreamer"
-CONTRACT_PATH = "contracts/DonationStreamer.vy"
-SALT_SEED_TEXT = "DonationStreamer:v0.1.0"
+# Bump the salt version with every release: a CREATE3 address that already has
+# code is skipped, so an unchanged salt never deploys new code.
+STREAMER_NAME = "DonationStreamer"
+STREAMER_PATH = "contracts/DonationStreamer.vy"
+STREAMER_SALT_SEED_TEXT = "DonationStreamer:v0.2.0"
+
+EXECUTOR_NAME = "StreamExecutor"
+EXECUTOR_PATH = "contracts/StreamExecutor.vy"
+EXECUTOR_SALT_SEED_TEXT = "StreamExecutor:v0.2.0"
 
-CONTRACT_NAME = "StreamExecutor"
-CONTRACT_PATH = "contracts/StreamExecutor.vy"
-SALT_SEED_TEXT = "StreamExecutor:v0.1.0"
 
 def _guarded_salt(deployer: str, chain_id: int, salt: bytes) -> bytes:
     sender = bytes.fromhex(deployer[2:])
@@ -40,7 +42,76 @@ def _guarded_salt(deployer: str, chain_id: int, salt: bytes) -> bytes:
     return keccak(salt)
 
 
+def _deploycode(name: str, path: str) -> bytes:
+    artifact = load_artifact(path)
+    if artifact is None:
+        import boa
+
+        print(f"{name} artifact missing or stale, compiling from source")
+        return boa.load_partial(path).compiler_data.bytecode
+    return bytes.fromhex(artifact["bytecode"].removeprefix("0x"))
+
+
+def deploy(
+    createx,
+    deployer: str,
+    chain_id: int,
+    verifier,
+    name: str,
+    path: str,
+    salt_seed_text: str,
+    ctor_calldata: bytes = b"",
+) -> str:
+    """
+    Deploy a contract through CreateX CREATE3 unless it is already there. Returns its address.
+    Verification (which compiles the contract) only runs when a verifier is given.
+    """
+    import boa
+
+    seed_hash = keccak(text=salt_seed_text)
+    deployer_bytes = bytes.fromhex(deployer[2:])
+    salt = deployer_bytes + b"\x00" + seed_hash[:11]
+    guarded = _guarded_salt(deployer, chain_id, salt)
+    address = createx.computeCreate3Address(guarded, CREATE_X_ADDRESS)
+
+    checksum = to_checksum_address(address)
+    print(f"{name} salt: 0x{salt.hex()}")
+    print(f"{name} target: {checksum}")
+    if boa.env.get_code(address):
+        print(f"{name} already at {checksum}")
+    else:
+        deploycode = _deploycode(name, path) + ctor_calldata
+        deployed = createx.deployCreate3(salt, deploycode, sender=deployer)
+
+        if deployed != address:
+            raise RuntimeError(f"Address mismatch: {deployed} != {checksum}")
+        if not boa.env.get_code(address):
+            raise RuntimeError("No code at target")
+
+    if verifier is not None:
+        contract = boa.load_partial(path).at(address)
+        contract.ctor_calldata = ctor_calldata
+        boa.verify(contract, verifier=verifier)
+
+    print(f"Deployed {name} at {checksum}")
+    return checksum
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Deploy the streamer contracts via CreateX CREATE3"
+    )
+    parser.add_argument(
+        "--verify", action="store_true", help="Verify the contracts on Etherscan (compiles them)"
+    )
+    args = parser.parse_args()
+
+    # Deferred until the arguments are parsed: importing boa takes seconds.
+    import boa
+    from boa.explorer import Etherscan
+
+    from secure_key_utils import decrypt_private_key, getpass
+
     api_key = os.environ.get("ETHERSCAN_API_KEY")
     if not api_key:
         raise ValueError("ETHERSCAN_API_KEY is required")
@@ -52,14 +123,14 @@ def main() -> None:
     private_key = decrypt_private_key(encrypted_key, getpass())
     deployer = Account.from_key(private_key)
     print(f"Deployer: {deployer.address}")
-    deploycode = boa.load_partial(CONTRACT_PATH).compiler_data.bytecode
 
     boa.set_network_env(RPC_URL)
     boa.env.add_account(deployer)
     boa.env.eoa = deployer.address
     chain_id = boa.env.evm.patch.chain_id
     print(
-        f"Chain ID: {chain_id}, Deployer: {deployer.address}, Balance: {boa.env.get_balance(deployer.address) / 1e18}"
+        f"Chain ID: {chain_id}, Deployer: {deployer.address}, "
+        f"Balance: {boa.env.get_balance(deployer.address) / 1e18}"
     )
 
     etherscan_url = "https://api.etherscan.io/v2/api"
@@ -72,32 +143,27 @@ def main() -> None:
     )
     if not boa.env.get_code(CREATE_X_ADDRESS):
         raise ValueError("CreateX not deployed")
-
-    seed_hash = keccak(text=SALT_SEED_TEXT)
-    deployer_bytes = bytes.fromhex(deployer.address[2:])
-    salt = deployer_bytes + b"\x00" + seed_hash[:11]
-    guarded = _guarded_salt(deployer.address, chain_id, salt)
-    address = createx.computeCreate3Address(guarded, CREATE_X_ADDRESS)
-
-    checksum = to_checksum_address(address)
-    print(f"Salt: 0x{salt.hex()}")
-    print(f"Target: {checksum}")
-    if boa.env.get_code(address):
-        print(f"{CONTRACT_NAME} already at {checksum}")
-    else:
-        deployed = createx.deployCreate3(salt, deploycode, sender=deployer.address)
-
-        if deployed != address:
-            raise RuntimeError(f"Address mismatch: {deployed} != {checksum}")
-        if not boa.env.get_code(address):
-            raise RuntimeError("No code at target")
-
-    contract = boa.load_partial(CONTRACT_PATH).at(address)
-    contract.ctor_calldata = b""
-    verifier = Etherscan(etherscan_url+f"?chainid={chain_id}", api_key)
-    boa.verify(contract, verifier=verifier)
-
-    print(f"Deployed {CONTRACT_NAME} at {checksum}")
+    verifier = Etherscan(etherscan_url + f"?chainid={chain_id}", api_key) if args.verify else None
+
+    streamer = deploy(
+        createx,
+        deployer.address,
+        chain_id,
+        verifier,
+        STREAMER_NAME,
+        STREAMER_PATH,
+        STREAMER_SALT_SEED_TEXT,
+    )
+    deploy(
+        createx,
+        deployer.address,
+        chain_id,
+        verifier,
+        EXECUTOR_NAME,
+        EXECUTOR_PATH,
+        EXECUTOR_SALT_SEED_TEXT,
+        ctor_calldata=encode(["address"], [streamer]),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+"""
+Long-running scheduler that wakes when streams become due.
+
+Keeps a per-chain priority queue of upcoming `next_ts` values, sleeps until
+the earliest one and re-syncs from streamer events between wake-ups.
+"""
+
+import heapq
+import time
+from typing import Callable
+
+from rpc_batch import read_live_streams, read_streams
+from streamer_rpc import StreamerRPC, log_stream_id
+
+
+# Upper bound on a single sleep, so new streams and cancellations are picked up.
+DEFAULT_POLL_INTERVAL = 60
+
+# Full state re-scan interval, as a safety net on top of event-driven updates.
+FULL_RESYNC_INTERVAL = 3600
+
+
+class DueQueue:
+    """Min-heap of (due_ts, stream_id) with lazy removal of outdated entries."""
+
+    def __init__(self):
+        self._heap: list[tuple[int, int]] = []
+        self._due_at: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._due_at)
+
+    def update(self, stream_id: int, due_ts: int) -> None:
+        if self._due_at.get(stream_id) == due_ts:
+            return
+        self._due_at[stream_id] = due_ts
+        heapq.heappush(self._heap, (due_ts, stream_id))
+
+    def remove(self, stream_id: int) -> None:
+        self._due_at.pop(stream_id, None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._due_at.clear()
+
+    def next_due(self) -> int | None:
+        """Earliest due timestamp, or None when no live stream is queued."""
+        while self._heap:
+            due_ts, stream_id = self._heap[0]
+            if self._due_at.get(stream_id) == due_ts:
+                return due_ts
+            heapq.heappop(self._heap)
+        return None
+
+    def due_ids(self, now: int) -> list[int]:
+        """Ids whose due timestamp is at or before now."""
+        return sorted(sid for sid, ts in self._due_at.items() if ts <= now)
+
+
+def is_live(stream: dict) -> bool:
+    """Mirror of the contract's liveness checks in `_due_periods`."""
+    return (
+        int(stream["donor"], 16) != 0
+        and stream["periods_remaining"] > 0
+        and stream["period_length"] > 0
+    )
+
+
+class ChainScheduler:
+    """
+    Schedule executions for one chain.
+    `execute` is called when something is due and should run one refuel pass.
+    """
+
+    def __init__(
+        self,
+        reader: StreamerRPC,
+        execute: Callable[[], None],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        log: Callable[[str], None] = print,
+    ):
+        self.reader = reader
+        self.execute = execute
+        self.poll_interval = poll_interval
+        self.log = log
+        self.queue = DueQueue()
+        self.last_block = 0
+        # chain timestamp minus local clock, refreshed on every sync
+        self.clock_offset = 0.0
+        self._last_full_sync: float | None = None
+
+    def chain_now(self) -> float:
+        return time.time() + self.clock_offset
+
+    def full_sync(self) -> None:
+        """Rebuild the queue from every stream."""
+        head = self.reader.head()
+        count = self.reader.call("stream_count", block=head["number"])
+        self.queue.clear()
+        for stream_id, stream in read_live_streams(self.reader, count, head["number"]).items():
+            if is_live(stream):
+                self.queue.update(stream_id, stream["next_ts"])
+        self.last_block = head["number"]
+        self.clock_offset = head["timestamp"] - time.time()
+        self._last_full_sync = time.monotonic()
+        self.log(f"Synced {len(self.queue)} live streams of {count} at block {self.last_block}")
+
+    def sync_events(self) -> None:
+        """Refresh only the streams touched by events since the last synced block."""
+        head = self.reader.head()
+        self.clock_offset = head["timestamp"] - time.time()
+        if head["number"] <= self.last_block:
+            return
+        logs = self.reader.get_logs(self.last_block + 1, head["number"])
+        touched = {log_stream_id(log) for log in logs}
+        for stream_id, stream in read_streams(self.reader, sorted(touched), head["number"]).items():
+            if is_live(stream):
+                self.queue.update(stream_id, stream["next_ts"])
+            else:
+                self.queue.remove(stream_id)
+        if touched:
+            self.log(f"Re-synced {len(touched)} streams from {len(logs)} events")
+        self.last_block = head["number"]
+
+    def step(self) -> float:
+        """Run one scheduling step. Returns how long to sleep before the next one."""
+        if (
+            self._last_full_sync is None
+            or time.monotonic() - self._last_full_sync > FULL_RESYNC_INTERVAL
+        ):
+            self.full_sync()
+        else:
+            self.sync_events()
+
+        now = self.chain_now()
+        due = self.queue.due_ids(int(now))
+        if due:
+            self.log(f"{len(due)} streams due, executing")
+            self.execute()
+            self.sync_events()
+            if self.queue.due_ids(int(self.chain_now())):
+                # Still due after a pass (dry run or failed txs): retry on the next poll.
+                return self.poll_interval
+
+        next_due = self.queue.next_due()
+        if next_due is None:
+            return self.poll_interval
+        return max(0.0, min(next_due - self.chain_now(), self.poll_interval))
+
+    def run_forever(self) -> None:
+        while True:
+            try:
+                delay = self.step()
+            except Exception as e:
+                self.log(f"ERROR: {e}")
+                delay = self.poll_interval
+            next_due = self.queue.next_due()
+            if next_due is not None:
+                self.log(f"Next due at {next_due}; sleeping {delay:.0f}s")
+            time.sleep(delay)
@@ -0,0 +1,102 @@
+"""
+EIP-1559 fee strategy.
+
+Fees come from one `eth_feeHistory` sample per run: the priority fee is the
+median, over recent non-empty blocks, of a chain-specific reward percentile,
+and the max fee covers the next block's base fee times a multiplier. A
+per-chain base fee ceiling defers execution instead of overpaying; it also
+caps the max fee so a transaction never pays a base fee above it.
+
+Samples are cached per chain for FEE_CACHE_TTL seconds, so repeated passes
+in daemon mode reuse them.
+"""
+
+import statistics
+import time
+from dataclasses import dataclass
+
+
+FEE_HISTORY_BLOCKS = 10
+FEE_CACHE_TTL = 30.0
+DEFAULT_PRIORITY_PERCENTILE = 50
+DEFAULT_BASE_FEE_MULTIPLIER = 2.0
+
+_HISTORY_CACHE: dict[int, tuple[float, "FeeHistory"]] = {}
+
+
+@dataclass
+class FeeHistory:
+    # base fees of the sampled blocks, plus the next block's as the last entry
+    base_fees: list[int]
+    gas_used_ratios: list[float]
+    # per block, one reward per requested percentile
+    rewards: list[list[int]]
+
+
+@dataclass
+class Fees:
+    base_fee: int
+    priority_fee: int
+    max_fee: int
+    ceiling: int | None
+
+    @property
+    def over_ceiling(self) -> bool:
+        return self.ceiling is not None and self.base_fee > self.ceiling
+
+    @property
+    def expected_gas_price(self) -> int:
+        return self.base_fee + self.priority_fee
+
+
+def fee_history_payload(percentile: float) -> tuple[str, list]:
+    """Return the (method, params) eth_feeHistory request for a batch."""
+    return "eth_feeHistory", [hex(FEE_HISTORY_BLOCKS), "latest", [percentile]]
+
+
+def parse_fee_history(raw: dict) -> FeeHistory:
+    return FeeHistory(
+        base_fees=[int(x, 16) for x in raw["baseFeePerGas"]],
+        gas_used_ratios=list(raw["gasUsedRatio"]),
+        rewards=[[int(x, 16) for x in block] for block in raw.get("reward", [])],
+    )
+
+
+def cached_history(chain_id: int) -> FeeHistory | None:
+    """Return the cached sample for a chain if it is still fresh."""
+    entry = _HISTORY_CACHE.get(chain_id)
+    if entry is None or time.monotonic() - entry[0] > FEE_CACHE_TTL:
+        return None
+    return entry[1]
+
+
+def store_history(chain_id: int, raw: dict) -> FeeHistory:
+    history = parse_fee_history(raw)
+    _HISTORY_CACHE[chain_id] = (time.monotonic(), history)
+    return history
+
+
+def suggest_fees(history: FeeHistory, config: dict) -> Fees:
+    """
+    Compute fees for a chain config. Optional keys: `priority_percentile`,
+    `base_fee_multiplier` and `max_base_fee_gwei` (the ceiling).
+    """
+    base_fee = history.base_fees[-1]
+
+    # Empty blocks report zero rewards; they say nothing about the going tip.
+    tips = [
+        block[0]
+        for block, ratio in zip(history.rewards, history.gas_used_ratios)
+        if block and ratio > 0
+    ]
+    priority_fee = max(int(statistics.median(tips)), 1) if tips else 1
+
+    multiplier = config.get("base_fee_multiplier", DEFAULT_BASE_FEE_MULTIPLIER)
+    max_fee = int(base_fee * multiplier) + priority_fee
+
+    ceiling = None
+    if config.get("max_base_fee_gwei") is not None:
+        ceiling = int(config["max_base_fee_gwei"] * 10**9)
+        max_fee = min(max_fee, ceiling + priority_fee)
+
+    return Fees(base_fee=base_fee, priority_fee=priority_fee, max_fee=max_fee, ceiling=ceiling)
@@ -0,0 +1,157 @@
+"""
+Gas report for DonationStreamer on the local EVM, against the test mocks.
+
+Every measured call starts with cold storage (as in a fresh transaction), so
+the figures reflect SLOAD/SSTORE layout costs. Pass a git ref to compare the
+current source against an earlier version of the contract.
+
+Usage:
+    uv run scripts/gas_report.py                       # current source
+    uv run scripts/gas_report.py --baseline HEAD~1     # current vs HEAD~1
+    uv run scripts/gas_report.py --streams 1024
+"""
+
+import argparse
+import subprocess
+
+import boa
+
+
+CONTRACT = "contracts/DonationStreamer.vy"
+MOCK_ERC20 = "tests/mocks/MockERC20.vy"
+MOCK_POOL = "tests/mocks/MockPool.vy"
+
+PERIOD_LENGTH = 3600
+N_PERIODS = 3
+AMOUNT = 10**6
+
+
+def measure(source: str, n_streams: int) -> dict[str, int]:
+    """Deploy `source` with mocks, create n_streams streams and measure the main entry points."""
+    donor = boa.env.generate_address()
+    caller = boa.env.generate_address()
+    boa.env.set_balance(donor, 10**24)
+    token0 = boa.load(MOCK_ERC20, "Token0", "TK0", 18)
+    token1 = boa.load(MOCK_ERC20, "Token1", "TK1", 18)
+    pool = boa.load(MOCK_POOL, [token0.address, token1.address])
+    streamer = boa.loads(source, name="DonationStreamer")
+
+    total = AMOUNT * (n_streams + 1)
+    for token in (token0, token1):
+        token.mint(donor, total)
+        with boa.env.prank(donor):
+            token.approve(streamer.address, total)
+
+    def create():
+        with boa.env.prank(donor):
+            streamer.create_stream(
+                pool.address,
+                [token0.address, token1.address],
+                [AMOUNT, AMOUNT],
+                PERIOD_LENGTH,
+                N_PERIODS,
+                1,
+                value=N_PERIODS,
+            )
+        return streamer._computation.get_gas_used()
+
+    report = {}
+    for _ in range(n_streams):
+        boa.env.reset_gas_used()
+        report["create_stream"] = create()
+
+    # create_streams in chunks of 32 on a separate instance, averaged per stream.
+    if hasattr(streamer, "create_streams"):
+        batch = boa.loads(source, name="DonationStreamer")
+        spec = (
+            pool.address,
+            [token0.address, token1.address],
+            [AMOUNT, AMOUNT],
+            PERIOD_LENGTH,
+            N_PERIODS,
+            1,
+        )
+        for token in (token0, token1):
+            token.mint(donor, total)
+            with boa.env.prank(donor):
+                token.approve(batch.address, total)
+        used = 0
+        for i in range(0, n_streams, 32):
+            n = min(32, n_streams - i)
+            boa.env.reset_gas_used()
+            with boa.env.prank(donor):
+                batch.create_streams([spec] * n, value=N_PERIODS * n)
+            used += batch._computation.get_gas_used()
+        report["create_streams per stream"] = used // n_streams
+
+    def gas(call, *args):
+        boa.env.reset_gas_used()
+        with boa.env.prank(caller):
+            call(*args)
+        return streamer._computation.get_gas_used()
+
+    report["is_due"] = gas(streamer.is_due, 0)
+    report[f"streams_and_rewards_due ({n_streams})"] = gas(streamer.streams_and_rewards_due)
+    report["execute (1, non-final)"] = gas(streamer.execute, 0)
+
+    # execute_many in chunks of 32, averaged per stream.
+    ids = list(range(1, n_streams))
+    used = 0
+    for i in range(0, len(ids), 32):
+        used += gas(streamer.execute_many, ids[i : i + 32])
+    if ids:
+        report["execute_many per stream"] = used // len(ids)
+        report[f"streams_and_rewards_due ({n_streams}, none due)"] = gas(
+            streamer.streams_and_rewards_due
+        )
+        if hasattr(streamer, "due_summary"):
+            report[f"due_summary ({n_streams}, none due)"] = gas(streamer.due_summary)
+            n_words = min((n_streams + 255) // 256, 16)
+            report[f"due_bitmap ({n_words} words, none due)"] = gas(streamer.due_bitmap, 0, n_words)
+
+    # execute_due on the create_streams instance, whose streams are all still due.
+    if hasattr(streamer, "execute_due"):
+        used = 0
+        for _ in range(0, n_streams, 32):
+            boa.env.reset_gas_used()
+            with boa.env.prank(caller):
+                batch.execute_due(32)
+            used += batch._computation.get_gas_used()
+        report["execute_due per stream"] = used // n_streams
+    return report
+
+
+def git_source(ref: str) -> str:
+    return subprocess.run(
+        ["git", "show", f"{ref}:{CONTRACT}"], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DonationStreamer gas report")
+    parser.add_argument("--baseline", help="git ref of the contract to compare against")
+    parser.add_argument("--streams", type=int, default=32, help="Streams to create (default: 32)")
+    args = parser.parse_args()
+
+    with open(CONTRACT) as f:
+        current = measure(f.read(), args.streams)
+    baseline = measure(git_source(args.baseline), args.streams) if args.baseline else None
+
+    width = max(len(k) for k in current)
+    if baseline is None:
+        for name, used in current.items():
+            print(f"{name:<{width}}  {used:>10}")
+        return
+
+    print(f"{'':<{width}}  {args.baseline:>10}  {'current':>10}  {'change':>7}")
+    for name, used in current.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<{width}}  {'-':>10}  {used:>10}")
+            continue
+        change = (used - before) / before * 100
+        print(f"{name:<{width}}  {before:>10}  {used:>10}  {change:>+6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Local nonce management for an executor account.
+
+The pending nonce is read once (normally as part of the batched chain state
+read) and nonces are then handed out locally, so several execute_many
+transactions can be in flight in the same block without waiting on each
+other's confirmation. Nonces that were reserved but never broadcast, and
+nonces whose transactions were dropped from the mempool, are gaps: they are
+handed out again before any new nonce so later transactions are not stuck
+behind them.
+
+Managers are kept per (chain_id, address) for the life of the process, so
+daemon passes resync against the chain instead of starting over.
+"""
+
+import heapq
+import threading
+
+from rpc_batch import fetch_batch
+
+
+_MANAGERS: dict[tuple[int, str], "NonceManager"] = {}
+
+
+class NonceManager:
+    def __init__(self, rpc, address: str):
+        self.rpc = rpc
+        self.address = address
+        self._lock = threading.Lock()
+        self._next: int | None = None
+        # reserved nonces below _next that nothing was broadcast with (min-heap)
+        self._gaps: list[int] = []
+        # nonce -> tx hash of broadcast, not yet mined transactions
+        self.in_flight: dict[int, str] = {}
+
+    def _fetch_count(self, tag: str) -> int:
+        return int(self.rpc.fetch("eth_getTransactionCount", [self.address, tag]), 16)
+
+    def sync(self, pending: int | None = None) -> list[int]:
+        """
+        Align with the chain's pending nonce (fetched if not given). Returns the
+        nonces of in-flight transactions the node no longer knows about.
+        """
+        if pending is None:
+            pending = self._fetch_count("pending")
+        with self._lock:
+            dropped = sorted(n for n in self.in_flight if n >= pending)
+            self.in_flight = {n: h for n, h in self.in_flight.items() if n < pending}
+            self._next = pending
+            self._gaps = []
+            return dropped
+
+    def reserve(self) -> int:
+        """Hand out the lowest unused nonce."""
+        if self._next is None:
+            self.sync()
+        with self._lock:
+            if self._gaps:
+                return heapq.heappop(self._gaps)
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def _release(self, nonce: int) -> None:
+        if nonce == self._next - 1:
+            self._next -= 1
+        elif nonce not in self._gaps:
+            heapq.heappush(self._gaps, nonce)
+
+    def release(self, nonce: int) -> None:
+        """Return a reserved nonce that was never broadcast."""
+        with self._lock:
+            self._release(nonce)
+
+    def sent(self, nonce: int, tx_hash: str) -> None:
+        with self._lock:
+            self.in_flight[nonce] = tx_hash
+
+    def send_failed(self, nonce: int) -> None:
+        """
+        Resync after eth_sendRawTransaction raised: the node may still have
+        accepted the transaction (e.g. on a timeout), or the nonce may already
+        have been used by another sender ("nonce too low").
+        """
+        pending = self._fetch_count("pending")
+        with self._lock:
+            if pending > nonce:
+                self._next = max(self._next, pending)
+                self._gaps = [n for n in self._gaps if n >= pending]
+                heapq.heapify(self._gaps)
+            else:
+                self._release(nonce)
+
+    def check(self) -> list[int]:
+        """
+        Forget mined transactions and detect dropped ones. Dropped nonces become
+        gaps to be refilled by the next reservations. Returns them.
+        """
+        with self._lock:
+            in_flight = sorted(self.in_flight.items())
+        if not in_flight:
+            return []
+
+        payloads = [("eth_getTransactionCount", [self.address, "latest"])]
+        payloads += [("eth_getTransactionByHash", [tx_hash]) for _, tx_hash in in_flight]
+        results = fetch_batch(self.rpc, payloads)
+        mined = int(results[0], 16)
+
+        dropped = []
+        with self._lock:
+            for (nonce, tx_hash), tx in zip(in_flight, results[1:]):
+                if self.in_flight.get(nonce) != tx_hash:
+                    continue  # replaced meanwhile
+                if nonce < mined:
+                    del self.in_flight[nonce]
+                elif tx is None:
+                    del self.in_flight[nonce]
+                    self._release(nonce)
+                    dropped.append(nonce)
+        return dropped
+
+
+def nonce_manager(rpc, chain_id: int, address: str) -> NonceManager:
+    """Return the process-wide manager for an account on a chain."""
+    key = (chain_id, address.lower())
+    manager = _MANAGERS.get(key)
+    if manager is None:
+        manager = _MANAGERS[key] = NonceManager(rpc, address)
+    manager.rpc = rpc
+    return manager
@@ -0,0 +1,237 @@
+"""
+JSON-RPC batching for the per-run read phase.
+
+Everything a refuel pass needs before deciding what to send (block data,
+fee history, executor balance and nonce, `stream_count` and the due summary) is
+read in one JSON-RPC batch per chain; the due view itself is only read when the
+summary reports due streams. Providers that reject batches get the same requests
+one by one.
+"""
+
+from dataclasses import dataclass
+
+from boa.rpc import RPCError
+
+from streamer_rpc import StreamerRPC
+
+
+# RPC identifiers that rejected a batch; later reads go straight to single calls.
+_NO_BATCH: set[str] = set()
+
+# Streamer addresses whose deployment has no due_summary; they get the due view directly.
+_NO_SUMMARY: set[str] = set()
+
+# Providers cap batch sizes (and bill per request anyway); larger reads are split.
+MAX_BATCH_SIZE = 100
+
+# Mirrors DonationStreamer.N_MAX_VIEW, the ids walked per due-view page.
+N_MAX_VIEW = 1024
+
+# Mirrors DonationStreamer.N_MAX_READ, the streams returned per get_streams/streams_range call.
+N_MAX_READ = 256
+
+
+def fetch_batch(rpc, payloads: list[tuple[str, list]]) -> list:
+    """Send payloads as one batch, falling back to individual calls if the batch fails."""
+    if len(payloads) > MAX_BATCH_SIZE:
+        results = []
+        for i in range(0, len(payloads), MAX_BATCH_SIZE):
+            results.extend(fetch_batch(rpc, payloads[i : i + MAX_BATCH_SIZE]))
+        return results
+
+    if rpc.identifier not in _NO_BATCH:
+        try:
+            return rpc.fetch_multi(payloads)
+        except RPCError:
+            # One request in the batch failed; retry individually so the error
+            # surfaces from the request that caused it.
+            pass
+        except Exception:
+            _NO_BATCH.add(rpc.identifier)
+    return [rpc.fetch(method, params) for method, params in payloads]
+
+
+@dataclass
+class ChainState:
+    chain_id: int
+    block_number: int
+    timestamp: int
+    base_fee: int
+    stream_count: int
+    fee_history: dict | None = None
+    n_due: int | None = None
+    reward_due: int | None = None
+    due_ids: list[int] | None = None
+    rewards: list[int] | None = None
+    balance: int | None = None
+    nonce: int | None = None
+
+
+def read_chain_state(
+    reader: StreamerRPC,
+    executor: str | None = None,
+    include_due: bool = True,
+    fee_history: tuple[str, list] | None = None,
+) -> ChainState:
+    """
+    Read block, executor and streamer state in a single round-trip, plus one for
+    the due view when the due summary reports due streams.
+    `fee_history` is an optional eth_feeHistory payload to include in the batch.
+    """
+    payloads = [
+        ("eth_chainId", []),
+        ("eth_getBlockByNumber", ["latest", False]),
+        reader.call_payload("stream_count"),
+    ]
+    if fee_history:
+        payloads.append(fee_history)
+    has_summary = include_due and reader.address not in _NO_SUMMARY
+    if include_due:
+        due_index = len(payloads)
+        due_view = "due_summary" if has_summary else "streams_and_rewards_due"
+        payloads.append(reader.call_payload(due_view))
+    if executor:
+        payloads.append(("eth_getBalance", [executor, "latest"]))
+        payloads.append(("eth_getTransactionCount", [executor, "pending"]))
+
+    try:
+        results = iter(fetch_batch(reader.rpc, payloads))
+    except RPCError:
+        if not has_summary:
+            raise
+        # Deployments without due_summary: read the due view in the batch instead.
+        _NO_SUMMARY.add(reader.address)
+        has_summary = False
+        payloads[due_index] = reader.call_payload("streams_and_rewards_due")
+        results = iter(fetch_batch(reader.rpc, payloads))
+    chain_id = int(next(results), 16)
+    block = next(results)
+    state = ChainState(
+        chain_id=chain_id,
+        block_number=int(block["number"], 16),
+        timestamp=int(block["timestamp"], 16),
+        base_fee=int(block.get("baseFeePerGas", "0x0"), 16),
+        stream_count=reader.decode_result("stream_count", next(results)),
+    )
+    if fee_history:
+        state.fee_history = next(results)
+    if has_summary:
+        state.n_due, state.reward_due = reader.decode_result("due_summary", next(results))
+        state.due_ids, state.rewards = [], []
+    elif include_due:
+        due_ids, rewards = reader.decode_result("streams_and_rewards_due", next(results))
+        state.due_ids, state.rewards = list(due_ids), list(rewards)
+    if executor:
+        state.balance = int(next(results), 16)
+        state.nonce = int(next(results), 16)
+
+    if state.n_due:
+        # The due view is only read, pinned to the same block, when something is due.
+        method, params = reader.call_payload("streams_and_rewards_due", block=state.block_number)
+        due_ids, rewards = reader.decode_result(
+            "streams_and_rewards_due", reader.rpc.fetch(method, params)
+        )
+        state.due_ids, state.rewards = list(due_ids), list(rewards)
+    if include_due and state.n_due != 0 and state.stream_count > N_MAX_VIEW:
+        older_ids, older_rewards = read_due_pages(reader, state.stream_count, state.block_number)
+        state.due_ids += older_ids
+        state.rewards += older_rewards
+    return state
+
+
+def read_due_pages(reader: StreamerRPC, stream_count: int, block: int) -> tuple[list, list]:
+    """
+    Read the due view for every page below the first N_MAX_VIEW live streams,
+    pinned to `block` so the pages agree with the first page.
+    """
+    try:
+        n_active = reader.call("n_active", block=block)
+    except RPCError:
+        # Deployments without the live set page over all ids ever created.
+        n_active = stream_count
+    starts = range(n_active - N_MAX_VIEW, 0, -N_MAX_VIEW)
+    if not starts:
+        return [], []
+    payloads = [
+        reader.call_payload("streams_and_rewards_due", start, N_MAX_VIEW, block=block)
+        for start in starts
+    ]
+    try:
+        results = fetch_batch(reader.rpc, payloads)
+    except RPCError as e:
+        # Deployments from before the paginated view only expose the newest page.
+        print(f"WARNING: paginated due view unavailable ({e}); ids below {starts[0]} are skipped")
+        return [], []
+
+    due_ids, rewards = [], []
+    for result in results:
+        page_ids, page_rewards = reader.decode_result("streams_and_rewards_due", result)
+        due_ids += page_ids
+        rewards += page_rewards
+    return due_ids, rewards
+
+
+def read_streams(
+    reader: StreamerRPC, stream_ids: list[int], block: str | int = "latest"
+) -> dict[int, dict]:
+    """
+    Read several stream structs with batched `get_streams` calls, or one
+    `streams` call per id on deployments without the bulk view.
+    """
+    if not stream_ids:
+        return {}
+    chunks = [stream_ids[i : i + N_MAX_READ] for i in range(0, len(stream_ids), N_MAX_READ)]
+    try:
+        results = fetch_batch(
+            reader.rpc,
+            [reader.call_payload("get_streams", chunk, block=block) for chunk in chunks],
+        )
+    except RPCError:
+        payloads = [
+            reader.call_payload("streams", stream_id, block=block) for stream_id in stream_ids
+        ]
+        results = fetch_batch(reader.rpc, payloads)
+        return {
+            stream_id: reader.decode_stream(reader.decode_result("streams", result))
+            for stream_id, result in zip(stream_ids, results)
+        }
+
+    streams = {}
+    for result in results:
+        ids, raw_streams = reader.decode_result("get_streams", result)
+        for stream_id, raw in zip(ids, raw_streams):
+            streams[stream_id] = reader.decode_stream(raw)
+    return streams
+
+
+def read_live_streams(reader: StreamerRPC, stream_count: int, block: int) -> dict[int, dict]:
+    """
+    Read every non-empty stream at `block` with batched `streams_range` calls,
+    or one `streams` call per id on deployments without the bulk view.
+    """
+    if stream_count == 0:
+        return {}
+    payloads = [
+        reader.call_payload("streams_range", start, N_MAX_READ, True, block=block)
+        for start in range(0, stream_count, N_MAX_READ)
+    ]
+    try:
+        results = fetch_batch(reader.rpc, payloads)
+    except RPCError:
+        payloads = [
+            reader.call_payload("streams", stream_id, block=block)
+            for stream_id in range(stream_count)
+        ]
+        results = fetch_batch(reader.rpc, payloads)
+        streams = {
+            stream_id: reader.decode_stream(reader.decode_result("streams", result))
+            for stream_id, result in zip(range(stream_count), results)
+        }
+        return {k: v for k, v in streams.items() if int(v["donor"], 16) != 0}
+
+    streams = {}
+    for result in results:
+        ids, raw_streams = reader.decode_result("streams_range", result)
+        for stream_id, raw in zip(ids, raw_streams):
+            streams[stream_id] = reader.decode_stream(raw)
+    return streams
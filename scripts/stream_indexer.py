@@ -0,0 +1,434 @@
+"""
+Incremental event-log indexer with a local SQLite mirror of DonationStreamer.
+
+Ingests StreamCreated, StreamExecuted and StreamCancelled logs and keeps a
+per-chain stream table plus the last synced block. After the first sync a
+run costs one small `eth_getLogs` query.
+
+Network reads happen before a write transaction opens, so the database is
+only locked while rows are written.
+
+Reorgs: the hash of the last synced block is stored; if the chain no longer
+has it, the last `reorg_depth` blocks of events are dropped and the affected
+streams are rebuilt by replaying their remaining events.
+
+Usage:
+    uv run scripts/stream_indexer.py --chain gnosis --db streams.sqlite
+"""
+
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+
+from eth_abi import decode
+from eth_utils import to_checksum_address
+
+from rpc_batch import fetch_batch
+from streamer_rpc import StreamerRPC, log_stream_id
+
+
+DEFAULT_DB = "streams.sqlite"
+DEFAULT_REORG_DEPTH = 64
+# Initial eth_getLogs span; halved on provider range/size errors, grown back on success.
+DEFAULT_MAX_RANGE = 100_000
+MIN_RANGE = 1
+# Chains running in parallel share one database file; a writer waits for the
+# others' short write transactions instead of failing after sqlite's default 5s.
+DB_TIMEOUT = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    chain_id INTEGER PRIMARY KEY,
+    last_block INTEGER NOT NULL,
+    last_block_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    chain_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_timestamp INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stream_id INTEGER NOT NULL,
+    topics TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (chain_id, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_stream ON events (chain_id, stream_id);
+CREATE TABLE IF NOT EXISTS streams (
+    chain_id INTEGER NOT NULL,
+    stream_id INTEGER NOT NULL,
+    donor TEXT NOT NULL,
+    pool TEXT NOT NULL,
+    amount0_per_period TEXT NOT NULL,
+    amount1_per_period TEXT NOT NULL,
+    period_length INTEGER NOT NULL,
+    reward_per_period TEXT NOT NULL,
+    next_ts INTEGER NOT NULL,
+    reward_remaining TEXT NOT NULL,
+    amount0_remaining TEXT NOT NULL,
+    amount1_remaining TEXT NOT NULL,
+    periods_remaining INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (chain_id, stream_id)
+);
+CREATE INDEX IF NOT EXISTS streams_status ON streams (chain_id, status, next_ts);
+"""
+
+# Token amounts and rewards are uint256; SQLite integers are 64-bit, so they are stored as text.
+EVENT_DATA_TYPES = {
+    "StreamCreated": ["uint256", "uint256[2]", "uint256", "uint256", "uint256"],
+    "StreamExecuted": ["uint256", "uint256", "uint256[2]", "uint256"],
+    "StreamCancelled": ["uint256", "uint256[2]", "uint256"],
+}
+
+
+def _topic_address(topic: str) -> str:
+    return to_checksum_address("0x" + topic[-40:])
+
+
+def _is_range_error(error: Exception) -> bool:
+    """Heuristic for provider eth_getLogs limits (block span or result count)."""
+    message = str(error).lower()
+    return any(
+        hint in message
+        for hint in ("range", "limit", "too many", "exceed", "response size", "10000", "timeout")
+    )
+
+
+def apply_event(stream: dict | None, name: str, topics: list[str], data: str, ts: int) -> dict:
+    """Apply one decoded event to a stream row (None before StreamCreated). Returns the row."""
+    values = decode(EVENT_DATA_TYPES[name], bytes.fromhex(data.removeprefix("0x")))
+    if name == "StreamCreated":
+        _, amounts, period_length, n_periods, reward_per_period = values
+        return {
+            "donor": _topic_address(topics[1]),
+            "pool": _topic_address(topics[2]),
+            "amounts_per_period": [a // n_periods for a in amounts],
+            "period_length": period_length,
+            "reward_per_period": reward_per_period,
+            "next_ts": ts,
+            "reward_remaining": reward_per_period * n_periods,
+            "amounts_remaining": list(amounts),
+            "periods_remaining": n_periods,
+            "status": "active",
+        }
+
+    if stream is None:
+        # History before the indexed range; nothing to apply to.
+        return None
+
+    if name == "StreamExecuted":
+        _, periods, amounts, reward_paid = values
+        stream["periods_remaining"] -= periods
+        stream["next_ts"] += stream["period_length"] * periods
+        stream["reward_remaining"] -= reward_paid
+        stream["amounts_remaining"] = [r - a for r, a in zip(stream["amounts_remaining"], amounts)]
+        if stream["periods_remaining"] == 0:
+            stream["status"] = "finished"
+    elif name == "StreamCancelled":
+        stream["periods_remaining"] = 0
+        stream["reward_remaining"] = 0
+        stream["amounts_remaining"] = [0, 0]
+        stream["status"] = "cancelled"
+    return stream
+
+
+def due_periods(stream: dict, now: int) -> int:
+    """Mirror of `DonationStreamer._due_periods` for a mirrored stream row."""
+    if (
+        stream["status"] != "active"
+        or stream["periods_remaining"] == 0
+        or stream["period_length"] == 0
+        or now < stream["next_ts"]
+    ):
+        return 0
+    periods = (now - stream["next_ts"]) // stream["period_length"] + 1
+    return min(periods, stream["periods_remaining"])
+
+
+class StreamIndexer:
+    """SQLite mirror of one chain's DonationStreamer, synced from logs."""
+
+    def __init__(
+        self,
+        db: sqlite3.Connection | str,
+        reader: StreamerRPC,
+        chain_id: int,
+        start_block: int = 0,
+        reorg_depth: int = DEFAULT_REORG_DEPTH,
+        max_range: int = DEFAULT_MAX_RANGE,
+    ):
+        self.db = sqlite3.connect(db, timeout=DB_TIMEOUT) if isinstance(db, str) else db
+        self.db.executescript(SCHEMA)
+        self.reader = reader
+        self.chain_id = chain_id
+        self.start_block = start_block
+        self.reorg_depth = reorg_depth
+        self.max_range = max_range
+        self._block_timestamps: dict[int, int] = {}
+
+    # -- state -------------------------------------------------------------
+
+    def last_synced(self) -> tuple[int, str] | None:
+        row = self.db.execute(
+            "SELECT last_block, last_block_hash FROM sync_state WHERE chain_id = ?",
+            (self.chain_id,),
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _set_synced(self, block: int, block_hash: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO sync_state (chain_id, last_block, last_block_hash) "
+            "VALUES (?, ?, ?)",
+            (self.chain_id, block, block_hash),
+        )
+
+    def _load_stream(self, stream_id: int) -> dict | None:
+        row = self.db.execute(
+            "SELECT donor, pool, amount0_per_period, amount1_per_period, period_length, "
+            "reward_per_period, next_ts, reward_remaining, amount0_remaining, amount1_remaining, "
+            "periods_remaining, status FROM streams WHERE chain_id = ? AND stream_id = ?",
+            (self.chain_id, stream_id),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "donor": row[0],
+            "pool": row[1],
+            "amounts_per_period": [int(row[2]), int(row[3])],
+            "period_length": row[4],
+            "reward_per_period": int(row[5]),
+            "next_ts": row[6],
+            "reward_remaining": int(row[7]),
+            "amounts_remaining": [int(row[8]), int(row[9])],
+            "periods_remaining": row[10],
+            "status": row[11],
+        }
+
+    def _store_stream(self, stream_id: int, stream: dict | None) -> None:
+        if stream is None:
+            self.db.execute(
+                "DELETE FROM streams WHERE chain_id = ? AND stream_id = ?",
+                (self.chain_id, stream_id),
+            )
+            return
+        self.db.execute(
+            "INSERT OR REPLACE INTO streams VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.chain_id,
+                stream_id,
+                stream["donor"],
+                stream["pool"],
+                str(stream["amounts_per_period"][0]),
+                str(stream["amounts_per_period"][1]),
+                stream["period_length"],
+                str(stream["reward_per_period"]),
+                stream["next_ts"],
+                str(stream["reward_remaining"]),
+                str(stream["amounts_remaining"][0]),
+                str(stream["amounts_remaining"][1]),
+                stream["periods_remaining"],
+                stream["status"],
+            ),
+        )
+
+    # -- ingestion ---------------------------------------------------------
+
+    def _fetch_block_timestamps(self, logs: list[dict]) -> None:
+        """Read the timestamps of blocks whose logs lack one, in one batch."""
+        numbers = sorted(
+            {
+                int(log["blockNumber"], 16)
+                for log in logs
+                if "blockTimestamp" not in log
+                and int(log["blockNumber"], 16) not in self._block_timestamps
+            }
+        )
+        payloads = [("eth_getBlockByNumber", [hex(n), False]) for n in numbers]
+        for number, block in zip(numbers, fetch_batch(self.reader.rpc, payloads)):
+            self._block_timestamps[number] = int(block["timestamp"], 16)
+
+    def _block_timestamp(self, log: dict) -> int:
+        # Some providers include it in the log; the others are prefetched.
+        if "blockTimestamp" in log:
+            return int(log["blockTimestamp"], 16)
+        return self._block_timestamps[int(log["blockNumber"], 16)]
+
+    def fetch_logs(self, from_block: int, to_block: int) -> list[dict]:
+        """
+        Fetch logs in [from_block, to_block], splitting the range adaptively so
+        each request stays under the provider's eth_getLogs limits.
+        """
+        logs = []
+        span = self.max_range
+        start = from_block
+        while start <= to_block:
+            end = min(start + span - 1, to_block)
+            try:
+                logs.extend(self.reader.get_logs(start, end, list(EVENT_DATA_TYPES)))
+            except Exception as e:
+                if span <= MIN_RANGE or not _is_range_error(e):
+                    raise
+                span = max((end - start + 1) // 2, MIN_RANGE)
+                continue
+            start = end + 1
+            # Ranges that work tend to keep working; grow back after a success.
+            span = min(span * 2, self.max_range)
+        return logs
+
+    def _ingest(self, logs: list[dict]) -> set[int]:
+        # Other streamer events (e.g. StreamFailed) do not change the mirrored state.
+        names = {
+            topic: name for name, topic in self.reader.topics.items() if name in EVENT_DATA_TYPES
+        }
+        touched = set()
+        for log in sorted(logs, key=lambda x: (int(x["blockNumber"], 16), int(x["logIndex"], 16))):
+            name = names.get(log["topics"][0].lower())
+            if name is None or log.get("removed"):
+                continue
+            stream_id = log_stream_id(log)
+            ts = self._block_timestamp(log)
+            self.db.execute(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.chain_id,
+                    int(log["blockNumber"], 16),
+                    int(log["logIndex"], 16),
+                    ts,
+                    log["transactionHash"],
+                    name,
+                    stream_id,
+                    ",".join(log["topics"]),
+                    log["data"],
+                ),
+            )
+            stream = apply_event(self._load_stream(stream_id), name, log["topics"], log["data"], ts)
+            self._store_stream(stream_id, stream)
+            touched.add(stream_id)
+        return touched
+
+    def _rebuild(self, stream_ids: set[int]) -> None:
+        """Recompute streams from the events still stored for them."""
+        for stream_id in stream_ids:
+            stream = None
+            rows = self.db.execute(
+                "SELECT name, topics, data, block_timestamp FROM events "
+                "WHERE chain_id = ? AND stream_id = ? ORDER BY block_number, log_index",
+                (self.chain_id, stream_id),
+            ).fetchall()
+            for name, topics, data, ts in rows:
+                stream = apply_event(stream, name, topics.split(","), data, ts)
+            self._store_stream(stream_id, stream)
+
+    def rollback(self, to_block: int) -> None:
+        """Drop events after to_block and rebuild the streams they touched."""
+        block = None
+        if to_block >= self.start_block:
+            block = self.reader.rpc.fetch("eth_getBlockByNumber", [hex(to_block), False])
+        touched = {
+            row[0]
+            for row in self.db.execute(
+                "SELECT DISTINCT stream_id FROM events WHERE chain_id = ? AND block_number > ?",
+                (self.chain_id, to_block),
+            )
+        }
+        self.db.execute(
+            "DELETE FROM events WHERE chain_id = ? AND block_number > ?",
+            (self.chain_id, to_block),
+        )
+        self._rebuild(touched)
+        if block is None:
+            self.db.execute("DELETE FROM sync_state WHERE chain_id = ?", (self.chain_id,))
+            return
+        self._set_synced(to_block, block["hash"])
+
+    def _check_reorg(self) -> None:
+        synced = self.last_synced()
+        if synced is None:
+            return
+        last_block, last_hash = synced
+        block = self.reader.rpc.fetch("eth_getBlockByNumber", [hex(last_block), False])
+        if block is not None and block["hash"] == last_hash:
+            return
+        to_block = max(last_block - self.reorg_depth, self.start_block - 1)
+        print(f"Reorg detected at block {last_block}, rolling back to {to_block}")
+        self.rollback(to_block)
+
+    def sync(self) -> int:
+        """Sync up to the latest block. Returns the number of new events."""
+        with self.db:
+            self._check_reorg()
+        head = self.reader.head()
+        synced = self.last_synced()
+        from_block = synced[0] + 1 if synced else self.start_block
+        if from_block > head["number"]:
+            return 0
+        logs = self.fetch_logs(from_block, head["number"])
+        self._fetch_block_timestamps(logs)
+        with self.db:
+            self._ingest(logs)
+            self._set_synced(head["number"], head["hash"])
+        return len(logs)
+
+    # -- queries -----------------------------------------------------------
+
+    def active_streams(self) -> dict[int, dict]:
+        rows = self.db.execute(
+            "SELECT stream_id FROM streams WHERE chain_id = ? AND status = 'active' "
+            "ORDER BY stream_id DESC",
+            (self.chain_id,),
+        ).fetchall()
+        return {row[0]: self._load_stream(row[0]) for row in rows}
+
+    def streams_and_rewards_due(self, now: int) -> tuple[list[int], list[int]]:
+        """Due ids and rewards computed from the mirror, newest first like the contract view."""
+        due_ids, rewards = [], []
+        for stream_id, stream in self.active_streams().items():
+            periods = due_periods(stream, now)
+            if periods == 0:
+                continue
+            due_ids.append(stream_id)
+            if periods == stream["periods_remaining"]:
+                rewards.append(stream["reward_remaining"])
+            else:
+                rewards.append(stream["reward_per_period"] * periods)
+        return due_ids, rewards
+
+
+def main() -> None:
+    # Deferred: auto_refuel pulls in the chain config and ABI loading.
+    from auto_refuel import ALCHEMY_RPC_BASE, CHAINS, DONATION_STREAMER, get_streamer_abi
+
+    parser = argparse.ArgumentParser(description="Sync the local DonationStreamer mirror")
+    parser.add_argument("--chain", choices=list(CHAINS.keys()), required=True)
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default: {DEFAULT_DB})")
+    parser.add_argument("--rpc-url", help="RPC URL (default: Alchemy via ALCHEMY_RPC_API_KEY)")
+    parser.add_argument(
+        "--start-block", type=int, help="First block to index (default: the chain's deploy_block)"
+    )
+    parser.add_argument("--reorg-depth", type=int, default=DEFAULT_REORG_DEPTH)
+    args = parser.parse_args()
+
+    config = CHAINS[args.chain]
+    rpc_url = args.rpc_url or ALCHEMY_RPC_BASE.format(
+        network=config["alchemy_network"], api_key=os.environ["ALCHEMY_RPC_API_KEY"]
+    )
+    reader = StreamerRPC(rpc_url, DONATION_STREAMER, get_streamer_abi())
+    with closing(sqlite3.connect(args.db, timeout=DB_TIMEOUT)) as db:
+        indexer = StreamIndexer(
+            db,
+            reader,
+            config["chain_id"],
+            start_block=config["deploy_block"] if args.start_block is None else args.start_block,
+            reorg_depth=args.reorg_depth,
+        )
+        n_events = indexer.sync()
+        last_block, _ = indexer.last_synced()
+        print(f"{args.chain}: {n_events} new events, synced to block {last_block}")
+        print(f"{args.chain}: {len(indexer.active_streams())} active streams")
+
+
+if __name__ == "__main__":
+    main()
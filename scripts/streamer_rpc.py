@@ -0,0 +1,98 @@
+"""
+Direct JSON-RPC reads of a DonationStreamer.
+
+boa's NetworkEnv serves view calls from a fork pinned at the block it was
+created on, which is fine for a one-shot run but goes stale in long-running
+processes. These helpers always read the requested block (default "latest").
+"""
+
+from boa.contracts.abi.abi_contract import ABIFunction
+from boa.rpc import EthereumRPC, to_hex
+from eth_abi import decode
+from eth_utils import keccak
+
+
+def _event_signature(event_abi: dict) -> str:
+    types = ",".join(i["type"] for i in event_abi["inputs"])
+    return f"{event_abi['name']}({types})"
+
+
+class StreamerRPC:
+    """Fresh-state view calls and log queries against one streamer deployment."""
+
+    def __init__(self, rpc: EthereumRPC | str, address: str, abi: list[dict]):
+        self.rpc = EthereumRPC(rpc) if isinstance(rpc, str) else rpc
+        self.address = address
+        self._abi = {
+            item["name"]: item for item in abi if item.get("type") in ("function", "event")
+        }
+        # Functions with default arguments appear once per arity in the ABI.
+        self._overloads: dict[str, dict[int, ABIFunction]] = {}
+        for item in abi:
+            if item.get("type") == "function":
+                arities = self._overloads.setdefault(item["name"], {})
+                arities[len(item["inputs"])] = ABIFunction(item, "DonationStreamer")
+        self.functions = {name: fns[min(fns)] for name, fns in self._overloads.items()}
+        self.topics = {
+            item["name"]: "0x" + keccak(text=_event_signature(item)).hex()
+            for item in abi
+            if item.get("type") == "event"
+        }
+
+    def has_overload(self, name: str, n_args: int) -> bool:
+        return n_args in self._overloads.get(name, {})
+
+    def prepare_calldata(self, name: str, *args) -> bytes:
+        """Encode a call, picking the overload that takes len(args) arguments."""
+        return self._overloads[name][len(args)].prepare_calldata(*args)
+
+    def call_payload(self, name: str, *args, block: str | int = "latest") -> tuple[str, list]:
+        """Return the (method, params) eth_call payload for a view function."""
+        data = self.prepare_calldata(name, *args)
+        block_id = to_hex(block) if isinstance(block, int) else block
+        return "eth_call", [{"to": self.address, "data": to_hex(data)}, block_id]
+
+    def decode_result(self, name: str, result: str):
+        """Decode eth_call return data; a single output is unwrapped."""
+        fn = self.functions[name]
+        values = decode(fn.return_type, bytes.fromhex(result.removeprefix("0x")))
+        return values[0] if len(values) == 1 else values
+
+    def call(self, name: str, *args, block: str | int = "latest"):
+        """Run a view function via eth_call and decode the result."""
+        method, params = self.call_payload(name, *args, block=block)
+        return self.decode_result(name, self.rpc.fetch(method, params))
+
+    def decode_stream(self, raw: tuple) -> dict:
+        """Convert a `streams(id)` tuple into a dict keyed by struct field name."""
+        components = self._abi["streams"]["outputs"][0]["components"]
+        return {c["name"]: value for c, value in zip(components, raw)}
+
+    def stream(self, stream_id: int, block: str | int = "latest") -> dict:
+        """Read one stream struct as a dict."""
+        return self.decode_stream(self.call("streams", stream_id, block=block))
+
+    def head(self) -> dict:
+        """Return number, hash and timestamp of the latest block."""
+        block = self.rpc.fetch("eth_getBlockByNumber", ["latest", False])
+        return {
+            "number": int(block["number"], 16),
+            "hash": block["hash"],
+            "timestamp": int(block["timestamp"], 16),
+        }
+
+    def get_logs(self, from_block: int, to_block: int, events: list[str] | None = None) -> list:
+        """Return streamer logs in [from_block, to_block], optionally limited to event names."""
+        names = events or list(self.topics)
+        params = {
+            "address": self.address,
+            "fromBlock": to_hex(from_block),
+            "toBlock": to_hex(to_block),
+            "topics": [[self.topics[name] for name in names]],
+        }
+        return self.rpc.fetch("eth_getLogs", [params])
+
+
+def log_stream_id(log: dict) -> int:
+    """Stream id of a streamer event log (first data word)."""
+    return int(log["data"][2:66], 16)
@@ -45,3 +45,15 @@ def mock_pool(deployer, tokens):
 def donation_streamer(deployer):
     with boa.env.prank(deployer):
         return boa.load("contracts/DonationStreamer.vy")
+
+
+@pytest.fixture()
+def executor_streamer(deployer):
+    with boa.env.prank(deployer):
+        return boa.load("contracts/DonationStreamer.vy")
+
+
+@pytest.fixture()
+def stream_executor(deployer, executor_streamer):
+    with boa.env.prank(deployer):
+        return boa.load("contracts/StreamExecutor.vy", executor_streamer.address)
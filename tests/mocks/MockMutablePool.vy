@@ -0,0 +1,15 @@
+# pragma version 0.4.3
+# Pool whose coins can be changed after deployment, as a malicious pool could.
+
+
+coins: public(address[2])
+
+
+@deploy
+def __init__(_coins: address[2]):
+    self.coins = _coins
+
+
+@external
+def set_coins(_coins: address[2]):
+    self.coins = _coins
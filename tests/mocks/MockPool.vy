@@ -13,6 +13,7 @@ coins: public(immutable(address[2]))
 last_amounts: public(uint256[2])
 last_provider: public(address)
 last_donation: public(bool)
+paused: public(bool)
 
 
 @deploy
@@ -20,6 +21,11 @@ def __init__(_coins: address[2]):
     coins = _coins
 
 
+@external
+def set_paused(paused: bool):
+    self.paused = paused
+
+
 @external
 def add_liquidity(
     amounts: uint256[2],
@@ -27,6 +33,7 @@ def add_liquidity(
     receiver: address,
     donation: bool,
 ) -> uint256:
+    assert not self.paused, "paused"
     for i: uint256 in range(2):
         if amounts[i] > 0:
             assert extcall IERC20(coins[i]).transferFrom(msg.sender, self, amounts[i]), "transfer failed"
@@ -0,0 +1,90 @@
+import json
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from boa.rpc import RPCError
+
+
+# Scripts import each other as top-level modules.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+
+class FakeRPC:
+    """In-memory chain serving the JSON-RPC methods the scripts read."""
+
+    identifier = "fake"
+    chain_id = 1
+
+    def __init__(self):
+        self.blocks: dict[int, dict] = {}
+        self.logs: list[dict] = []
+        self.calls: list[str] = []
+        self.batches: list[list[str]] = []
+        # eth_getTransactionCount by block tag, and known transactions by hash
+        self.tx_counts = {"latest": 0, "pending": 0}
+        self.transactions: dict[str, dict] = {}
+        self.balances: dict[str, int] = {}
+        # eth_call handlers by 4-byte selector; calls without one revert
+        self.views: dict[str, Callable[[str], str]] = {}
+        # answer batches like a provider that does not support them
+        self.reject_batches = False
+
+    def add_block(self, number: int, timestamp: int, block_hash: str | None = None) -> None:
+        self.blocks[number] = {
+            "number": hex(number),
+            "hash": block_hash or "0x" + f"{number:064x}",
+            "timestamp": hex(timestamp),
+        }
+
+    def fetch(self, method: str, params: list):
+        self.calls.append(method)
+        if method == "eth_getBlockByNumber":
+            tag = params[0]
+            number = max(self.blocks) if tag == "latest" else int(tag, 16)
+            return self.blocks.get(number)
+        if method == "eth_getLogs":
+            query = params[0]
+            start, end = int(query["fromBlock"], 16), int(query["toBlock"], 16)
+            topics = {t.lower() for t in query["topics"][0]}
+            return [
+                log
+                for log in self.logs
+                if start <= int(log["blockNumber"], 16) <= end
+                and log["topics"][0].lower() in topics
+            ]
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method == "eth_call":
+            data = params[0]["data"]
+            view = self.views.get(data[:10])
+            if view is None:
+                raise RPCError("execution reverted", 3)
+            return view(data)
+        if method == "eth_getBalance":
+            return hex(self.balances.get(params[0], 0))
+        if method == "eth_getTransactionCount":
+            return hex(self.tx_counts[params[1]])
+        if method == "eth_getTransactionByHash":
+            return self.transactions.get(params[0])
+        raise NotImplementedError(method)
+
+    fetch_uncached = fetch
+
+    def fetch_multi(self, payloads: list[tuple[str, list]]) -> list:
+        if self.reject_batches:
+            raise ValueError("batch requests are not supported")
+        self.batches.append([method for method, _ in payloads])
+        return [self.fetch(method, params) for method, params in payloads]
+
+
+@pytest.fixture()
+def streamer_abi():
+    artifact = Path(__file__).resolve().parents[2] / "contracts/artifacts/DonationStreamer.json"
+    return json.loads(artifact.read_text())["abi"]
+
+
+@pytest.fixture()
+def fake_rpc():
+    return FakeRPC()
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import auto_refuel
+from confirmations import Confirmation, StreamExecution
+from streamer_rpc import StreamerRPC
+
+
+def _confirmation(executed, failed=(), success=True):
+    executions = [
+        StreamExecution(sid, "0x" + "33" * 20, "0x" + "22" * 20, 1, (1, 1), 5) for sid in executed
+    ]
+    return Confirmation("0xabc", success, 10, 100_000, executions, set(failed))
+
+
+@pytest.fixture()
+def confirmations(monkeypatch):
+    by_hash = {}
+    monkeypatch.setattr(auto_refuel, "confirm", lambda rpc, tx_hash, *a, **kw: by_hash[tx_hash])
+    return by_hash
+
+
+def test_wait_for_chunks_returns_confirmations(confirmations):
+    confirmations["0x1"] = _confirmation([0, 1])
+    confirmations["0x2"] = _confirmation([], failed=[2, 3])
+
+    outcomes = auto_refuel.wait_for_chunks(
+        "gnosis", None, [[0, 1], [2, 3], [4]], ["0x1", "0x2", None]
+    )
+
+    assert outcomes[0].executed_ids == {0, 1}
+    assert outcomes[1].executed_ids == set()
+    assert outcomes[1].failed_ids == {2, 3}
+    assert outcomes[2] is None
+
+
+def test_wait_for_chunks_reports_all_failed_chunk(confirmations, capsys):
+    confirmations["0x1"] = _confirmation([], failed=[0, 1])
+    confirmations["0x2"] = _confirmation([2], failed=[3])
+
+    auto_refuel.wait_for_chunks("gnosis", None, [[0, 1], [2, 3]], ["0x1", "0x2"])
+    out = capsys.readouterr().out
+
+    assert "Chunk 1/2 (2 streams): FAILED" in out
+    assert "Chunk 2/2 (2 streams): PARTIAL" in out
+
+
+def test_wait_for_chunks_reverted_chunk_is_none(confirmations):
+    confirmations["0x1"] = _confirmation([], success=False)
+
+    assert auto_refuel.wait_for_chunks("gnosis", None, [[0]], ["0x1"]) == [None]
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the patched execute_refuel",
+)
+def test_run_chains_parallel_isolates_failing_chain(monkeypatch, capsys):
+    def execute_refuel(chain, rpc_url, private_key, dry_run, index_db):
+        if chain == "ethereum":
+            raise RuntimeError("nonce too low")
+        # The failing chain finishes first; the others must keep running.
+        time.sleep(0.2)
+        print(f"{chain} pid {os.getpid()}")
+        return True, 1.5
+
+    monkeypatch.setattr(auto_refuel, "execute_refuel", execute_refuel)
+    urls = {"gnosis": "http://gnosis", "ethereum": "http://ethereum", "base": "http://base"}
+
+    results, balances = auto_refuel.run_chains_parallel(list(urls), urls, "0x01", dry_run=True)
+    out = capsys.readouterr().out
+
+    assert results == {"gnosis": True, "ethereum": False, "base": True}
+    assert balances == {"gnosis": 1.5, "ethereum": None, "base": 1.5}
+    assert "ERROR on ethereum: nonce too low" in out
+    pids = {line.split()[-1] for line in out.splitlines() if " pid " in line}
+    assert len(pids) == 2 and str(os.getpid()) not in pids
+
+
+def test_run_chains_parallel_skips_chain_without_rpc(monkeypatch):
+    monkeypatch.setattr(auto_refuel, "execute_refuel", lambda *args: (True, 1.0))
+
+    results, _ = auto_refuel.run_chains_parallel(
+        ["gnosis", "base"], {"gnosis": "http://gnosis"}, "0x01", dry_run=True
+    )
+
+    assert results == {"gnosis": True, "base": None}
+
+
+def test_read_due_from_index_starts_at_deploy_block(fake_rpc, streamer_abi, monkeypatch, tmp_path):
+    deploy_block = auto_refuel.CHAINS["gnosis"]["deploy_block"]
+    fake_rpc.add_block(deploy_block + 10, 1_000)
+    from_blocks = []
+    fetch = fake_rpc.fetch
+
+    def recording_fetch(method, params):
+        if method == "eth_getLogs":
+            from_blocks.append(int(params[0]["fromBlock"], 16))
+        return fetch(method, params)
+
+    monkeypatch.setattr(fake_rpc, "fetch", recording_fetch)
+    reader = StreamerRPC(fake_rpc, auto_refuel.DONATION_STREAMER, streamer_abi)
+
+    due = auto_refuel.read_due_from_index("gnosis", reader, str(tmp_path / "streams.sqlite"))
+
+    assert due == ([], [])
+    assert from_blocks == [deploy_block]
@@ -0,0 +1,92 @@
+from batch_planner import (
+    GAS_PER_STREAM,
+    GAS_POOL_FIRST,
+    GAS_POOL_REPEAT,
+    GAS_TX_BASE,
+    PlannedStream,
+    _best_prefix,
+    build_due,
+    plan,
+)
+
+
+GAS_PRICE = 10**9
+POOL_A = "0x" + "aa" * 20
+POOL_B = "0x" + "bb" * 20
+
+
+def _stream(stream_id, reward, pool=POOL_A, donates=True, final=False):
+    return PlannedStream(stream_id, pool, reward, donates, final)
+
+
+def test_best_prefix_drops_streams_below_their_gas():
+    first = (GAS_TX_BASE + GAS_POOL_FIRST + GAS_PER_STREAM) * GAS_PRICE
+    group = [
+        _stream(0, 1),
+        _stream(1, 2 * first),
+        _stream(2, (GAS_PER_STREAM + GAS_POOL_REPEAT) * GAS_PRICE * 2),
+    ]
+
+    assert [s.stream_id for s in _best_prefix(group, GAS_PRICE)] == [1, 2]
+
+
+def test_best_prefix_is_empty_when_nothing_pays():
+    assert _best_prefix([_stream(0, 1), _stream(1, 2)], GAS_PRICE) == []
+
+
+def test_best_prefix_keeps_final_streams():
+    group = [_stream(0, 0, final=True), _stream(1, 0)]
+
+    assert [s.stream_id for s in _best_prefix(group, GAS_PRICE)] == [0]
+
+
+def test_plan_without_profit_check_executes_everything():
+    due = [_stream(i, 0) for i in range(5)]
+
+    result = plan(due, GAS_PRICE, max_per_chunk=2, profit_check=False)
+
+    assert [c.ids for c in result.chunks] == [[0, 1], [2, 3], [4]]
+    assert result.deferred == []
+
+
+def test_plan_defers_unprofitable_and_keeps_pools_together():
+    big = 10**18
+    due = [
+        _stream(0, big, POOL_A),
+        _stream(1, big, POOL_B),
+        _stream(2, big, POOL_A),
+        _stream(3, 1, POOL_B),
+    ]
+
+    result = plan(due, GAS_PRICE, max_per_chunk=2)
+
+    assert sorted(sorted(c.ids) for c in result.chunks) == [[0, 2], [1]]
+    assert [s.stream_id for s in result.deferred] == [3]
+
+
+def test_plan_executes_zero_reward_streams_on_their_final_period():
+    due = [_stream(0, 0, final=True), _stream(1, 0)]
+
+    result = plan(due, GAS_PRICE, max_per_chunk=32)
+
+    assert [c.ids for c in result.chunks] == [[0]]
+    assert [s.stream_id for s in result.deferred] == [1]
+
+
+def test_build_due_marks_final_period():
+    stream = {
+        "donor": "0x" + "11" * 20,
+        "pool": POOL_A,
+        "amounts_per_period": [50, 0],
+        "amounts_remaining": [100, 0],
+        "period_length": 10,
+        "next_ts": 100,
+        "periods_remaining": 2,
+    }
+
+    (partial,) = build_due([0], [0], {0: stream}, now=100)
+    (final,) = build_due([0], [0], {0: stream}, now=110)
+
+    assert not partial.final
+    assert final.final
+    assert final.donates
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pytest
+
+import build_artifacts
+from build_artifacts import load_artifact
+
+
+CONTRACT = "contracts/DonationStreamer.vy"
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    monkeypatch.chdir(Path(__file__).resolve().parents[2])
+
+
+def test_load_artifact_is_fresh():
+    artifact = load_artifact(CONTRACT)
+    assert artifact is not None
+    assert artifact["compiler_version"] == build_artifacts.compiler_version()
+
+
+def test_load_artifact_abi_only_ignores_compiler_version(monkeypatch):
+    monkeypatch.setattr(build_artifacts, "compiler_version", lambda: "0.0.0")
+
+    assert load_artifact(CONTRACT) is None
+    assert load_artifact(CONTRACT, abi_only=True)["abi"]
@@ -0,0 +1,135 @@
+from itertools import islice
+
+import pytest
+from eth_abi import encode
+
+import confirmations
+from confirmations import (
+    STREAM_EXECUTED_TOPIC,
+    STREAM_FAILED_TOPIC,
+    confirm,
+    decode_stream_executed,
+    decode_stream_failed,
+    poll_delays,
+    wait_for_receipt,
+)
+
+STREAMER = "0x2b786BB995978CC2242C567Ae62fd617b0eBC828"
+CALLER = "0x" + "11" * 20
+POOL = "0x" + "22" * 20
+
+
+class ReceiptRPC:
+    """Returns None for the first `pending` receipt polls, then the receipt."""
+
+    def __init__(self, receipt, pending=0):
+        self.receipt = receipt
+        self.pending = pending
+        self.polls = 0
+
+    def fetch_uncached(self, method, params):
+        assert method == "eth_getTransactionReceipt"
+        self.polls += 1
+        return None if self.polls <= self.pending else self.receipt
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [0.0]
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    monkeypatch.setattr(confirmations.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(confirmations.time, "sleep", sleep)
+    return sleeps
+
+
+def _topic(address):
+    return "0x" + address[2:].lower().rjust(64, "0")
+
+
+def _executed(stream_id, address=STREAMER):
+    return {
+        "address": address,
+        "topics": [STREAM_EXECUTED_TOPIC, _topic(CALLER), _topic(POOL)],
+        "data": "0x"
+        + encode(
+            ["uint256", "uint256", "uint256[2]", "uint256"], [stream_id, 2, [10, 20], 7]
+        ).hex(),
+    }
+
+
+def _failed(stream_id, address=STREAMER):
+    return {
+        "address": address,
+        "topics": [STREAM_FAILED_TOPIC, _topic(CALLER), _topic(POOL)],
+        "data": "0x" + encode(["uint256"], [stream_id]).hex(),
+    }
+
+
+def _receipt(logs, status="0x1"):
+    return {"blockNumber": hex(100), "gasUsed": hex(50_000), "status": status, "logs": logs}
+
+
+def test_poll_delays_wait_one_block_then_back_off():
+    assert list(islice(poll_delays(12), 6)) == [12, 3, 4.5, 6.75, 10.125, 12]
+
+
+def test_wait_for_receipt_polls_until_found(clock):
+    rpc = ReceiptRPC(_receipt([]), pending=2)
+
+    assert wait_for_receipt(rpc, "0xabc", block_time=4) == rpc.receipt
+    assert clock == [4, 1]
+
+
+def test_wait_for_receipt_times_out(clock):
+    rpc = ReceiptRPC(None)
+
+    with pytest.raises(TimeoutError, match="0xabc"):
+        wait_for_receipt(rpc, "0xabc", block_time=4, timeout=10)
+    # Never sleeps past the deadline.
+    assert sum(clock) <= 10
+
+
+def test_decode_stream_executed():
+    receipt = _receipt([_executed(3), _failed(4), _executed(5, address=POOL)])
+
+    (execution,) = decode_stream_executed(receipt, STREAMER.lower())
+
+    assert execution.stream_id == 3
+    assert execution.caller.lower() == CALLER
+    assert execution.pool.lower() == POOL
+    assert execution.periods == 2
+    assert execution.amounts == (10, 20)
+    assert execution.reward_paid == 7
+
+
+def test_decode_stream_failed():
+    receipt = _receipt([_executed(3), _failed(4), _failed(6), _failed(8, address=POOL)])
+
+    assert decode_stream_failed(receipt, STREAMER) == {4, 6}
+
+
+def test_confirm_splits_executed_and_failed(clock):
+    rpc = ReceiptRPC(_receipt([_executed(3), _failed(4)]))
+
+    result = confirm(rpc, "0xabc", STREAMER, block_time=2)
+
+    assert result.success
+    assert result.block_number == 100
+    assert result.executed_ids == {3}
+    assert result.failed_ids == {4}
+    assert result.reward_paid == 7
+
+
+def test_confirm_reverted_transaction_has_no_results(clock):
+    rpc = ReceiptRPC(_receipt([_executed(3), _failed(4)], status="0x0"))
+
+    result = confirm(rpc, "0xabc", STREAMER, block_time=2)
+
+    assert not result.success
+    assert result.executions == []
+    assert result.failed_ids == set()
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import boa
+import pytest
+
+import deploy_create3
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class FakeCreateX:
+    """Computes a fixed CREATE3 target and records deployments."""
+
+    def __init__(self, address):
+        self.address = address
+        self.deployed = []
+
+    def computeCreate3Address(self, guarded_salt, deployer):
+        return self.address
+
+    def deployCreate3(self, salt, deploycode, sender):
+        self.deployed.append(deploycode)
+        boa.env.set_code(self.address, b"\x00")
+        return self.address
+
+
+@pytest.fixture()
+def target():
+    address = boa.env.generate_address()
+    yield address
+    boa.env.set_code(address, b"")
+
+
+@pytest.fixture(autouse=True)
+def no_compile(monkeypatch):
+    monkeypatch.chdir(ROOT)
+
+    def load_partial(path):
+        raise AssertionError(f"compiled {path}")
+
+    monkeypatch.setattr(boa, "load_partial", load_partial)
+
+
+def test_import_does_not_load_boa():
+    code = "import sys; import deploy_create3; print('boa' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT / "scripts",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def _deploy(createx, ctor_calldata=b""):
+    return deploy_create3.deploy(
+        createx,
+        "0x" + "66" * 20,
+        1,
+        None,
+        deploy_create3.EXECUTOR_NAME,
+        deploy_create3.EXECUTOR_PATH,
+        deploy_create3.EXECUTOR_SALT_SEED_TEXT,
+        ctor_calldata=ctor_calldata,
+    )
+
+
+def test_deploy_without_verify_uses_artifact(target):
+    createx = FakeCreateX(target)
+
+    assert _deploy(createx, b"\x01").lower() == str(target).lower()
+    (deploycode,) = createx.deployed
+    assert deploycode.endswith(b"\x01")
+
+
+def test_deploy_skips_existing_code(target):
+    boa.env.set_code(target, b"\x00")
+    createx = FakeCreateX(target)
+
+    _deploy(createx)
+
+    assert createx.deployed == []
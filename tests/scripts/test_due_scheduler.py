@@ -0,0 +1,157 @@
+import pytest
+
+import due_scheduler
+from due_scheduler import FULL_RESYNC_INTERVAL, ChainScheduler, DueQueue
+
+DONOR = "0x" + "33" * 20
+NO_DONOR = "0x" + "00" * 20
+
+
+class FakeReader:
+    """Streamer reader over an in-memory stream table; logs name touched stream ids."""
+
+    def __init__(self):
+        self.block = {"number": 100, "timestamp": 10_000}
+        self.streams: dict[int, dict] = {}
+        self.logs: list[dict] = []
+
+    def head(self):
+        return dict(self.block)
+
+    def call(self, name, *args, block="latest"):
+        assert name == "stream_count"
+        return len(self.streams)
+
+    def get_logs(self, from_block, to_block, events=None):
+        return [log for log in self.logs if from_block <= log["block"] <= to_block]
+
+    def touch(self, stream_id, **fields):
+        self.streams[stream_id].update(fields)
+        self.logs.append({"block": self.block["number"], "data": "0x" + f"{stream_id:064x}"})
+
+
+def _stream(next_ts, donor=DONOR, periods_remaining=3):
+    return {
+        "donor": donor,
+        "next_ts": next_ts,
+        "periods_remaining": periods_remaining,
+        "period_length": 60,
+    }
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [5_000.0]
+    monkeypatch.setattr(due_scheduler.time, "time", lambda: now[0])
+    monkeypatch.setattr(due_scheduler.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture()
+def reader(monkeypatch):
+    reader = FakeReader()
+    monkeypatch.setattr(
+        due_scheduler,
+        "read_live_streams",
+        lambda r, count, block: {i: dict(s) for i, s in r.streams.items()},
+    )
+    monkeypatch.setattr(
+        due_scheduler,
+        "read_streams",
+        lambda r, ids, block: {i: dict(r.streams[i]) for i in ids},
+    )
+    return reader
+
+
+def _scheduler(reader, execute=lambda: None):
+    return ChainScheduler(reader, execute, poll_interval=60, log=lambda msg: None)
+
+
+def test_due_queue_orders_by_timestamp():
+    queue = DueQueue()
+    queue.update(1, 300)
+    queue.update(2, 100)
+    queue.update(3, 200)
+
+    assert queue.next_due() == 100
+    assert queue.due_ids(200) == [2, 3]
+    assert len(queue) == 3
+
+
+def test_due_queue_skips_outdated_entries():
+    queue = DueQueue()
+    queue.update(1, 100)
+    queue.update(2, 200)
+    queue.update(1, 300)
+
+    assert queue.next_due() == 200
+    queue.remove(2)
+    assert queue.next_due() == 300
+    queue.remove(1)
+    assert queue.next_due() is None
+    assert len(queue) == 0
+
+
+def test_step_sleeps_until_next_due(clock, reader):
+    reader.streams = {0: _stream(10_030), 1: _stream(10_010), 2: _stream(10_000, donor=NO_DONOR)}
+    scheduler = _scheduler(reader)
+
+    # Chain time runs 5000s ahead of the local clock.
+    assert scheduler.step() == 10
+    assert len(scheduler.queue) == 2
+
+
+def test_step_caps_sleep_at_poll_interval(clock, reader):
+    reader.streams = {0: _stream(20_000)}
+
+    assert _scheduler(reader).step() == 60
+
+
+def test_step_executes_due_and_picks_up_next(clock, reader):
+    reader.streams = {0: _stream(9_990), 1: _stream(10_020)}
+    executed = []
+
+    def execute():
+        executed.append(True)
+        reader.block["number"] += 1
+        reader.touch(0, next_ts=10_050)
+
+    assert _scheduler(reader, execute).step() == 20
+    assert executed == [True]
+
+
+def test_step_retries_on_poll_interval_when_still_due(clock, reader):
+    reader.streams = {0: _stream(9_990), 1: _stream(10_020)}
+    executed = []
+    scheduler = _scheduler(reader, lambda: executed.append(True))
+
+    # A dry run or failed pass leaves the stream due: back off instead of spinning.
+    assert scheduler.step() == 60
+    assert scheduler.step() == 60
+    assert executed == [True, True]
+
+
+def test_step_drops_finished_streams_from_events(clock, reader):
+    reader.streams = {0: _stream(10_010), 1: _stream(10_040)}
+    scheduler = _scheduler(reader)
+    scheduler.step()
+
+    reader.block["number"] += 1
+    reader.touch(0, periods_remaining=0)
+
+    assert scheduler.step() == 40
+    assert scheduler.queue.due_ids(10_040) == [1]
+
+
+def test_step_full_resyncs_after_interval(clock, reader):
+    reader.streams = {0: _stream(10_010)}
+    scheduler = _scheduler(reader)
+    scheduler.step()
+
+    # A change without an event is only seen by the periodic full re-scan.
+    reader.streams[0]["next_ts"] = 10_020
+    assert scheduler.step() == 10
+    clock[0] += FULL_RESYNC_INTERVAL + 1
+    reader.block["timestamp"] += FULL_RESYNC_INTERVAL + 1
+    assert scheduler.step() == 60
+    assert scheduler.queue.next_due() == 10_020
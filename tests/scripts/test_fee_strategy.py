@@ -0,0 +1,74 @@
+import pytest
+
+import fee_strategy
+from fee_strategy import FeeHistory, cached_history, store_history, suggest_fees
+
+GWEI = 10**9
+
+
+def _history(base_fees, ratios, tips):
+    return FeeHistory(base_fees=base_fees, gas_used_ratios=ratios, rewards=[[t] for t in tips])
+
+
+def _raw(base_fee, tip):
+    return {
+        "baseFeePerGas": [hex(base_fee)] * 2,
+        "gasUsedRatio": [0.5],
+        "reward": [[hex(tip)]],
+    }
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fee_strategy.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(fee_strategy, "_HISTORY_CACHE", {})
+    return now
+
+
+def test_priority_fee_is_median_of_non_empty_blocks():
+    history = _history([GWEI] * 5, [0.5, 0.0, 0.9, 0.0, 0.3], [3, 0, 7, 0, 5])
+
+    assert suggest_fees(history, {}).priority_fee == 5
+
+
+def test_priority_fee_floor_when_every_block_is_empty():
+    history = _history([GWEI] * 3, [0.0, 0.0], [0, 0])
+
+    assert suggest_fees(history, {}).priority_fee == 1
+
+
+def test_max_fee_uses_next_base_fee_and_multiplier():
+    history = _history([GWEI, 2 * GWEI], [0.5], [10])
+
+    assert suggest_fees(history, {}).max_fee == 4 * GWEI + 10
+    assert suggest_fees(history, {"base_fee_multiplier": 1.5}).max_fee == 3 * GWEI + 10
+
+
+def test_max_fee_capped_by_ceiling():
+    history = _history([GWEI, 2 * GWEI], [0.5], [10])
+
+    fees = suggest_fees(history, {"max_base_fee_gwei": 3})
+
+    assert fees.ceiling == 3 * GWEI
+    assert fees.max_fee == 3 * GWEI + 10
+    assert not fees.over_ceiling
+
+
+def test_over_ceiling():
+    history = _history([GWEI, 2 * GWEI], [0.5], [10])
+
+    assert suggest_fees(history, {"max_base_fee_gwei": 1.5}).over_ceiling
+    assert not suggest_fees(history, {"max_base_fee_gwei": 2}).over_ceiling
+    assert not suggest_fees(history, {}).over_ceiling
+
+
+def test_cached_history_expires(clock):
+    stored = store_history(1, _raw(GWEI, 10))
+
+    clock[0] += fee_strategy.FEE_CACHE_TTL
+    assert cached_history(1) is stored
+    assert cached_history(2) is None
+
+    clock[0] += 1
+    assert cached_history(1) is None
@@ -0,0 +1,93 @@
+import pytest
+
+from nonce_manager import NonceManager, nonce_manager
+
+
+ACCOUNT = "0x" + "44" * 20
+
+
+@pytest.fixture()
+def manager(fake_rpc):
+    fake_rpc.tx_counts = {"latest": 5, "pending": 5}
+    return NonceManager(fake_rpc, ACCOUNT)
+
+
+def test_reserve_hands_out_consecutive_nonces(manager):
+    assert [manager.reserve() for _ in range(3)] == [5, 6, 7]
+
+
+def test_released_nonce_fills_the_gap_first(manager):
+    first, second, third = (manager.reserve() for _ in range(3))
+    manager.release(second)
+
+    assert manager.reserve() == second
+    assert manager.reserve() == third + 1
+
+
+def test_releasing_the_last_nonce_reuses_it(manager):
+    manager.reserve()
+    last = manager.reserve()
+    manager.release(last)
+
+    assert manager.reserve() == last
+
+
+def test_send_failed_reuses_nonce_the_node_did_not_take(fake_rpc, manager):
+    nonce = manager.reserve()
+    manager.reserve()
+
+    manager.send_failed(nonce)
+
+    assert manager.reserve() == nonce
+
+
+def test_send_failed_resyncs_when_the_nonce_was_used(fake_rpc, manager):
+    nonce = manager.reserve()
+    # The transaction was accepted despite the error, and another sender used one more.
+    fake_rpc.tx_counts["pending"] = nonce + 2
+
+    manager.send_failed(nonce)
+
+    assert manager.reserve() == nonce + 2
+
+
+def test_check_forgets_mined_and_refills_dropped(fake_rpc, manager):
+    nonces = [manager.reserve() for _ in range(3)]
+    for nonce in nonces:
+        manager.sent(nonce, f"0x{nonce:x}")
+    # The first one is mined, the second is still pending, the third was dropped.
+    fake_rpc.tx_counts["latest"] = nonces[0] + 1
+    fake_rpc.transactions = {f"0x{nonces[1]:x}": {"nonce": hex(nonces[1])}}
+
+    assert manager.check() == [nonces[2]]
+    assert fake_rpc.batches == [["eth_getTransactionCount"] + ["eth_getTransactionByHash"] * 3]
+    assert manager.in_flight == {nonces[1]: f"0x{nonces[1]:x}"}
+    assert manager.reserve() == nonces[2]
+
+
+def test_check_refills_a_gap_below_pending(fake_rpc, manager):
+    nonces = [manager.reserve() for _ in range(3)]
+    for nonce in nonces:
+        manager.sent(nonce, f"0x{nonce:x}")
+    # The middle transaction was dropped: the later one is stuck behind its gap.
+    fake_rpc.transactions = {f"0x{n:x}": {} for n in (nonces[0], nonces[2])}
+
+    assert manager.check() == [nonces[1]]
+    assert manager.reserve() == nonces[1]
+    assert manager.reserve() == nonces[2] + 1
+
+
+def test_sync_reports_in_flight_nonces_the_node_lost(fake_rpc, manager):
+    nonces = [manager.reserve() for _ in range(2)]
+    for nonce in nonces:
+        manager.sent(nonce, f"0x{nonce:x}")
+
+    assert manager.sync(nonces[1]) == [nonces[1]]
+    assert manager.reserve() == nonces[1]
+
+
+def test_nonce_manager_is_kept_per_account_and_chain(fake_rpc):
+    manager = nonce_manager(fake_rpc, 12345, ACCOUNT)
+
+    assert nonce_manager(fake_rpc, 12345, ACCOUNT.upper().replace("0X", "0x")) is manager
+    assert nonce_manager(fake_rpc, 54321, ACCOUNT) is not manager
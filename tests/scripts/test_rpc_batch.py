@@ -0,0 +1,148 @@
+import pytest
+from boa.rpc import RPCError
+from eth_abi import decode, encode
+
+import rpc_batch
+from rpc_batch import MAX_BATCH_SIZE, N_MAX_VIEW, fetch_batch, read_chain_state, read_due_pages
+from streamer_rpc import StreamerRPC
+
+STREAMER = "0x2b786BB995978CC2242C567Ae62fd617b0eBC828"
+EXECUTOR = "0x" + "55" * 20
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(rpc_batch, "_NO_BATCH", set())
+    monkeypatch.setattr(rpc_batch, "_NO_SUMMARY", set())
+
+
+@pytest.fixture()
+def reader(fake_rpc, streamer_abi):
+    fake_rpc.add_block(100, 10_000)
+    return StreamerRPC(fake_rpc, STREAMER, streamer_abi)
+
+
+def serve(reader, name, n_args, view):
+    """Answer eth_calls to one view overload with view(*args) -> tuple of return values."""
+    fn = reader._overloads[name][n_args]
+
+    def handler(data):
+        args = decode(fn.argument_types, bytes.fromhex(data[10:]))
+        return "0x" + encode(fn.return_type, view(*args)).hex()
+
+    reader.rpc.views["0x" + fn.method_id.hex()] = handler
+
+
+def _calls(n):
+    return [("eth_getTransactionCount", [EXECUTOR, "pending"])] * n
+
+
+def test_fetch_batch_splits_large_reads(fake_rpc):
+    fake_rpc.tx_counts["pending"] = 7
+
+    results = fetch_batch(fake_rpc, _calls(2 * MAX_BATCH_SIZE + 1))
+
+    assert results == ["0x7"] * (2 * MAX_BATCH_SIZE + 1)
+    assert [len(batch) for batch in fake_rpc.batches] == [MAX_BATCH_SIZE, MAX_BATCH_SIZE, 1]
+
+
+def test_fetch_batch_surfaces_error_from_failing_request(fake_rpc, reader):
+    serve(reader, "stream_count", 0, lambda: (3,))
+    payloads = [reader.call_payload("stream_count"), reader.call_payload("n_active")]
+
+    with pytest.raises(RPCError, match="execution reverted"):
+        fetch_batch(fake_rpc, payloads)
+
+    # The batch failed on one item: it is retried one by one, and batching stays enabled.
+    assert fake_rpc.calls == ["eth_call"] * 4
+    assert rpc_batch._NO_BATCH == set()
+
+
+def test_fetch_batch_falls_back_when_provider_rejects_batches(fake_rpc):
+    fake_rpc.reject_batches = True
+
+    assert fetch_batch(fake_rpc, _calls(2)) == ["0x0", "0x0"]
+    assert rpc_batch._NO_BATCH == {"fake"}
+
+    fake_rpc.reject_batches = False
+    fetch_batch(fake_rpc, _calls(2))
+    assert fake_rpc.batches == []
+
+
+def test_read_chain_state_in_one_batch(fake_rpc, reader):
+    fake_rpc.balances[EXECUTOR] = 10**18
+    fake_rpc.tx_counts["pending"] = 4
+    serve(reader, "stream_count", 0, lambda: (3,))
+    serve(reader, "due_summary", 0, lambda: (0, 0))
+
+    state = read_chain_state(reader, EXECUTOR)
+
+    assert (state.chain_id, state.block_number, state.timestamp) == (1, 100, 10_000)
+    assert (state.stream_count, state.n_due, state.due_ids) == (3, 0, [])
+    assert (state.balance, state.nonce) == (10**18, 4)
+    assert len(fake_rpc.batches) == 1
+    assert fake_rpc.calls.count("eth_call") == 2
+
+
+def test_read_chain_state_reads_due_view_when_due(fake_rpc, reader):
+    serve(reader, "stream_count", 0, lambda: (3,))
+    serve(reader, "due_summary", 0, lambda: (2, 50))
+    serve(reader, "streams_and_rewards_due", 0, lambda: ([0, 2], [20, 30]))
+
+    state = read_chain_state(reader)
+
+    assert (state.n_due, state.reward_due) == (2, 50)
+    assert (state.due_ids, state.rewards) == ([0, 2], [20, 30])
+
+
+def test_read_chain_state_without_due_summary(fake_rpc, reader):
+    serve(reader, "stream_count", 0, lambda: (3,))
+    serve(reader, "streams_and_rewards_due", 0, lambda: ([1], [20]))
+
+    state = read_chain_state(reader)
+
+    assert state.n_due is None
+    assert (state.due_ids, state.rewards) == ([1], [20])
+    assert rpc_batch._NO_SUMMARY == {STREAMER}
+
+    # Later reads skip the summary and fetch the due view in the batch directly.
+    fake_rpc.calls.clear()
+    assert read_chain_state(reader).due_ids == [1]
+    assert fake_rpc.calls.count("eth_call") == 2
+
+
+def _paged_due(start, count):
+    # One due stream per page, named after the page start.
+    return ([start], [start * 10])
+
+
+def test_read_due_pages_walks_older_pages(fake_rpc, reader):
+    serve(reader, "n_active", 0, lambda: (2 * N_MAX_VIEW + 100,))
+    serve(reader, "streams_and_rewards_due", 2, _paged_due)
+
+    due_ids, rewards = read_due_pages(reader, 5 * N_MAX_VIEW, 100)
+
+    assert due_ids == [N_MAX_VIEW + 100, 100]
+    assert rewards == [(N_MAX_VIEW + 100) * 10, 1000]
+
+
+def test_read_due_pages_without_live_set_pages_over_all_ids(fake_rpc, reader):
+    serve(reader, "streams_and_rewards_due", 2, _paged_due)
+
+    due_ids, _ = read_due_pages(reader, N_MAX_VIEW + 5, 100)
+
+    assert due_ids == [5]
+
+
+def test_read_due_pages_without_paged_view_skips_older_ids(fake_rpc, reader, capsys):
+    serve(reader, "n_active", 0, lambda: (N_MAX_VIEW + 5,))
+
+    assert read_due_pages(reader, N_MAX_VIEW + 5, 100) == ([], [])
+    assert "ids below 5 are skipped" in capsys.readouterr().out
+
+
+def test_read_due_pages_single_page(fake_rpc, reader):
+    serve(reader, "n_active", 0, lambda: (N_MAX_VIEW,))
+
+    assert read_due_pages(reader, 3 * N_MAX_VIEW, 100) == ([], [])
+    assert fake_rpc.calls == ["eth_call"]
@@ -0,0 +1,175 @@
+import sqlite3
+
+import pytest
+from eth_abi import encode
+
+from stream_indexer import StreamIndexer
+from streamer_rpc import StreamerRPC
+
+
+STREAMER = "0x2b786BB995978CC2242C567Ae62fd617b0eBC828"
+DONOR = "0x" + "11" * 20
+POOL = "0x" + "22" * 20
+CALLER = "0x" + "33" * 20
+
+
+def _topic(address: str) -> str:
+    return "0x" + address[2:].rjust(64, "0")
+
+
+@pytest.fixture()
+def reader(fake_rpc, streamer_abi):
+    return StreamerRPC(fake_rpc, STREAMER, streamer_abi)
+
+
+@pytest.fixture()
+def indexer(reader):
+    return StreamIndexer(sqlite3.connect(":memory:"), reader, chain_id=1)
+
+
+def _log(reader, name, block, log_index, topics, types, values):
+    return {
+        "address": STREAMER,
+        "blockNumber": hex(block),
+        "logIndex": hex(log_index),
+        "transactionHash": "0x" + f"{block:02x}{log_index:02x}".rjust(64, "0"),
+        "topics": [reader.topics[name], *topics],
+        "data": "0x" + encode(types, values).hex(),
+    }
+
+
+def _created(reader, block, stream_id, n_periods=2):
+    return _log(
+        reader,
+        "StreamCreated",
+        block,
+        0,
+        [_topic(DONOR), _topic(POOL)],
+        ["uint256", "uint256[2]", "uint256", "uint256", "uint256"],
+        [stream_id, [100, 200], 10, n_periods, 5],
+    )
+
+
+def _executed(reader, block, stream_id, periods=1):
+    return _log(
+        reader,
+        "StreamExecuted",
+        block,
+        1,
+        [_topic(CALLER), _topic(POOL)],
+        ["uint256", "uint256", "uint256[2]", "uint256"],
+        [stream_id, periods, [50 * periods, 100 * periods], 5 * periods],
+    )
+
+
+def _failed(reader, block, stream_id):
+    return _log(
+        reader,
+        "StreamFailed",
+        block,
+        2,
+        [_topic(CALLER), _topic(POOL)],
+        ["uint256"],
+        [stream_id],
+    )
+
+
+def test_sync_skips_events_it_does_not_mirror(fake_rpc, reader, indexer):
+    for number in range(4):
+        fake_rpc.add_block(number, 1_000 + number * 12)
+    fake_rpc.logs = [
+        _created(reader, 1, 0),
+        _failed(reader, 2, 0),
+        _executed(reader, 3, 0),
+    ]
+
+    assert indexer.sync() == 2
+    stream = indexer.active_streams()[0]
+    assert stream["periods_remaining"] == 1
+    assert stream["amounts_remaining"] == [50, 100]
+
+
+def test_ingest_ignores_stream_failed(reader, indexer):
+    assert indexer._ingest([_failed(reader, 1, 0)]) == set()
+    assert indexer.active_streams() == {}
+
+
+def _chain(fake_rpc, n_blocks):
+    for number in range(n_blocks):
+        fake_rpc.add_block(number, 1_000 + number * 12)
+
+
+def test_sync_batches_block_timestamps(fake_rpc, reader, indexer):
+    _chain(fake_rpc, 4)
+    fake_rpc.logs = [_created(reader, 1, 0), _created(reader, 2, 1), _executed(reader, 3, 0)]
+
+    indexer.sync()
+
+    assert fake_rpc.batches == [["eth_getBlockByNumber"] * 3]
+    assert indexer.active_streams()[1]["next_ts"] == 1_000 + 2 * 12
+
+
+def test_sync_reads_the_chain_outside_write_transactions(tmp_path, fake_rpc, reader):
+    path = str(tmp_path / "streams.sqlite")
+    indexer = StreamIndexer(path, reader, chain_id=1)
+    _chain(fake_rpc, 3)
+    fake_rpc.logs = [_created(reader, 1, 0), _created(reader, 2, 1)]
+    fetch = fake_rpc.fetch
+
+    def fetch_while_other_chain_writes(method, params):
+        # Another chain's worker sharing the file must not wait for our RPC reads.
+        other = StreamIndexer(sqlite3.connect(path, timeout=0), reader, chain_id=2)
+        with other.db:
+            other._set_synced(5, "0x05")
+        other.db.close()
+        return fetch(method, params)
+
+    fake_rpc.fetch = fetch_while_other_chain_writes
+    indexer.sync()
+
+    assert indexer.last_synced() == (2, fake_rpc.blocks[2]["hash"])
+
+
+def test_sync_rolls_back_reorged_blocks(fake_rpc, reader):
+    indexer = StreamIndexer(sqlite3.connect(":memory:"), reader, chain_id=1, reorg_depth=2)
+    _chain(fake_rpc, 4)
+    fake_rpc.logs = [_created(reader, 1, 0), _executed(reader, 3, 0)]
+    indexer.sync()
+    assert indexer.active_streams()[0]["periods_remaining"] == 1
+
+    # Block 3 is replaced; the execution lands in block 4 for two periods instead.
+    fake_rpc.add_block(3, 1_036, block_hash="0x" + "ff" * 32)
+    fake_rpc.add_block(4, 1_048)
+    fake_rpc.logs = [_created(reader, 1, 0), _executed(reader, 4, 0, periods=2)]
+
+    assert indexer.sync() == 1
+    assert indexer.active_streams() == {}
+    row = indexer._load_stream(0)
+    assert row["status"] == "finished"
+    assert row["amounts_remaining"] == [0, 0]
+    assert indexer.last_synced() == (4, fake_rpc.blocks[4]["hash"])
+
+
+def test_rollback_rebuilds_from_remaining_events(fake_rpc, reader, indexer):
+    _chain(fake_rpc, 4)
+    fake_rpc.logs = [_created(reader, 1, 0), _executed(reader, 3, 0)]
+    indexer.sync()
+
+    indexer.rollback(2)
+
+    stream = indexer.active_streams()[0]
+    assert stream["periods_remaining"] == 2
+    assert stream["amounts_remaining"] == [100, 200]
+    assert indexer.last_synced() == (2, fake_rpc.blocks[2]["hash"])
+
+
+def test_rollback_before_start_block_clears_sync_state(fake_rpc, reader):
+    indexer = StreamIndexer(sqlite3.connect(":memory:"), reader, chain_id=1, start_block=1)
+    _chain(fake_rpc, 3)
+    fake_rpc.logs = [_created(reader, 1, 0)]
+    indexer.sync()
+
+    indexer.rollback(0)
+
+    assert indexer.last_synced() is None
+    assert indexer._load_stream(0) is None
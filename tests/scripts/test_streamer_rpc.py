@@ -0,0 +1,45 @@
+from eth_abi import encode
+
+from streamer_rpc import StreamerRPC, log_stream_id
+
+STREAMER = "0x2b786BB995978CC2242C567Ae62fd617b0eBC828"
+
+
+def test_call_payload_picks_overload_by_arity(fake_rpc, streamer_abi):
+    reader = StreamerRPC(fake_rpc, STREAMER, streamer_abi)
+
+    newest = reader.call_payload("streams_and_rewards_due")
+    paged = reader.call_payload("streams_and_rewards_due", 0, 1024, block=100)
+
+    assert newest[1][1] == "latest"
+    assert paged[1][1] == "0x64"
+    assert newest[1][0]["data"][:10] != paged[1][0]["data"][:10]
+    assert paged[1][0]["data"].endswith(encode(["uint256", "uint256"], [0, 1024]).hex())
+    assert reader.has_overload("streams_and_rewards_due", 2)
+    assert not reader.has_overload("streams_and_rewards_due", 3)
+
+
+def test_get_logs_filters_by_event(fake_rpc, streamer_abi):
+    reader = StreamerRPC(fake_rpc, STREAMER, streamer_abi)
+    fake_rpc.add_block(10, 1000)
+    executed = {
+        "blockNumber": hex(10),
+        "topics": [reader.topics["StreamExecuted"]],
+        "data": "0x" + encode(["uint256"], [7]).hex(),
+    }
+    failed = {**executed, "topics": [reader.topics["StreamFailed"]]}
+    fake_rpc.logs = [executed, failed]
+
+    assert reader.get_logs(0, 10) == [executed, failed]
+    assert reader.get_logs(0, 10, ["StreamExecuted"]) == [executed]
+    assert reader.get_logs(11, 12) == []
+    assert log_stream_id(executed) == 7
+
+
+def test_head(fake_rpc, streamer_abi):
+    fake_rpc.add_block(9, 900)
+    fake_rpc.add_block(10, 1000, "0xabc")
+
+    head = StreamerRPC(fake_rpc, STREAMER, streamer_abi).head()
+
+    assert head == {"number": 10, "hash": "0xabc", "timestamp": 1000}
@@ -0,0 +1,68 @@
+import boa
+import pytest
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+@pytest.fixture()
+def streams(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    coins = [token0.address, token1.address]
+    specs = [
+        (mock_pool.address, coins, [100, 200], 10, 2, 5),
+        (mock_pool.address, coins, [300, 0], 10, 3, 1),
+        (mock_pool.address, coins, [0, 50], 10, 1, 0),
+    ]
+    _mint_and_approve(token0, donor, donation_streamer.address, 400)
+    _mint_and_approve(token1, donor, donation_streamer.address, 250)
+    boa.env.set_balance(donor, 13)
+    with boa.env.prank(donor):
+        return donation_streamer.create_streams(specs, value=13)
+
+
+def test_cancel_many_refunds_all(donation_streamer, tokens, donor, streams):
+    token0, token1 = tokens
+
+    with boa.env.prank(donor):
+        donation_streamer.cancel_many(streams)
+    logs = [log for log in donation_streamer.get_logs() if type(log).__name__ == "StreamCancelled"]
+    assert [log.stream_id for log in logs] == streams
+
+    assert token0.balanceOf(donor) == 400
+    assert token1.balanceOf(donor) == 250
+    assert boa.env.get_balance(donor) == 13
+    assert boa.env.get_balance(donation_streamer.address) == 0
+    assert donation_streamer.n_active() == 0
+    for stream_id in streams:
+        assert donation_streamer.streams(stream_id)[0] == boa.eval("empty(address)")
+
+
+def test_cancel_many_refunds_remaining_after_execute(
+    donation_streamer, tokens, donor, caller, streams
+):
+    token0, token1 = tokens
+    with boa.env.prank(caller):
+        donation_streamer.execute_many(streams)
+
+    with boa.env.prank(donor):
+        donation_streamer.cancel_many(streams[:2])
+
+    # Stream 2 finished in its only period; 0 and 1 refund what is left after one period.
+    assert token0.balanceOf(donor) == 50 + 200
+    assert token1.balanceOf(donor) == 100
+    assert boa.env.get_balance(donor) == 5 + 2
+
+
+def test_cancel_many_requires_donor(donation_streamer, donor, caller, streams):
+    with boa.env.prank(caller), boa.reverts("donor only"):
+        donation_streamer.cancel_many(streams)
+    assert donation_streamer.n_active() == 3
+
+
+def test_cancel_many_rejects_duplicates(donation_streamer, donor, streams):
+    with boa.env.prank(donor), boa.reverts("donor only"):
+        donation_streamer.cancel_many([streams[0], streams[0]])
@@ -66,3 +66,35 @@ def test_cancel_stream_requires_donor(donation_streamer, mock_pool, tokens, dono
 
     with boa.env.prank(caller), boa.reverts():
         donation_streamer.cancel_stream(0)
+
+
+def test_cancel_stream_swaps_last_into_active_slot(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    for _ in range(3):
+        _mint_and_approve(token0, donor, donation_streamer.address, 1_000)
+        _mint_and_approve(token1, donor, donation_streamer.address, 2_000)
+        boa.env.set_balance(donor, 3)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                [1_000, 2_000],
+                10,
+                3,
+                1,
+                value=3,
+            )
+    assert donation_streamer.n_active() == 3
+
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(0)
+
+    assert donation_streamer.n_active() == 2
+    assert [donation_streamer.active_ids(i) for i in range(2)] == [2, 1]
+    assert donation_streamer.streams_and_rewards_due()[0] == [1, 2]
+
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(1)
+
+    assert donation_streamer.n_active() == 1
+    assert donation_streamer.active_ids(0) == 2
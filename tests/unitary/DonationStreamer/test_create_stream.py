@@ -146,3 +146,94 @@ def test_create_stream_checks_pool_coins(donation_streamer, mock_pool, tokens, d
             reward_total,
             value=reward_total,
         )
+
+
+def test_create_stream_keeps_first_pool_coins(
+    donation_streamer, mock_pool, tokens, deployer, donor, caller
+):
+    token0, token1 = tokens
+    with boa.env.prank(deployer):
+        junk = boa.load("tests/mocks/MockERC20.vy", "Junk", "JNK", 18)
+        pool = boa.load("tests/mocks/MockMutablePool.vy", [junk.address, token1.address])
+
+    # Another donor's tokens sit in the streamer.
+    _mint_and_approve(token0, donor, donation_streamer.address, 1_000)
+    with boa.env.prank(donor):
+        donation_streamer.create_stream(
+            mock_pool.address, [token0.address, token1.address], [1_000, 0], 10, 1, 0
+        )
+
+    _mint_and_approve(junk, caller, donation_streamer.address, 1_000)
+    _mint_and_approve(token0, caller, donation_streamer.address, 1)
+    with boa.env.prank(caller):
+        stream_id = donation_streamer.create_stream(
+            pool.address, [junk.address, token1.address], [1_000, 0], 10, 1, 0
+        )
+        pool.set_coins([token0.address, token1.address])
+        with boa.reverts("coin mismatch"):
+            donation_streamer.create_stream(
+                pool.address, [token0.address, token1.address], [1, 0], 10, 1, 0
+            )
+        donation_streamer.cancel_stream(stream_id)
+
+    assert donation_streamer.pool_coins(pool.address, 0) == junk.address
+    assert junk.balanceOf(caller) == 1_000
+    assert token0.balanceOf(caller) == 1
+    assert token0.balanceOf(donation_streamer.address) == 1_000
+
+
+def test_create_stream_packs_large_fields(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    amounts = [2**128 - 1, 3]
+    _mint_and_approve(token0, donor, donation_streamer.address, amounts[0])
+    _mint_and_approve(token1, donor, donation_streamer.address, amounts[1])
+
+    period_length = 2**32
+    n_periods = 3
+    now = boa.env.timestamp
+
+    with boa.env.prank(donor):
+        stream_id = donation_streamer.create_stream(
+            mock_pool.address,
+            [token0.address, token1.address],
+            amounts,
+            period_length,
+            n_periods,
+            0,
+        )
+
+    stream = donation_streamer.streams(stream_id)
+    assert stream[0] == donor
+    assert stream[1] == mock_pool.address
+    assert stream[2] == [token0.address, token1.address]
+    assert stream[3] == [amounts[0] // n_periods, 1]
+    assert stream[4] == period_length
+    assert stream[6] == now
+    assert stream[8] == amounts
+    assert stream[9] == n_periods
+
+
+@pytest.mark.parametrize(
+    "amounts,period_length,n_periods",
+    (
+        ([2**128, 0], 10, 1),
+        ([100, 200], 2**64, 1),
+        ([100, 200], 10, 2**32),
+    ),
+)
+def test_create_stream_rejects_unpackable_fields(
+    donation_streamer, mock_pool, tokens, donor, amounts, period_length, n_periods
+):
+    token0, token1 = tokens
+    _mint_and_approve(token0, donor, donation_streamer.address, amounts[0])
+    _mint_and_approve(token1, donor, donation_streamer.address, amounts[1])
+
+    with boa.env.prank(donor), boa.reverts():
+        donation_streamer.create_stream(
+            mock_pool.address,
+            [token0.address, token1.address],
+            amounts,
+            period_length,
+            n_periods,
+            0,
+        )
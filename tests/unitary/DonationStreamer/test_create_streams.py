@@ -0,0 +1,122 @@
+import boa
+import pytest
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+@pytest.fixture()
+def other_pool(deployer, tokens):
+    token0, token1 = tokens
+    with boa.env.prank(deployer):
+        return boa.load("tests/mocks/MockPool.vy", [token0.address, token1.address])
+
+
+def _spec(pool, tokens, amounts, period_length=10, n_periods=2, reward_per_period=5):
+    return (
+        pool.address,
+        [tokens[0].address, tokens[1].address],
+        amounts,
+        period_length,
+        n_periods,
+        reward_per_period,
+    )
+
+
+def test_create_streams_records_each_stream(
+    donation_streamer, mock_pool, other_pool, tokens, donor
+):
+    token0, token1 = tokens
+    specs = [
+        _spec(mock_pool, tokens, [100, 200], n_periods=2, reward_per_period=5),
+        _spec(other_pool, tokens, [300, 0], n_periods=3, reward_per_period=0),
+        _spec(mock_pool, tokens, [0, 50], period_length=20, n_periods=1, reward_per_period=7),
+    ]
+    _mint_and_approve(token0, donor, donation_streamer.address, 400)
+    _mint_and_approve(token1, donor, donation_streamer.address, 250)
+    reward_sum = 5 * 2 + 7
+    boa.env.set_balance(donor, reward_sum + 3)
+    now = boa.env.timestamp
+
+    with boa.env.prank(donor):
+        stream_ids = donation_streamer.create_streams(specs, value=reward_sum + 3)
+
+    assert stream_ids == [0, 1, 2]
+    assert donation_streamer.stream_count() == 3
+    assert donation_streamer.n_active() == 3
+    for stream_id, spec in zip(stream_ids, specs):
+        pool, coins, amounts, period_length, n_periods, reward_per_period = spec
+        stream = donation_streamer.streams(stream_id)
+        assert stream[0] == donor
+        assert stream[1] == pool
+        assert stream[2] == coins
+        assert stream[3] == [amounts[0] // n_periods, amounts[1] // n_periods]
+        assert stream[4] == period_length
+        assert stream[5] == reward_per_period
+        assert stream[6] == now
+        assert stream[7] == reward_per_period * n_periods
+        assert stream[8] == amounts
+        assert stream[9] == n_periods
+
+    assert token0.balanceOf(donation_streamer.address) == 400
+    assert token1.balanceOf(donation_streamer.address) == 250
+    assert boa.env.get_balance(donation_streamer.address) == reward_sum
+    assert boa.env.get_balance(donor) == 3
+
+
+def test_create_streams_requires_value(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    specs = [_spec(mock_pool, tokens, [100, 200]), _spec(mock_pool, tokens, [100, 200])]
+    _mint_and_approve(token0, donor, donation_streamer.address, 200)
+    _mint_and_approve(token1, donor, donation_streamer.address, 400)
+
+    with boa.env.prank(donor), boa.reverts("reward mismatch"):
+        donation_streamer.create_streams(specs, value=19)
+
+
+def test_create_streams_checks_coins_per_pool(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    swapped = (token1, token0)
+    specs = [_spec(mock_pool, tokens, [100, 200]), _spec(mock_pool, swapped, [100, 200])]
+    _mint_and_approve(token0, donor, donation_streamer.address, 300)
+    _mint_and_approve(token1, donor, donation_streamer.address, 300)
+
+    with boa.env.prank(donor), boa.reverts("coin mismatch"):
+        donation_streamer.create_streams(specs, value=20)
+
+
+def test_create_streams_checks_recorded_coins(
+    donation_streamer, mock_pool, tokens, deployer, donor
+):
+    token0, token1 = tokens
+    with boa.env.prank(deployer):
+        pool = boa.load("tests/mocks/MockMutablePool.vy", [token0.address, token1.address])
+    _mint_and_approve(token0, donor, donation_streamer.address, 300)
+    _mint_and_approve(token1, donor, donation_streamer.address, 300)
+    with boa.env.prank(donor):
+        donation_streamer.create_streams([_spec(pool, tokens, [100, 100])], value=10)
+
+    # Coins recorded by the first stream stay the pool's, whatever it reports later.
+    pool.set_coins([token1.address, token0.address])
+    specs = [_spec(mock_pool, tokens, [100, 100]), _spec(pool, tokens[::-1], [100, 100])]
+    with boa.env.prank(donor), boa.reverts("coin mismatch"):
+        donation_streamer.create_streams(specs, value=20)
+
+
+def test_create_streams_rejects_bad_spec(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    specs = [_spec(mock_pool, tokens, [100, 200]), _spec(mock_pool, tokens, [0, 0])]
+    _mint_and_approve(token0, donor, donation_streamer.address, 100)
+    _mint_and_approve(token1, donor, donation_streamer.address, 200)
+
+    with boa.env.prank(donor), boa.reverts("zero amounts"):
+        donation_streamer.create_streams(specs, value=20)
+
+
+def test_create_streams_empty(donation_streamer, donor):
+    with boa.env.prank(donor):
+        assert donation_streamer.create_streams([]) == []
+    assert donation_streamer.stream_count() == 0
@@ -0,0 +1,41 @@
+import boa
+
+
+def _create_streams(donation_streamer, mock_pool, tokens, donor, n):
+    token0, token1 = tokens
+    for token in tokens:
+        token.mint(donor, 100 * n)
+        with boa.env.prank(donor):
+            token.approve(donation_streamer.address, 100 * n)
+    spec = (mock_pool.address, [token0.address, token1.address], [100, 100], 10, 2, 1)
+    boa.env.set_balance(donor, 2 * n)
+    with boa.env.prank(donor):
+        for i in range(0, n, 32):
+            k = min(32, n - i)
+            donation_streamer.create_streams([spec] * k, value=2 * k)
+
+
+def test_due_bitmap_flags_due_ids(donation_streamer, mock_pool, tokens, donor, caller):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 300)
+    with boa.env.prank(caller):
+        donation_streamer.execute_many([1, 3, 299])
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(257)
+
+    words = donation_streamer.due_bitmap(0, 4)
+    assert len(words) == 2
+    due = {w * 256 + b for w, word in enumerate(words) for b in range(256) if word >> b & 1}
+    assert due == set(range(300)) - {1, 3, 257, 299}
+    assert due == set(donation_streamer.streams_and_rewards_due()[0])
+
+
+def test_due_bitmap_offsets_and_bounds(donation_streamer, mock_pool, tokens, donor):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 10)
+
+    assert donation_streamer.due_bitmap(4, 1) == [2**6 - 1]
+    assert donation_streamer.due_bitmap(4, 0) == []
+    assert donation_streamer.due_bitmap(10, 1) == []
+
+
+def test_due_bitmap_empty(donation_streamer):
+    assert donation_streamer.due_bitmap(0, 16) == []
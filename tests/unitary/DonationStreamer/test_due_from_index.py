@@ -0,0 +1,41 @@
+import boa
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+def test_due_from_index_matches_scan(donation_streamer, mock_pool, tokens, donor, caller):
+    token0, token1 = tokens
+    period_lengths = [60, 7_200, 86_400]
+
+    for i, period_length in enumerate(period_lengths):
+        _mint_and_approve(token0, donor, donation_streamer.address, 100)
+        _mint_and_approve(token1, donor, donation_streamer.address, 200)
+        boa.env.set_balance(donor, 3 * (i + 1))
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                [100, 200],
+                period_length,
+                3,
+                i + 1,
+                value=3 * (i + 1),
+            )
+
+    due_ids, rewards = donation_streamer.due_from_index()
+    assert due_ids == [0, 1, 2]
+    assert rewards == [1, 2, 3]
+
+    with boa.env.prank(caller):
+        donation_streamer.execute_many([0, 1, 2])
+    assert donation_streamer.due_from_index() == ([], [])
+
+    boa.env.time_travel(seconds=7_200)
+    due_ids, rewards = donation_streamer.due_from_index()
+    assert sorted(due_ids) == sorted(donation_streamer.streams_and_rewards_due()[0]) == [0, 1]
+    # Stream 0 has its two remaining periods due, paying the remaining reward.
+    assert dict(zip(due_ids, rewards)) == {0: 2, 1: 2}
@@ -0,0 +1,41 @@
+import boa
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+def test_due_summary_matches_due_view(donation_streamer, mock_pool, tokens, donor, caller):
+    token0, token1 = tokens
+    period_lengths = [60, 7_200, 86_400]
+
+    for i, period_length in enumerate(period_lengths):
+        _mint_and_approve(token0, donor, donation_streamer.address, 100)
+        _mint_and_approve(token1, donor, donation_streamer.address, 200)
+        boa.env.set_balance(donor, 3 * (i + 1))
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                [100, 200],
+                period_length,
+                3,
+                i + 1,
+                value=3 * (i + 1),
+            )
+
+    assert donation_streamer.due_summary() == (3, 6)
+
+    with boa.env.prank(caller):
+        donation_streamer.execute_many([0, 1, 2])
+    assert donation_streamer.due_summary() == (0, 0)
+
+    boa.env.time_travel(seconds=7_200)
+    due_ids, rewards = donation_streamer.streams_and_rewards_due()
+    assert donation_streamer.due_summary() == (len(due_ids), sum(rewards)) == (2, 4)
+
+
+def test_due_summary_empty(donation_streamer):
+    assert donation_streamer.due_summary() == (0, 0)
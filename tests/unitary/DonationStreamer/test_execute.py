@@ -177,3 +177,38 @@ def test_execute_pays_reward_without_liquidity(donation_streamer, mock_pool, tok
     assert boa.env.get_balance(caller) == caller_balance + reward_per_period
     assert token0.balanceOf(mock_pool.address) == pool_balance0 + amounts[0]
     assert token1.balanceOf(mock_pool.address) == pool_balance1 + amounts[1]
+
+
+def test_execute_final_period_leaves_active_set(
+    donation_streamer, mock_pool, tokens, donor, caller
+):
+    token0, token1 = tokens
+    period_length = 10
+    for n_periods in (1, 2):
+        _mint_and_approve(token0, donor, donation_streamer.address, 100)
+        _mint_and_approve(token1, donor, donation_streamer.address, 200)
+        boa.env.set_balance(donor, n_periods)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                [100, 200],
+                period_length,
+                n_periods,
+                1,
+                value=n_periods,
+            )
+
+    with boa.env.prank(caller):
+        donation_streamer.execute(0)
+        donation_streamer.execute(1)
+
+    assert donation_streamer.n_active() == 1
+    assert donation_streamer.active_ids(0) == 1
+
+    boa.env.time_travel(seconds=period_length)
+    with boa.env.prank(caller):
+        donation_streamer.execute(1)
+
+    assert donation_streamer.n_active() == 0
+    assert donation_streamer.streams_and_rewards_due() == ([], [])
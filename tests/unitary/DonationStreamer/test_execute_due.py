@@ -0,0 +1,94 @@
+import boa
+
+
+def _create_streams(donation_streamer, mock_pool, tokens, donor, n, period_length=10):
+    token0, token1 = tokens
+    for token in tokens:
+        token.mint(donor, 100 * n)
+        with boa.env.prank(donor):
+            token.approve(donation_streamer.address, 100 * n)
+    spec = (mock_pool.address, [token0.address, token1.address], [100, 100], period_length, 2, 1)
+    boa.env.set_balance(donor, 2 * n)
+    ids = []
+    with boa.env.prank(donor):
+        for i in range(0, n, 32):
+            k = min(32, n - i)
+            ids += donation_streamer.create_streams([spec] * k, value=2 * k)
+    return ids
+
+
+def test_execute_due_runs_due_streams(donation_streamer, mock_pool, tokens, donor, caller):
+    ids = _create_streams(donation_streamer, mock_pool, tokens, donor, 3)
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due() == 3
+    executed = [
+        log.stream_id
+        for log in donation_streamer.get_logs()
+        if type(log).__name__ == "StreamExecuted"
+    ]
+
+    assert sorted(executed) == ids
+    assert boa.env.get_balance(caller) == 3
+    assert tokens[0].balanceOf(mock_pool.address) == 150
+    assert donation_streamer.due_from_index() == ([], [])
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due() == 0
+
+    boa.env.time_travel(seconds=10)
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due() == 3
+    assert donation_streamer.n_active() == 0
+    assert boa.env.get_balance(caller) == 6
+
+
+def test_execute_due_respects_max_n(donation_streamer, mock_pool, tokens, donor, caller):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 5)
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due(2) == 2
+    assert len(donation_streamer.due_from_index()[0]) == 3
+    assert boa.env.get_balance(caller) == 2
+
+
+def test_execute_due_runs_several_batches(donation_streamer, mock_pool, tokens, donor, caller):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 40)
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due(100) == 40
+    assert donation_streamer.due_from_index() == ([], [])
+    assert boa.env.get_balance(caller) == 40
+
+
+def test_execute_due_skips_streams_not_yet_due(donation_streamer, mock_pool, tokens, donor, caller):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 2, period_length=1_000)
+    boa.env.time_travel(seconds=10)
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 1)
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due() == 3
+        assert donation_streamer.execute_due() == 0
+
+
+def test_execute_due_skips_failing_pool(
+    donation_streamer, deployer, mock_pool, tokens, donor, caller
+):
+    with boa.env.prank(deployer):
+        bad_pool = boa.load("tests/mocks/MockPool.vy", [t.address for t in tokens])
+    bad_ids = _create_streams(donation_streamer, bad_pool, tokens, donor, 2)
+    ids = _create_streams(donation_streamer, mock_pool, tokens, donor, 40)
+    bad_pool.set_paused(True)
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_due(100) == 40
+    logs = donation_streamer.get_logs()
+    failed = [log.stream_id for log in logs if type(log).__name__ == "StreamFailed"]
+    executed = [log.stream_id for log in logs if type(log).__name__ == "StreamExecuted"]
+
+    # The failing pool is tried once, in the first batch, and skipped afterwards.
+    assert failed == bad_ids
+    assert sorted(executed) == ids
+    assert boa.env.get_balance(caller) == 40
+    assert donation_streamer.due_from_index()[0] == bad_ids
+    assert donation_streamer.streams(bad_ids[0])[9] == 2
@@ -40,3 +40,139 @@ def test_execute_many_aggregates_rewards(donation_streamer, mock_pool, tokens, d
     assert boa.env.get_balance(caller) == caller_balance + reward_total
     assert token0.allowance(donation_streamer.address, mock_pool.address) == 0
     assert token1.allowance(donation_streamer.address, mock_pool.address) == 0
+
+
+def test_execute_many_adds_liquidity_once_per_pool(
+    donation_streamer, mock_pool, tokens, donor, caller
+):
+    token0, token1 = tokens
+    other_pool = boa.load("tests/mocks/MockPool.vy", [token0.address, token1.address])
+    pools = [mock_pool, other_pool, mock_pool, mock_pool]
+    amounts = [[100, 200], [10, 20], [0, 50], [7, 0]]
+
+    for pool, stream_amounts in zip(pools, amounts):
+        _mint_and_approve(token0, donor, donation_streamer.address, stream_amounts[0])
+        _mint_and_approve(token1, donor, donation_streamer.address, stream_amounts[1])
+        boa.env.set_balance(donor, 1)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                pool.address,
+                [token0.address, token1.address],
+                stream_amounts,
+                10,
+                1,
+                1,
+                value=1,
+            )
+
+    with boa.env.prank(caller):
+        executed = donation_streamer.execute_many([0, 1, 2, 3])
+
+    assert executed == [True, True, True, True]
+    logs = donation_streamer.get_logs()
+    assert [type(log).__name__ for log in logs].count("AddLiquidity") == 2
+    executed_events = [log for log in logs if type(log).__name__ == "StreamExecuted"]
+    assert [log.stream_id for log in executed_events] == [0, 1, 2, 3]
+
+    assert token0.balanceOf(mock_pool.address) == 107
+    assert token1.balanceOf(mock_pool.address) == 250
+    assert token0.allowance(donation_streamer.address, mock_pool.address) == 0
+    assert token1.allowance(donation_streamer.address, other_pool.address) == 0
+
+
+def test_execute_many_pays_only_executed_rewards(
+    donation_streamer, mock_pool, tokens, donor, caller
+):
+    token0, token1 = tokens
+    period_length = 10
+
+    for reward_per_period in (3, 4):
+        _mint_and_approve(token0, donor, donation_streamer.address, 100)
+        _mint_and_approve(token1, donor, donation_streamer.address, 200)
+        boa.env.set_balance(donor, 2 * reward_per_period)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                [100, 200],
+                period_length,
+                2,
+                reward_per_period,
+                value=2 * reward_per_period,
+            )
+
+    with boa.env.prank(caller):
+        donation_streamer.execute(0)
+
+    caller_balance = boa.env.get_balance(caller)
+    with boa.env.prank(caller):
+        executed = donation_streamer.execute_many([0, 1, 7])
+
+    assert executed == [False, True, False]
+    assert boa.env.get_balance(caller) == caller_balance + 4
+    assert boa.env.get_balance(donation_streamer.address) == 3 + 4
+
+
+def _create_in_pools(donation_streamer, tokens, donor, pools):
+    token0, token1 = tokens
+    for pool in pools:
+        _mint_and_approve(token0, donor, donation_streamer.address, 100)
+        _mint_and_approve(token1, donor, donation_streamer.address, 200)
+        boa.env.set_balance(donor, 2)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                pool.address,
+                [token0.address, token1.address],
+                [100, 200],
+                10,
+                2,
+                1,
+                value=2,
+            )
+
+
+def test_execute_many_isolate_skips_failing_pool(
+    donation_streamer, mock_pool, tokens, donor, caller
+):
+    token0, token1 = tokens
+    bad_pool = boa.load("tests/mocks/MockPool.vy", [token0.address, token1.address])
+    _create_in_pools(donation_streamer, tokens, donor, [mock_pool, bad_pool, mock_pool, bad_pool])
+    bad_pool.set_paused(True)
+    stream_before = donation_streamer.streams(1)
+
+    with boa.env.prank(caller):
+        executed = donation_streamer.execute_many([0, 1, 2, 3, 4], True)
+    logs = donation_streamer.get_logs()
+    failed = [log for log in logs if type(log).__name__ == "StreamFailed"]
+    executed_events = [log for log in logs if type(log).__name__ == "StreamExecuted"]
+
+    assert executed == [True, False, True, False, False]
+    assert [log.stream_id for log in failed] == [1, 3]
+    assert [log.stream_id for log in executed_events] == [0, 2]
+    assert boa.env.get_balance(caller) == 2
+    assert token0.balanceOf(mock_pool.address) == 100
+    assert token0.balanceOf(bad_pool.address) == 0
+    assert token0.allowance(donation_streamer.address, bad_pool.address) == 0
+    assert donation_streamer.streams(1) == stream_before
+    assert donation_streamer.is_due(3)
+
+    bad_pool.set_paused(False)
+    with boa.env.prank(caller):
+        assert donation_streamer.execute_many([1, 3], True) == [True, True]
+
+
+def test_execute_many_without_isolate_reverts_on_failing_pool(
+    donation_streamer, mock_pool, tokens, donor, caller
+):
+    token0, token1 = tokens
+    bad_pool = boa.load("tests/mocks/MockPool.vy", [token0.address, token1.address])
+    _create_in_pools(donation_streamer, tokens, donor, [mock_pool, bad_pool])
+    bad_pool.set_paused(True)
+
+    with boa.env.prank(caller), boa.reverts("paused"):
+        donation_streamer.execute_many([0, 1])
+
+
+def test_execute_isolated_is_internal_only(donation_streamer, caller):
+    with boa.env.prank(caller), boa.reverts("internal only"):
+        donation_streamer.execute_isolated([0], caller)
@@ -0,0 +1,45 @@
+import boa
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+def _create_streams(donation_streamer, mock_pool, tokens, donor, n):
+    token0, token1 = tokens
+    for i in range(n):
+        amounts = [100 + i, 200 + i]
+        _mint_and_approve(token0, donor, donation_streamer.address, amounts[0])
+        _mint_and_approve(token1, donor, donation_streamer.address, amounts[1])
+        boa.env.set_balance(donor, 2)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                amounts,
+                10,
+                2,
+                1,
+                value=2,
+            )
+
+
+def test_get_streams_matches_streams(donation_streamer, mock_pool, tokens, donor):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 3)
+
+    ids, streams = donation_streamer.get_streams([2, 0, 5])
+    assert ids == [2, 0, 5]
+    assert streams == [donation_streamer.streams(i) for i in (2, 0, 5)]
+    assert streams[2][0] == boa.eval("empty(address)")
+
+
+def test_get_streams_skips_empty(donation_streamer, mock_pool, tokens, donor):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 3)
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(1)
+
+    ids, streams = donation_streamer.get_streams([0, 1, 2, 3], True)
+    assert ids == [0, 2]
+    assert streams == [donation_streamer.streams(0), donation_streamer.streams(2)]
@@ -0,0 +1,83 @@
+import boa
+
+BUCKET_LENGTH = 600
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+def _create(donation_streamer, mock_pool, tokens, donor, period_length, n_periods):
+    token0, token1 = tokens
+    _mint_and_approve(token0, donor, donation_streamer.address, 100)
+    _mint_and_approve(token1, donor, donation_streamer.address, 200)
+    boa.env.set_balance(donor, n_periods)
+    with boa.env.prank(donor):
+        return donation_streamer.create_stream(
+            mock_pool.address,
+            [token0.address, token1.address],
+            [100, 200],
+            period_length,
+            n_periods,
+            1,
+            value=n_periods,
+        )
+
+
+def test_next_due_timestamp_empty(donation_streamer):
+    assert donation_streamer.next_due_timestamp() == 2**256 - 1
+
+
+def test_next_due_timestamp_follows_execution(donation_streamer, mock_pool, tokens, donor, caller):
+    period_length = 3_600
+    _create(donation_streamer, mock_pool, tokens, donor, period_length, 2)
+    created = boa.env.timestamp
+    assert donation_streamer.next_due_timestamp() == created // BUCKET_LENGTH * BUCKET_LENGTH
+
+    with boa.env.prank(caller):
+        donation_streamer.execute(0)
+
+    next_ts = created + period_length
+    assert donation_streamer.next_due_timestamp() == next_ts // BUCKET_LENGTH * BUCKET_LENGTH
+
+    boa.env.time_travel(seconds=period_length)
+    with boa.env.prank(caller):
+        donation_streamer.execute(0)
+
+    assert donation_streamer.next_due_timestamp() == 2**256 - 1
+
+
+def test_next_due_timestamp_moves_past_cancelled(donation_streamer, mock_pool, tokens, donor):
+    _create(donation_streamer, mock_pool, tokens, donor, 10, 3)
+    boa.env.time_travel(seconds=2 * BUCKET_LENGTH)
+    _create(donation_streamer, mock_pool, tokens, donor, 10, 3)
+    second = boa.env.timestamp
+
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(0)
+
+    assert donation_streamer.next_due_timestamp() == second // BUCKET_LENGTH * BUCKET_LENGTH
+
+
+def test_next_due_timestamp_tracks_single_stream(
+    donation_streamer, mock_pool, tokens, donor, caller
+):
+    # Periods longer than the bitmap scan reaches from a stale pointer.
+    period_length = 30 * 86_400
+    n_periods = 4
+    _create(donation_streamer, mock_pool, tokens, donor, period_length, n_periods)
+    next_ts = boa.env.timestamp
+
+    for _ in range(n_periods - 1):
+        with boa.env.prank(caller):
+            assert donation_streamer.execute(0)
+        next_ts += period_length
+        assert donation_streamer.next_due_timestamp() == next_ts // BUCKET_LENGTH * BUCKET_LENGTH
+        assert donation_streamer.first_bucket() == next_ts // BUCKET_LENGTH
+        boa.env.time_travel(seconds=period_length)
+
+    with boa.env.prank(caller):
+        assert donation_streamer.execute(0)
+    assert donation_streamer.next_due_timestamp() == 2**256 - 1
@@ -92,3 +92,36 @@ def test_streams_and_rewards_due_zero_liquidity_period_returns_reward(
     due_ids, due_rewards = donation_streamer.streams_and_rewards_due()
     assert due_ids == [0]
     assert due_rewards == [reward_per_period]
+
+
+def test_streams_and_rewards_due_pages_below_start(donation_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    period_length = 4
+    n_streams = 5
+
+    for i in range(n_streams):
+        amounts = [100 + i, 200 + i]
+        _mint_and_approve(token0, donor, donation_streamer.address, amounts[0])
+        _mint_and_approve(token1, donor, donation_streamer.address, amounts[1])
+        boa.env.set_balance(donor, 10 + i)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                amounts,
+                period_length,
+                1,
+                10 + i,
+                value=10 + i,
+            )
+
+    boa.env.time_travel(seconds=period_length)
+    assert donation_streamer.streams_and_rewards_due(5, 2) == ([4, 3], [14, 13])
+    assert donation_streamer.streams_and_rewards_due(3, 2) == ([2, 1], [12, 11])
+    assert donation_streamer.streams_and_rewards_due(1, 2) == ([0], [10])
+    assert donation_streamer.streams_and_rewards_due(0, 2) == ([], [])
+
+    # start is clamped to stream_count; the defaults return the newest page.
+    assert donation_streamer.streams_and_rewards_due(100, 2)[0] == [4, 3]
+    assert donation_streamer.streams_and_rewards_due(3)[0] == [2, 1, 0]
+    assert donation_streamer.streams_and_rewards_due()[0] == [4, 3, 2, 1, 0]
@@ -0,0 +1,63 @@
+import boa
+import pytest
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+def _create(streamer, pool, tokens, owner, n_periods):
+    token0, token1 = tokens
+    _mint_and_approve(token0, owner, streamer.address, 100)
+    _mint_and_approve(token1, owner, streamer.address, 100)
+    with boa.env.prank(owner):
+        return streamer.create_stream(
+            pool.address, [token0.address, token1.address], [100, 100], 10, n_periods, 0
+        )
+
+
+@pytest.fixture()
+def streams(donation_streamer, mock_pool, tokens, donor, caller):
+    ids = [_create(donation_streamer, mock_pool, tokens, donor, n) for n in (1, 2, 2)]
+    ids.append(_create(donation_streamer, mock_pool, tokens, caller, 2))
+    return ids
+
+
+def test_streams_of_donor_lists_own_streams(donation_streamer, donor, caller, streams):
+    assert donation_streamer.donor_stream_count(donor) == 3
+    assert donation_streamer.streams_of_donor(donor, 0, 10) == streams[:3]
+    assert donation_streamer.donor_stream_count(caller) == 1
+    assert donation_streamer.streams_of_donor(caller, 0, 10) == streams[3:]
+
+
+def test_streams_of_donor_pages(donation_streamer, donor, streams):
+    assert donation_streamer.streams_of_donor(donor, 1, 1) == streams[1:2]
+    assert donation_streamer.streams_of_donor(donor, 2, 5) == streams[2:3]
+    assert donation_streamer.streams_of_donor(donor, 3, 5) == []
+
+
+def test_streams_of_donor_drops_cancelled(donation_streamer, donor, streams):
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(streams[0])
+
+    # The last id moves into the freed position.
+    assert donation_streamer.donor_stream_count(donor) == 2
+    assert donation_streamer.streams_of_donor(donor, 0, 10) == [streams[2], streams[1]]
+
+
+def test_streams_of_donor_drops_finished(donation_streamer, donor, caller, streams):
+    with boa.env.prank(caller):
+        donation_streamer.execute_many(streams)
+
+    # Stream 0 had a single period; the others stay listed until their last one.
+    assert donation_streamer.streams_of_donor(donor, 0, 10) == [streams[2], streams[1]]
+
+    boa.env.time_travel(seconds=10)
+    with boa.env.prank(caller):
+        donation_streamer.execute_many(streams[1:])
+
+    assert donation_streamer.donor_stream_count(donor) == 0
+    assert donation_streamer.streams_of_donor(donor, 0, 10) == []
+    assert donation_streamer.donor_stream_count(caller) == 0
@@ -0,0 +1,69 @@
+import boa
+import pytest
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+@pytest.fixture()
+def other_pool(deployer, tokens):
+    token0, token1 = tokens
+    with boa.env.prank(deployer):
+        return boa.load("tests/mocks/MockPool.vy", [token0.address, token1.address])
+
+
+@pytest.fixture()
+def streams(donation_streamer, mock_pool, other_pool, tokens, donor):
+    token0, token1 = tokens
+    coins = [token0.address, token1.address]
+    specs = [
+        (mock_pool.address, coins, [100, 100], 10, 2, 0),
+        (other_pool.address, coins, [100, 100], 10, 2, 0),
+        (mock_pool.address, coins, [100, 100], 10, 2, 0),
+        (mock_pool.address, coins, [100, 100], 10, 2, 0),
+    ]
+    _mint_and_approve(token0, donor, donation_streamer.address, 400)
+    _mint_and_approve(token1, donor, donation_streamer.address, 400)
+    with boa.env.prank(donor):
+        return donation_streamer.create_streams(specs)
+
+
+def test_streams_of_pool_lists_pool_streams(donation_streamer, mock_pool, other_pool, streams):
+    assert donation_streamer.pool_stream_count(mock_pool.address) == 3
+    assert donation_streamer.streams_of_pool(mock_pool.address, 0, 10) == [0, 2, 3]
+    assert donation_streamer.pool_stream_count(other_pool.address) == 1
+    assert donation_streamer.streams_of_pool(other_pool.address, 0, 10) == [1]
+
+
+def test_streams_of_pool_pages(donation_streamer, mock_pool, streams):
+    assert donation_streamer.streams_of_pool(mock_pool.address, 1, 1) == [2]
+    assert donation_streamer.streams_of_pool(mock_pool.address, 3, 1) == []
+
+
+def test_streams_of_pool_drops_cancelled(donation_streamer, mock_pool, other_pool, donor, streams):
+    with boa.env.prank(donor):
+        donation_streamer.cancel_many([2, 1])
+
+    assert donation_streamer.streams_of_pool(mock_pool.address, 0, 10) == [0, 3]
+    assert donation_streamer.streams_of_pool(other_pool.address, 0, 10) == []
+    # The donor list was updated alongside the pool lists.
+    assert donation_streamer.streams_of_donor(donor, 0, 10) == [0, 3]
+    # Positions share a storage word with the live set, which must stay intact.
+    assert donation_streamer.n_active() == 2
+    assert {donation_streamer.active_ids(i) for i in range(2)} == {0, 3}
+    with boa.env.prank(donor):
+        donation_streamer.cancel_many([0, 3])
+    assert donation_streamer.n_active() == 0
+    assert donation_streamer.pool_stream_count(mock_pool.address) == 0
+
+
+def test_streams_of_pool_drops_finished(donation_streamer, mock_pool, caller, streams):
+    boa.env.time_travel(seconds=10)
+    with boa.env.prank(caller):
+        donation_streamer.execute(0)
+
+    assert donation_streamer.streams_of_pool(mock_pool.address, 0, 10) == [3, 2]
+    assert donation_streamer.streams(0)[0] == boa.eval("empty(address)")
@@ -0,0 +1,48 @@
+import boa
+
+
+def _mint_and_approve(token, owner, spender, amount):
+    token.mint(owner, amount)
+    with boa.env.prank(owner):
+        token.approve(spender, amount)
+
+
+def _create_streams(donation_streamer, mock_pool, tokens, donor, n):
+    token0, token1 = tokens
+    for i in range(n):
+        amounts = [100 + i, 200 + i]
+        _mint_and_approve(token0, donor, donation_streamer.address, amounts[0])
+        _mint_and_approve(token1, donor, donation_streamer.address, amounts[1])
+        boa.env.set_balance(donor, 2)
+        with boa.env.prank(donor):
+            donation_streamer.create_stream(
+                mock_pool.address,
+                [token0.address, token1.address],
+                amounts,
+                10,
+                2,
+                1,
+                value=2,
+            )
+
+
+def test_streams_range_clamps_to_stream_count(donation_streamer, mock_pool, tokens, donor):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 4)
+
+    ids, streams = donation_streamer.streams_range(1, 10)
+    assert ids == [1, 2, 3]
+    assert streams == [donation_streamer.streams(i) for i in ids]
+    assert donation_streamer.streams_range(4, 10) == ([], [])
+    assert donation_streamer.streams_range(0, 2)[0] == [0, 1]
+
+
+def test_streams_range_skips_empty(donation_streamer, mock_pool, tokens, donor):
+    _create_streams(donation_streamer, mock_pool, tokens, donor, 4)
+    with boa.env.prank(donor):
+        donation_streamer.cancel_stream(0)
+        donation_streamer.cancel_stream(2)
+
+    ids, streams = donation_streamer.streams_range(0, 4, True)
+    assert ids == [1, 3]
+    assert [stream[0] for stream in streams] == [donor, donor]
+    assert len(donation_streamer.streams_range(0, 4)[1]) == 4
@@ -0,0 +1,81 @@
+import boa
+import pytest
+
+
+N_STREAMS = 40
+REWARD_PER_PERIOD = 3
+
+
+@pytest.fixture()
+def due_streams(executor_streamer, mock_pool, tokens, donor):
+    token0, token1 = tokens
+    for token in tokens:
+        token.mint(donor, 100 * N_STREAMS)
+        with boa.env.prank(donor):
+            token.approve(executor_streamer.address, 100 * N_STREAMS)
+    spec = (mock_pool.address, [token0.address, token1.address], [100, 100], 10, 2, 3)
+    ids = []
+    with boa.env.prank(donor):
+        for n in (32, N_STREAMS - 32):
+            ids += executor_streamer.create_streams([spec] * n, value=2 * REWARD_PER_PERIOD * n)
+    return ids
+
+
+def test_execute_runs_all_due(stream_executor, executor_streamer, caller, due_streams):
+    with boa.env.prank(caller):
+        n_executed, executed_ids = stream_executor.execute()
+
+    assert n_executed == N_STREAMS
+    assert sorted(executed_ids) == due_streams
+    assert executor_streamer.streams_and_rewards_due()[0] == []
+    assert boa.env.get_balance(caller) == N_STREAMS * REWARD_PER_PERIOD
+    assert boa.env.get_balance(stream_executor.address) == 0
+
+
+def test_execute_stops_at_max_streams(stream_executor, executor_streamer, caller, due_streams):
+    with boa.env.prank(caller):
+        n_executed, executed_ids = stream_executor.execute(5, 0)
+
+    assert n_executed == 5
+    # The live set is walked from the top, so the last created streams run first.
+    assert executed_ids == due_streams[::-1][:5]
+    assert len(executor_streamer.streams_and_rewards_due()[0]) == N_STREAMS - 5
+    assert boa.env.get_balance(caller) == 5 * REWARD_PER_PERIOD
+
+    with boa.env.prank(caller):
+        n_executed, _ = stream_executor.execute(N_STREAMS, 0)
+    assert n_executed == N_STREAMS - 5
+
+
+def test_execute_stops_when_gas_runs_low(stream_executor, executor_streamer, caller, due_streams):
+    with boa.env.prank(caller):
+        n_executed, executed_ids = stream_executor.execute(2**256 - 1, 10**9, gas=5_000_000)
+
+    assert n_executed == 0
+    assert executed_ids == []
+    assert len(executor_streamer.streams_and_rewards_due()[0]) == N_STREAMS
+
+
+def test_execute_without_due_streams(stream_executor, executor_streamer, caller):
+    with boa.env.prank(caller):
+        assert stream_executor.execute() == (0, [])
+
+
+def test_execute_stops_between_chunks(stream_executor, executor_streamer, caller, due_streams):
+    # Enough gas for the page read and the first chunk of 32, not for the rest.
+    with boa.env.prank(caller):
+        n_executed, executed_ids = stream_executor.execute(2**256 - 1, 3_500_000, gas=5_000_000)
+
+    assert n_executed == 32
+    assert executed_ids == due_streams[::-1][:32]
+    assert executor_streamer.streams_and_rewards_due()[0] == due_streams[:8][::-1]
+    assert boa.env.get_balance(caller) == 32 * REWARD_PER_PERIOD
+
+
+def test_execute_targets_configured_streamer(stream_executor, executor_streamer):
+    assert stream_executor.STREAMER() == executor_streamer.address
+
+
+def test_executor_requires_paged_due_view(deployer, mock_pool):
+    with boa.env.prank(deployer), boa.reverts():
+        boa.load("contracts/StreamExecutor.vy", mock_pool.address)
@@ -0,0 +1,31 @@
+import boa
+
+
+def test_preview_counts_due_streams_and_chunks(
+    stream_executor, executor_streamer, mock_pool, tokens, donor, caller
+):
+    token0, token1 = tokens
+    n_streams = 33
+    for token in tokens:
+        token.mint(donor, 100 * n_streams)
+        with boa.env.prank(donor):
+            token.approve(executor_streamer.address, 100 * n_streams)
+    spec = (mock_pool.address, [token0.address, token1.address], [100, 100], 10, 2, 0)
+    with boa.env.prank(donor):
+        executor_streamer.create_streams([spec] * 32)
+        executor_streamer.create_streams([spec])
+
+    n_due, n_chunks, gas = stream_executor.preview()
+    assert n_due == n_streams
+    assert n_chunks == 2
+    assert gas > 0
+
+    with boa.env.prank(caller):
+        executor_streamer.execute(0)
+    assert stream_executor.preview()[:2] == (n_streams - 1, 1)
+
+
+def test_preview_without_streams(stream_executor):
+    n_due, n_chunks, gas = stream_executor.preview()
+    assert (n_due, n_chunks) == (0, 0)
+    assert gas > 0